@@ -18,12 +18,13 @@ def display_custom_header():
     페이지 상단에 '오른쪽 정렬'된 로그인/회원가입/마이페이지 버튼을 표시합니다.
     """
 
-    # (파일 이름 대신, 사이드바의 '순서'를 기준으로 마지막 2개 항목을 숨깁니다.)
-    # (pages/ 폴더에 7개 파일이 있으므로, 6번, 7번을 숨깁니다)
+    # (파일 이름 대신, 사이드바의 '순서'를 기준으로 마지막 3개 항목을 숨깁니다.)
+    # (pages/ 폴더에 8개 파일이 있으므로, 6번, 7번, 8번을 숨깁니다)
     st.markdown("""
     <style>
-    [data-testid="stSidebarNav"] ul > li:nth-last-child(1), /* 7_⚙️_마이페이지.py */
-    [data-testid="stSidebarNav"] ul > li:nth-last-child(2)  /* 6_✍️_회원가입.py */
+    [data-testid="stSidebarNav"] ul > li:nth-last-child(1), /* 8_🛠️_관리자.py */
+    [data-testid="stSidebarNav"] ul > li:nth-last-child(2), /* 7_⚙️_마이페이지.py */
+    [data-testid="stSidebarNav"] ul > li:nth-last-child(3)  /* 6_✍️_회원가입.py */
     {
         display: none;
     }
@@ -0,0 +1,95 @@
+# 파일 이름: backend/concurrent_fetch.py
+# [신규] 서로 독립적인 조회를 동시에 실행하는 헬퍼
+# 한 화면에 필요한 조회(예: 모델 프로필의 통계 + 리콜 이력)를 순서대로 부르면 화면 지연이 각 쿼리 시간의 합이 되지만,
+# 여기서는 공유 스레드 풀에서 동시에 실행하므로, 작업 스레드가 비어 있으면 가장 느린 쿼리 시간만큼만 기다립니다.
+# 각 조회 함수는 평소처럼 db_manager.get_connection()으로 풀에서 커넥션을 따로 빌립니다.
+# 스레드 풀은 모든 세션이 함께 쓰고, 세션의 스크립트 스레드도 풀 커넥션을 쓰므로
+# 작업 스레드 수는 커넥션 풀 크기의 절반으로 제한해 나머지 커넥션을 스크립트 스레드 몫으로 남깁니다.
+# (그래도 동시 접속이 많으면 풀 대기는 생길 수 있으며, 대기 시간은 관리자 페이지의 '커넥션 대기 시간'에서 확인합니다)
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+from . import db_manager
+from .instrumentation import record_error
+
+FETCH_TIMEOUT = 15.0 # 조회 하나를 기다리는 최대 시간(초). 넘으면 기본값으로 대신합니다.
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """프로세스 전체에서 공유하는 스레드 풀 (최초 호출 시 커넥션 풀 크기의 절반으로 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                try:
+                    workers = db_manager.get_pool().max_size
+                except Exception:
+                    workers = db_manager.POOL_DEFAULTS['max_size']
+                _executor = ThreadPoolExecutor(max_workers=max(1, workers // 2), thread_name_prefix='lemon-fetch')
+    return _executor
+
+
+def _run_with_ctx(ctx, func):
+    # 호출한 스크립트의 실행 컨텍스트를 작업 스레드에 연결해야 st.cache_data 등이 같은 세션 안에서 동작합니다.
+    # 끝나면 떼어 내야 재사용되는 작업 스레드가 마지막 세션(세션 상태, 캐시 참조)을 붙잡고 있지 않습니다.
+    thread = threading.current_thread()
+    if ctx is not None:
+        add_script_run_ctx(thread, ctx)
+    try:
+        return func()
+    finally:
+        if ctx is not None:
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+
+def fetch_concurrently(calls, timeout=FETCH_TIMEOUT, defaults=None):
+    """
+    인자 없는 함수들을 동시에 실행하고 {이름: 결과}를 반환합니다.
+    - calls: {이름: 함수} (인자가 필요하면 lambda나 functools.partial로 감쌉니다)
+    - timeout: 이 호출 전체의 최대 대기 시간(초). 작업 스레드는 모든 세션이 함께 쓰는 커넥션 풀 절반 크기의 풀이므로
+      동시 접속이 많으면 조회가 대기열에서 차례를 기다리며, 그 대기 시간도 timeout에 포함됩니다.
+      (시작하기 전에 시간이 다 된 조회는 취소합니다)
+    - defaults: {이름: 기본값}. 시간 초과나 예외가 난 조회는 오류를 기록하고(관리자 페이지의 최근 오류) 기본값(없으면 None)을 넣습니다.
+    예)
+      results = fetch_concurrently({
+          'comparison': lambda: get_recall_comparison(brand, model),
+          'profile': lambda: get_model_profile_data(brand, model),
+      }, defaults={'comparison': (None, pd.DataFrame()), 'profile': (pd.DataFrame(), "")})
+    """
+    defaults = defaults or {}
+    if len(calls) <= 1:
+        # 하나뿐이면 스레드를 거치지 않고 바로 실행합니다.
+        results = {}
+        for name, func in calls.items():
+            try:
+                results[name] = func()
+            except Exception as e:
+                record_error('fetch_concurrently', f"{name}: {e}")
+                results[name] = defaults.get(name)
+        return results
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    executor = _get_executor()
+    futures = {name: executor.submit(_run_with_ctx, ctx, func) for name, func in calls.items()}
+    deadline = time.monotonic() + timeout
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # 아직 시작하지 않은 조회는 취소해 작업 스레드를 비웁니다.
+            # (이미 실행 중인 조회는 중단할 수 없으므로 끝날 때까지 스레드와 커넥션을 씁니다)
+            future.cancel()
+            record_error('fetch_concurrently', f"{name}: {timeout}초 시간 초과")
+            results[name] = defaults.get(name)
+        except Exception as e:
+            record_error('fetch_concurrently', f"{name}: {e}")
+            results[name] = defaults.get(name)
+    return results
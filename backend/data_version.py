@@ -0,0 +1,127 @@
+# 파일 이름: backend/data_version.py
+# [신규] 데이터 버전 기반 캐시 무효화
+# 적재 스크립트(sql/load_data_from_excel.py)는 적재 트랜잭션 안에서 Data_Version 한 행에 새 버전 토큰을 기록합니다.
+# 조회 함수의 캐시는 시간(ttl) 대신 이 토큰을 키에 포함하므로,
+#  - 데이터가 바뀌지 않는 동안에는 캐시를 계속 사용하고 (매시간 불필요하게 다시 조회하지 않음)
+#  - 새 적재가 커밋되면 바로 다음 화면 갱신부터 새 데이터로 조회합니다. (최대 1시간 동안 이전 수치가 보이지 않음)
+# 버전 확인은 기본키 한 행 조회이며, VERSION_CHECK_INTERVAL 동안은 프로세스 안에서 같은 값을 재사용합니다.
+import functools
+import threading
+import time
+
+import streamlit as st
+
+from . import db_manager
+from . import instrumentation
+from . import shared_cache
+
+VERSION_CHECK_INTERVAL = 2.0 # 버전 재확인 간격(초). 한 번의 화면 갱신(rerun) 동안은 같은 버전을 사용합니다.
+FALLBACK_TTL = 3600 # 버전을 읽을 수 없는 DB(마이그레이션 006 이전 등)에서는 기존처럼 이 시간마다 캐시를 갱신합니다.
+DATA_CACHE_MAX_ENTRIES = 1000 # 함수별 최대 캐시 항목 수 (이전 버전의 항목은 오래된 것부터 밀려납니다)
+
+DATA_VERSION_QUERY = "SELECT version FROM Data_Version WHERE version_id = 1"
+# Data_Version이 없는 DB용: 적재할 때마다 갱신되는 요약 통계의 계산 시각을 대신 사용합니다.
+DATA_VERSION_FALLBACK_QUERY = "SELECT refreshed_at FROM Summary_Stats WHERE stat_id = 1"
+
+_checked_version = None
+_checked_at = None
+_seen_version = None # 예열을 시작한 마지막 버전
+_version_lock = threading.Lock()
+
+
+class _UncachedResult(Exception):
+    """DB 연결 실패 / 쿼리 오류로 받은 기본값. 예외로 st.cache_data를 빠져나가 캐시에 저장되지 않게 합니다."""
+
+    def __init__(self, result):
+        super().__init__("조회 실패 결과는 캐시하지 않음")
+        self.result = result
+
+
+def read_data_version():
+    """DB에 기록된 데이터 버전 토큰을 읽습니다. 읽을 수 없으면 None을 반환합니다."""
+    with db_manager.get_connection() as conn:
+        if conn is None: return None
+        for query in (DATA_VERSION_QUERY, DATA_VERSION_FALLBACK_QUERY):
+            cursor = None
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query)
+                row = cursor.fetchone()
+                if row and row[0] is not None:
+                    return str(row[0])
+            except Exception as e:
+                # Data_Version이 없는 DB는 매번 여기로 오므로, 대체 쿼리까지 실패했을 때만 출력합니다.
+                if query == DATA_VERSION_FALLBACK_QUERY:
+                    print(f"read_data_version 오류: {e}")
+            finally:
+                if cursor: cursor.close()
+    return None
+
+
+def get_data_version(force=False):
+    """
+    현재 데이터 버전을 반환합니다. (캐시 키로 사용)
+    마지막 확인 후 VERSION_CHECK_INTERVAL이 지나지 않았으면 DB를 조회하지 않고 같은 값을 반환하며,
+    DB에서 버전을 읽을 수 없으면 FALLBACK_TTL 단위로 바뀌는 시간 토큰을 반환합니다.
+    처음 읽은 버전이거나 버전이 바뀌었으면 캐시 예열(backend/warmup.py)을 예약합니다.
+    """
+    global _checked_version, _checked_at, _seen_version
+    changed = False
+    with _version_lock:
+        now = time.monotonic()
+        if force or _checked_at is None or now - _checked_at >= VERSION_CHECK_INTERVAL:
+            _checked_version = read_data_version()
+            _checked_at = now
+        version = _checked_version
+        if version is not None and version != _seen_version:
+            changed, previous, _seen_version = True, _seen_version, version
+    if changed:
+        # [신규] 프로세스 시작 후 처음 확인했거나 새 적재가 커밋되었으면 백그라운드에서 캐시를 예열합니다.
+        from . import warmup # 순환 임포트 방지 (warmup -> search_queries -> data_version)
+        warmup.schedule_warmup('서버 시작' if previous is None else f'데이터 버전 변경: {previous} -> {version}')
+    if version is None:
+        return f"ttl-{int(time.time() // FALLBACK_TTL)}"
+    return version
+
+
+def cache_by_data_version(max_entries=DATA_CACHE_MAX_ENTRIES, **cache_kwargs):
+    """
+    st.cache_data(ttl=...) 대신 사용하는 데코레이터. 캐시 키에 데이터 버전을 더해 적재 전까지 계속 캐시합니다.
+    [shared_cache]가 설정되어 있으면 프로세스 캐시 다음 단계로 레플리카 공유 캐시(backend/shared_cache.py)를 사용합니다.
+    예)
+      @cache_by_data_version()
+      def get_all_brands(): ...
+    DB에 연결하지 못했거나 쿼리 오류로 기본값(빈 결과)을 받은 호출은 캐시하지 않으므로, 다음 호출에서 다시 조회합니다.
+    (조회 함수의 except 블록은 기본값을 반환하기 전에 db_manager.mark_failure()를 부릅니다.)
+    원래 함수는 __wrapped__로, 캐시 비우기는 .clear()로 사용할 수 있습니다.
+    """
+    def decorator(func):
+        def versioned(*args, data_version=None, **kwargs):
+            # 프로세스 캐시에 없으면 레플리카 공유 캐시(설정된 경우)를 확인한 뒤 DB를 조회합니다.
+            instrumentation.mark_cache_miss()
+            with db_manager.connection_failure_scope() as scope:
+                result = shared_cache.cached_call(func, args, kwargs, data_version)
+            if scope['failed']:
+                raise _UncachedResult(result)
+            return result
+        # 캐시 이름/키를 원래 함수 기준으로 만들도록 이름과 소스 정보를 복사합니다.
+        functools.update_wrapper(versioned, func)
+        cached = st.cache_data(max_entries=max_entries, **cache_kwargs)(versioned)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # [신규] 호출 시간/결과 행 수/프로세스 캐시 적중 여부를 계측합니다. (backend/instrumentation.py)
+            with instrumentation.track_call(func.__qualname__) as record:
+                if record is not None:
+                    record.cache_miss = False # 본문이 실행되면 mark_cache_miss()가 True로 바꿉니다.
+                try:
+                    result = cached(*args, data_version=get_data_version(), **kwargs)
+                except _UncachedResult as e:
+                    result = e.result
+                if record is not None:
+                    record.rows = instrumentation.result_rows(result)
+                return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
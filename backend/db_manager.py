@@ -1,14 +1,51 @@
 # 파일 이름: backend/db_manager.py
+import contextvars
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import partial
+
 import mysql.connector
 from mysql.connector import Error
 import streamlit as st # [신규] st.secrets를 읽기 위해 임포트
 
+from . import instrumentation # [신규] 커넥션 대기 시간 / SQL 실행 시간 계측
+
 # [수정] 하드코딩된 DB_CONFIG 딕셔너리 삭제
 # DB_CONFIG = { ... } <-- 이 부분을 삭제합니다.
 
+# --- [신규] 커넥션 풀 기본 설정 ---
+# secrets.toml의 [db_pool] 섹션으로 덮어쓸 수 있습니다. (예: max_size = 20)
+POOL_DEFAULTS = {
+    'max_size': 10,         # 프로세스당 최대 커넥션 수 (MySQL max_connections 보호)
+    'timeout': 10.0,        # 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간(초)
+    'idle_timeout': 300.0,  # 이 시간(초) 이상 놀고 있던 커넥션은 닫고 새로 연결
+    'max_lifetime': 3600.0, # 생성 후 이 시간(초)이 지난 커넥션은 재활용하지 않음
+    'ping_interval': 5.0,   # 마지막 사용 후 이 시간(초)이 지났으면 체크아웃 시 ping으로 검증
+}
+
+# --- [신규] 저장소(backend) 설정 ---
+# secrets.toml의 [storage] 섹션으로 지정합니다. 없으면 기존처럼 MySQL([db_credentials])을 사용합니다.
+#   [storage]
+#   backend = "sqlite"                  # "mysql"(기본) 또는 "sqlite"
+#   path = "data/lemon_scanner.db"      # sql/load_data_from_excel.py --sqlite 로 만든 파일 (프로젝트 루트 기준)
+#   read_only = true                    # 조회 전용 대시보드 복제본이면 읽기 전용으로 엽니다
+STORAGE_DEFAULTS = {
+    'backend': 'mysql',
+    'path': 'data/lemon_scanner.db',
+    'read_only': False,
+}
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 def create_connection():
     """
     st.secrets에서 DB 정보를 읽어와 연결합니다.
+    (풀을 거치지 않는 단독 커넥션. 일반적인 조회는 get_connection()을 사용하세요.)
     """
     conn = None
     try:
@@ -27,4 +64,412 @@ def create_connection():
         return None
     except Exception as e:
         st.error(f"알 수 없는 DB 연결 오류: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# --- [신규] 커넥션 풀 ---
+class PoolTimeoutError(Exception):
+    """풀의 모든 커넥션이 사용 중이고 timeout 안에 반납되지 않았을 때 발생합니다."""
+
+
+class _PooledConnection:
+    """풀이 관리하는 커넥션과 생성/사용 시각을 함께 보관합니다."""
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    크기가 제한된 스레드 안전 커넥션 풀입니다.
+    - 체크아웃 시 오래 쉬었던 커넥션은 ping으로 검증하고, 죽었으면 새로 연결합니다.
+    - idle_timeout / max_lifetime을 넘긴 커넥션은 재활용하지 않고 닫습니다.
+    - 풀이 가득 차면 timeout까지 반납을 기다리며, 대기 횟수/시간을 기록합니다.
+    """
+
+    def __init__(self, factory, max_size=10, timeout=10.0, idle_timeout=300.0,
+                 max_lifetime=3600.0, ping_interval=5.0):
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.timeout = float(timeout)
+        self.idle_timeout = float(idle_timeout)
+        self.max_lifetime = float(max_lifetime)
+        self.ping_interval = float(ping_interval)
+
+        self._cond = threading.Condition()
+        self._idle = []   # LIFO: 가장 최근에 반납된 커넥션부터 재사용
+        self._size = 0    # 열려 있는 커넥션 수 (idle + 사용 중)
+        self._stats = {
+            'checkouts': 0, 'waits': 0, 'wait_time_total': 0.0, 'wait_time_max': 0.0,
+            'timeouts': 0, 'created': 0, 'recycled': 0, 'ping_failures': 0, 'discarded': 0,
+        }
+
+    # --- 내부 헬퍼 ---
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, entry, now):
+        """재사용 가능한 커넥션인지 검사합니다. (필요할 때만 ping)"""
+        if now - entry.created_at > self.max_lifetime or now - entry.last_used > self.idle_timeout:
+            with self._cond:
+                self._stats['recycled'] += 1
+            return False
+        if now - entry.last_used > self.ping_interval:
+            try:
+                entry.conn.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats['ping_failures'] += 1
+                return False
+        return True
+
+    def _acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        waited = False
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1  # 새 커넥션 자리를 먼저 예약
+                    break
+                waited = True
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(f"커넥션 풀 대기 시간 초과 ({self.timeout}초, 최대 {self.max_size}개)")
+                self._cond.wait(remaining)
+
+            self._stats['checkouts'] += 1
+            if waited:
+                wait_time = time.perf_counter() - start
+                self._stats['waits'] += 1
+                self._stats['wait_time_total'] += wait_time
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+
+        if entry is not None:
+            if self._is_usable(entry, time.monotonic()):
+                return entry
+            self._close_quietly(entry.conn)  # 자리(_size)는 그대로 두고 새로 연결
+
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return _PooledConnection(conn)
+
+    def _release(self, entry, discard=False):
+        with self._cond:
+            if discard:
+                self._size -= 1
+                self._stats['discarded'] += 1
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+        if discard:
+            self._close_quietly(entry.conn)
+
+    # --- 공개 API ---
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: 형태로 커넥션을 빌려 쓰고 자동 반납합니다."""
+        entry = self._acquire()
+        try:
+            yield entry.conn
+        except BaseException:
+            # 예외로 빠져나온 커넥션은 상태를 알 수 없으므로 풀에 돌려놓지 않습니다.
+            self._release(entry, discard=True)
+            raise
+        else:
+            self._release(entry)
+
+    def stats(self):
+        """풀 크기 산정을 위한 지표(dict)를 반환합니다."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['max_size'] = self.max_size
+        checkouts = stats['checkouts']
+        stats['wait_time_avg'] = stats['wait_time_total'] / stats['waits'] if stats['waits'] else 0.0
+        stats['wait_ratio'] = stats['waits'] / checkouts if checkouts else 0.0
+        return stats
+
+    def close_all(self):
+        """놀고 있는 커넥션을 모두 닫습니다. (사용 중인 커넥션은 반납 시 풀로 돌아옵니다)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _mysql_factory():
+    creds = st.secrets['db_credentials']
+    return mysql.connector.connect(
+        host=creds['host'],
+        user=creds['user'],
+        password=creds['password'],
+        database=creds['database'],
+        # 풀에서 재사용되는 커넥션이 오래된 REPEATABLE READ 스냅샷을 붙잡지 않도록 autocommit 사용
+        autocommit=True
+    )
+
+
+# --- [신규] SQLite 저장소 어댑터 ---
+# 조회 함수들은 mysql.connector 방식(%s 파라미터, cursor(dictionary=True))으로 작성되어 있으므로
+# sqlite3 커넥션을 같은 인터페이스로 감싸서 쿼리 함수를 고치지 않고 그대로 실행합니다.
+_PARAM_PATTERN = re.compile(r"%s")
+
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+def _to_sqlite_param(value):
+    """date/datetime은 ISO 문자열로, numpy 스칼라는 파이썬 값으로 바꿉니다."""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _to_sqlite_params(params):
+    if params is None:
+        return ()
+    return tuple(_to_sqlite_param(v) for v in params)
+
+
+class SQLiteCursor:
+    """mysql.connector 커서처럼 동작하는 sqlite3 커서 래퍼입니다. (dictionary=True면 행을 dict로 반환)"""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def execute(self, query, params=None):
+        self._cursor.execute(_PARAM_PATTERN.sub("?", query), _to_sqlite_params(params))
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(_PARAM_PATTERN.sub("?", query), [_to_sqlite_params(p) for p in seq_of_params])
+        return self
+
+    def _convert(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {col[0]: value for col, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 커넥션을 mysql.connector 커넥션과 같은 메서드로 감쌉니다. (cursor, commit, ping 등)"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=False):
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._conn.close()
+
+
+def _sqlite_factory(path, read_only=False):
+    if not os.path.isabs(path):
+        path = os.path.join(PROJECT_ROOT, path)
+    # mode=rw: 파일이 없으면 빈 DB를 새로 만들지 않고 오류를 냅니다.
+    uri = f"file:{path}?mode={'ro' if read_only else 'rw'}"
+    conn = sqlite3.connect(
+        uri, uri=True,
+        detect_types=sqlite3.PARSE_DECLTYPES, # DATE 컬럼을 datetime.date로 반환 (MySQL과 동일)
+        check_same_thread=False               # 풀에서 빌려 쓰는 스레드가 매번 다를 수 있음 (동시 사용은 풀이 막음)
+    )
+    return SQLiteConnection(conn)
+
+
+_storage_override = None
+
+
+def get_storage_config():
+    """현재 저장소 설정(dict)을 반환합니다. (configure_storage > secrets.toml [storage] > 기본값)"""
+    config = dict(STORAGE_DEFAULTS)
+    if _storage_override is not None:
+        config.update(_storage_override)
+        return config
+    try:
+        config.update(st.secrets.get('storage', {}))
+    except Exception:
+        pass  # secrets.toml이 없으면 기본값(MySQL) 사용
+    return config
+
+
+def configure_storage(backend, **options):
+    """
+    secrets.toml 대신 코드에서 저장소를 지정하고 커넥션 풀을 새로 만듭니다.
+    (벤치마크/검증 스크립트에서 MySQL과 SQLite를 번갈아 실행할 때 사용)
+    예: configure_storage('sqlite', path='data/lemon_scanner.db', read_only=True)
+    """
+    global _pool, _storage_override
+    with _pool_lock:
+        _storage_override = dict(options, backend=backend)
+        if _pool is not None:
+            _pool.close_all()
+        _pool = None
+
+
+def _make_factory():
+    storage = get_storage_config()
+    if storage['backend'] == 'sqlite':
+        return partial(_sqlite_factory, storage['path'], bool(storage['read_only']))
+    if storage['backend'] != 'mysql':
+        raise ValueError(f"지원하지 않는 저장소입니다: {storage['backend']} (mysql 또는 sqlite)")
+    return _mysql_factory
+
+
+def get_pool():
+    """프로세스 전체에서 공유하는 커넥션 풀을 반환합니다. (최초 호출 시 생성)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options = dict(POOL_DEFAULTS)
+                try:
+                    options.update(st.secrets.get('db_pool', {}))
+                except Exception:
+                    pass  # secrets.toml이 없으면 기본값 사용
+                _pool = ConnectionPool(_make_factory(), **options)
+    return _pool
+
+
+# [신규] 실패한 조회(커넥션을 얻지 못함 / 쿼리 오류) 표시
+# 조회 함수는 실패하면 빈 기본값을 반환하므로, 캐시(cache_by_data_version / 공유 캐시)가
+# 이 값을 데이터 버전이 바뀔 때까지 저장하지 않도록 connection_failure_scope()로 실패 여부를 알려 줍니다.
+# get_connection()은 연결 실패를 직접 표시하고, 쿼리 오류로 기본값을 반환하는 except 블록은 mark_failure()를 부릅니다.
+_failure_scope = contextvars.ContextVar('connection_failure_scope', default=None)
+
+
+def mark_failure():
+    """현재 조회가 실패해 기본값을 반환한다고 표시합니다. (connection_failure_scope 밖에서는 아무 일도 하지 않음)"""
+    scope = _failure_scope.get()
+    if scope is not None:
+        scope['failed'] = True
+
+
+@contextmanager
+def connection_failure_scope():
+    """
+    with connection_failure_scope() as scope: 블록 안에서 get_connection()이 None을 넘겨주었거나
+    mark_failure()가 불렸으면 scope['failed']가 True가 됩니다. 겹쳐 쓰면 안쪽의 실패가 바깥 블록에도 전달됩니다.
+    """
+    parent = _failure_scope.get()
+    scope = {'failed': False}
+    token = _failure_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _failure_scope.reset(token)
+        if scope['failed'] and parent is not None:
+            parent['failed'] = True
+
+
+@contextmanager
+def get_connection():
+    """
+    풀에서 커넥션을 빌려옵니다. 연결할 수 없으면 None을 넘겨주므로
+    호출하는 쪽에서 `if conn is None` 으로 처리합니다.
+    """
+    pool = None
+    start = time.perf_counter()
+    try:
+        pool = get_pool()
+        entry = pool._acquire()
+    except (PoolTimeoutError, Error, sqlite3.Error) as e:
+        print(f"데이터베이스 연결 오류: {e}")
+        instrumentation.record_error('get_connection', e)
+        entry = None
+    except KeyError:
+        st.error("DB 접속 정보 오류: .streamlit/secrets.toml 파일에 [db_credentials] 섹션을 확인하세요.")
+        entry = None
+    except Exception as e:
+        st.error(f"알 수 없는 DB 연결 오류: {e}")
+        instrumentation.record_error('get_connection', e)
+        entry = None
+    instrumentation.record_acquire(time.perf_counter() - start, error=entry is None)
+
+    if entry is None:
+        mark_failure()
+        yield None
+        return
+    try:
+        # [신규] 커서의 execute/fetch 시간을 기록하는 얇은 래퍼 (계측을 끄면 원래 커넥션)
+        yield instrumentation.wrap_connection(entry.conn)
+    except BaseException:
+        pool._release(entry, discard=True)
+        raise
+    else:
+        pool._release(entry)
+
+
+def get_pool_stats():
+    """현재 커넥션 풀 지표를 반환합니다. (checkouts, waits, wait_time 등)"""
+    return get_pool().stats()
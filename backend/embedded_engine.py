@@ -0,0 +1,360 @@
+# 파일 이름: backend/embedded_engine.py
+# [신규] 임베디드(인메모리) 조회 엔진
+# 리콜 데이터 전체(브랜드/차종/날짜/대수/시정률/키워드)를 프로세스당 한 번 컬럼형 스냅샷으로 올려두고,
+# 상세 검색 / 분석 리포트 조회를 MySQL 대신 numpy 벡터 연산으로 처리합니다.
+# 사용하려면 secrets.toml에 아래 설정을 추가합니다. (없으면 기존처럼 MySQL에서 조회)
+#   [query_engine]
+#   mode = "embedded"
+#   reason_index_path = "data/reason_index.npz"  # (선택) 미리 만든 리콜 사유 색인 파일 (sql/build_reason_index.py)
+#   reason_index = false                          # (선택) 리콜 사유 색인을 만들지 않음 (자유 검색어는 DB에서 조회)
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from . import db_manager
+from .data_version import get_data_version
+from .reason_index import ReasonIndex, parse_search_text
+
+MODE_OVERRIDE = None # 'embedded' 또는 'mysql'로 지정하면 secrets 설정 대신 사용 (검증/벤치마크 스크립트용)
+
+# search_recalls와 같은 컬럼 이름/순서
+SEARCH_COLUMNS = {
+    'recall_id': '리콜ID', 'brand_name': '브랜드', 'model_name': '차종', 'recall_date': '리콜개시일',
+    'prod_from': '생산시작', 'prod_to': '생산종료', 'reason': '리콜사유',
+    'recall_count': '리콜대수', 'correction_count': '시정대수', 'correction_rate': '시정률(%)',
+}
+DATE_COLUMNS = ('recall_date', 'prod_from', 'prod_to')
+
+SNAPSHOT_RECALLS_QUERY = """
+SELECT r.recall_id, b.brand_name, m.model_name, r.recall_date, r.prod_from, r.prod_to, r.reason,
+       r.recall_count, r.correction_count, r.correction_rate
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+"""
+SNAPSHOT_JUNCTION_QUERY = """
+SELECT rkj.recall_id, k.keyword_text
+FROM Recall_Keyword_Junction rkj
+JOIN Keyword k ON rkj.keyword_id = k.keyword_id
+"""
+SNAPSHOT_KEYWORDS_QUERY = "SELECT keyword_text, keyword_desc FROM Keyword"
+
+
+def is_enabled():
+    """secrets.toml의 [query_engine] mode가 'embedded'이면 True를 반환합니다."""
+    if MODE_OVERRIDE is not None:
+        return MODE_OVERRIDE == 'embedded'
+    try:
+        return st.secrets.get('query_engine', {}).get('mode') == 'embedded'
+    except Exception:
+        return False  # secrets.toml이 없으면 MySQL 사용
+
+
+def _reason_index_settings():
+    """[query_engine]의 리콜 사유 색인 설정 (사용 여부, 미리 만든 색인 파일 경로)"""
+    try:
+        config = st.secrets.get('query_engine', {})
+        enabled, path = bool(config.get('reason_index', True)), config.get('reason_index_path')
+    except Exception:
+        enabled, path = True, None
+    if path and not os.path.isabs(path):
+        path = os.path.join(db_manager.PROJECT_ROOT, path)
+    return enabled, path
+
+
+def _to_datetime64(value):
+    """date/datetime/None 값을 스냅샷 날짜 컬럼과 비교할 수 있는 값으로 변환합니다."""
+    if value is None or (not isinstance(value, (date, datetime)) and pd.isna(value)):
+        return None
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def _to_date_objects(values):
+    """datetime64 배열을 MySQL 커넥터가 돌려주는 것과 같은 datetime.date / None 리스트로 바꿉니다."""
+    return [None if pd.isna(v) else pd.Timestamp(v).date() for v in values]
+
+
+class RecallSnapshot:
+    """
+    리콜 데이터의 읽기 전용 컬럼형 스냅샷입니다.
+    행은 상세 검색과 같은 순서(recall_date DESC, NULL은 마지막, recall_id DESC)로 미리 정렬해 두므로
+    필터 결과는 불리언 마스크에서 앞쪽 N개만 꺼내면 됩니다.
+    - recalls_df: recall_id, brand_name, model_name, recall_date, prod_from, prod_to, reason,
+                  recall_count, correction_count, correction_rate
+    - junction_df: recall_id, keyword_text
+    - keywords_df: keyword_text, keyword_desc
+    - reason_index: 미리 만든 ReasonIndex (행 순서가 다르면 버리고 새로 만듭니다)
+    - build_reason_index: False이면 리콜 사유 색인 없이 만듭니다. (자유 검색어는 지원하지 않음)
+    """
+
+    def __init__(self, recalls_df, junction_df, keywords_df, reason_index=None, build_reason_index=True):
+        df = recalls_df.copy()
+        for col in DATE_COLUMNS:
+            df[col] = pd.to_datetime(df[col], errors='coerce').astype('datetime64[s]')
+        df['correction_rate'] = pd.to_numeric(df['correction_rate'], errors='coerce')
+        df = df.sort_values(['recall_date', 'recall_id'], ascending=[False, False],
+                            na_position='last', kind='stable').reset_index(drop=True)
+        self.df = df
+        self.size = len(df)
+
+        # 필터용 컬럼 (브랜드/차종은 정수 코드로 비교)
+        self._brand_codes, self._brands = pd.factorize(df['brand_name'])
+        self._model_codes, self._models = pd.factorize(df['model_name'])
+        self._brand_index = {name: i for i, name in enumerate(self._brands)}
+        self._model_index = {name: i for i, name in enumerate(self._models)}
+        self._ids = df['recall_id'].to_numpy()
+        self._dates = df['recall_date'].to_numpy().astype('datetime64[D]')
+        self._rates = df['correction_rate'].to_numpy(dtype=float)
+
+        # 키워드 -> 해당 키워드가 붙은 행 위치 배열
+        position_by_id = pd.Series(np.arange(self.size), index=self._ids)
+        junction = junction_df[junction_df['recall_id'].isin(position_by_id.index)]
+        rows = position_by_id.loc[junction['recall_id']].to_numpy()
+        self._keyword_rows = {
+            keyword: np.sort(rows[idx])
+            for keyword, idx in junction.groupby('keyword_text', sort=False).indices.items()
+        }
+        self._keyword_desc = dict(zip(keywords_df['keyword_text'], keywords_df['keyword_desc']))
+
+        # 리콜 사유 n-gram 역색인 (자유 검색어). 문서 위치 = 스냅샷 행 위치
+        if reason_index is not None and not np.array_equal(reason_index.doc_ids, self._ids):
+            print("embedded_engine: 리콜 사유 색인 파일의 행 구성이 현재 데이터와 달라 다시 만듭니다.")
+            reason_index = None
+        if reason_index is None and build_reason_index:
+            reason_index = ReasonIndex.build(df['reason'].tolist(), doc_ids=self._ids)
+        self.reason_index = reason_index
+        if reason_index is not None:
+            stats = reason_index.stats()
+            print(f"embedded_engine: 리콜 사유 색인 {stats['unique_texts']:,}개 문장 / n-gram {stats['grams']:,}개 / "
+                  f"{stats['memory_bytes'] / 2**20:.1f}MB / {stats['build_seconds']:.2f}초")
+
+    @property
+    def supports_text_search(self):
+        return self.reason_index is not None
+
+    # --- 내부 헬퍼 ---
+    def _filter_mask(self, brand, model, year, keyword, terms=None):
+        """검색 조건을 행 마스크로 변환합니다. (search_queries._build_search_filters와 같은 의미)"""
+        mask = np.ones(self.size, dtype=bool)
+        if brand and brand != "전체":
+            code = self._brand_index.get(brand)
+            if code is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self._brand_codes == code
+        if model and model != "전체":
+            code = self._model_index.get(model)
+            if code is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self._model_codes == code
+        if year and year != "전체":
+            start = np.datetime64(date(int(year), 1, 1), 'D')
+            end = np.datetime64(date(int(year) + 1, 1, 1), 'D')
+            mask &= (self._dates >= start) & (self._dates < end)
+        if keyword and keyword != "전체":
+            keyword_mask = np.zeros(self.size, dtype=bool)
+            keyword_mask[self._keyword_rows.get(keyword, [])] = True
+            mask &= keyword_mask
+        if terms:
+            mask &= self.reason_index.search_mask(terms)
+        return mask
+
+    def _seek_mask(self, seek, direction):
+        """키셋 조건 (search_queries._build_seek_clause와 같은 의미, NaT 비교는 SQL의 NULL처럼 False)"""
+        seek_date, seek_id = _to_datetime64(seek[0]), seek[1]
+        is_null = np.isnat(self._dates)
+        if direction == 'next':
+            if seek_date is None:
+                return is_null & (self._ids < seek_id)
+            return (self._dates < seek_date) | ((self._dates == seek_date) & (self._ids < seek_id)) | is_null
+        if seek_date is None:
+            return ~is_null | (self._ids > seek_id)
+        return (self._dates > seek_date) | ((self._dates == seek_date) & (self._ids > seek_id))
+
+    def _relevance_order(self, positions, terms, seek=None, direction='next'):
+        """
+        자유 검색어 결과를 (관련도 DESC, recall_id DESC) 순으로 정렬해 (행 위치, 관련도)를 반환합니다.
+        관련도는 SQLite 저장소와 같은 '검색어 등장 횟수의 합'이며, seek는 (관련도, recall_id) 키셋입니다.
+        """
+        scores = self.reason_index.occurrences(positions, terms)
+        ids = self._ids[positions]
+        if seek is not None:
+            seek_score, seek_id = seek
+            if direction == 'next':
+                keep = (scores < seek_score) | ((scores == seek_score) & (ids < seek_id))
+            else:
+                keep = (scores > seek_score) | ((scores == seek_score) & (ids > seek_id))
+            positions, scores, ids = positions[keep], scores[keep], ids[keep]
+        order = np.lexsort((-ids, -scores))
+        return positions[order], scores[order]
+
+    def _search_frame(self, positions, scores=None):
+        result = self.df.iloc[positions][list(SEARCH_COLUMNS)].rename(columns=SEARCH_COLUMNS)
+        for col in DATE_COLUMNS:
+            name = SEARCH_COLUMNS[col]
+            result[name] = _to_date_objects(result[name].to_numpy())
+        if scores is not None:
+            result['관련도'] = scores.tolist()
+        return result.reset_index(drop=True)
+
+    def _model_positions(self, brand, model):
+        return np.flatnonzero(self._filter_mask(brand, model, None, None))
+
+    # --- 상세 검색 ---
+    def search_recalls(self, brand, model, year, keyword, limit=200, text=None):
+        terms = parse_search_text(text)
+        positions = np.flatnonzero(self._filter_mask(brand, model, year, keyword, terms))
+        scores = None
+        if terms:
+            positions, scores = self._relevance_order(positions, terms)
+        if limit:
+            positions = positions[:int(limit)]
+            scores = scores[:int(limit)] if scores is not None else None
+        if len(positions) == 0:
+            return pd.DataFrame()
+        return self._search_frame(positions, scores)
+
+    def search_recalls_page(self, brand, model, year, keyword, seek=None, direction='next', page_size=50,
+                            text=None):
+        page_info = {'has_next': False, 'has_prev': False, 'first': None, 'last': None}
+        terms = parse_search_text(text)
+        mask = self._filter_mask(brand, model, year, keyword, terms)
+        scores = None
+        if terms:
+            positions, scores = self._relevance_order(np.flatnonzero(mask), terms, seek, direction)
+        else:
+            if seek is not None:
+                mask &= self._seek_mask(seek, direction)
+            positions = np.flatnonzero(mask)
+
+        if direction == 'prev':
+            has_more = len(positions) > page_size
+            positions = positions[-page_size:]
+            scores = scores[-page_size:] if scores is not None else None
+            page_info['has_prev'] = has_more
+            page_info['has_next'] = True
+        else:
+            has_more = len(positions) > page_size
+            positions = positions[:page_size]
+            scores = scores[:page_size] if scores is not None else None
+            page_info['has_next'] = has_more
+            page_info['has_prev'] = seek is not None
+
+        if len(positions) == 0:
+            return pd.DataFrame(), page_info
+        result = self._search_frame(positions, scores)
+        sort_column = '관련도' if terms else '리콜개시일'
+        page_info['first'] = (result[sort_column].iloc[0], int(result['리콜ID'].iloc[0]))
+        page_info['last'] = (result[sort_column].iloc[-1], int(result['리콜ID'].iloc[-1]))
+        return result, page_info
+
+    def count_search_results(self, brand, model, year, keyword, text=None):
+        return int(self._filter_mask(brand, model, year, keyword, parse_search_text(text)).sum())
+
+    # --- 분석 리포트 ---
+    def get_recall_comparison(self, brand, model):
+        stats = {'total_recalls': 0, 'avg_correction_rate': 0}
+        positions = self._model_positions(brand, model)
+        if len(positions) > 0:
+            rates = self._rates[positions]
+            rates = rates[~np.isnan(rates)]
+            avg_rate = round(float(rates.mean()), 2) if len(rates) else 0
+            stats = {'total_recalls': int(len(positions)), 'avg_correction_rate': avg_rate}
+
+        counts = []
+        for keyword, rows in self._keyword_rows.items():
+            count = int(np.isin(rows, positions, assume_unique=True).sum()) if len(positions) else 0
+            if count:
+                counts.append((keyword, self._keyword_desc.get(keyword), count))
+        if not counts:
+            return stats, pd.DataFrame()
+        keywords_df = pd.DataFrame(counts, columns=['keyword_text', 'keyword_desc', 'keyword_count'])
+        keywords_df = keywords_df.sort_values('keyword_count', ascending=False, kind='stable').head(10)
+        return stats, keywords_df.reset_index(drop=True)
+
+    def get_model_profile_data(self, brand, model):
+        positions = self._model_positions(brand, model)
+        if len(positions) == 0:
+            return pd.DataFrame(), ""
+        rows = self.df.iloc[positions]
+        history_df = pd.DataFrame({
+            '리콜개시일': _to_date_objects(rows['recall_date'].to_numpy()),
+            '리콜사유': rows['reason'].to_numpy(),
+            '리콜대수': rows['recall_count'].to_numpy(),
+            '시정률(%)': rows['correction_rate'].to_numpy(),
+        })
+        all_reasons_string = " ".join(r for r in rows['reason'] if isinstance(r, str))
+        return history_df, all_reasons_string
+
+    def get_brand_rankings(self):
+        if self.size == 0:
+            return pd.DataFrame(), pd.DataFrame()
+        grouped = pd.DataFrame({'브랜드': self.df['brand_name'], 'rate': self._rates}).groupby('브랜드')
+        brand_stats = pd.DataFrame({'count': grouped.size(), 'rate': grouped['rate'].mean()})
+
+        df_recall_count = (brand_stats['count'].sort_values(ascending=False, kind='stable')
+                           .rename('총 리콜 건수').reset_index())
+        df_recall_count.index = df_recall_count.index + 1
+
+        rated = brand_stats[brand_stats['count'] >= 5].sort_values('rate', ascending=False, kind='stable')
+        df_correction_rate = pd.DataFrame({
+            '브랜드': rated.index,
+            '평균 시정률 (%)': rated['rate'].round(2).to_numpy(),
+            '리콜 건수': rated['count'].to_numpy(),
+        })
+        df_correction_rate.index = df_correction_rate.index + 1
+        return df_recall_count, df_correction_rate
+
+
+def load_snapshot_from_db(build_reason_index=True, reason_index_path=None):
+    """
+    MySQL에서 리콜/키워드 데이터를 읽어 스냅샷을 만듭니다. 연결할 수 없으면 None을 반환합니다.
+    reason_index_path의 색인 파일이 있으면 리콜 사유 색인을 새로 만들지 않고 읽어서 사용합니다.
+    """
+    prebuilt = None
+    if build_reason_index and reason_index_path and os.path.exists(reason_index_path):
+        try:
+            prebuilt = ReasonIndex.load(reason_index_path)
+        except Exception as e:
+            print(f"embedded_engine 리콜 사유 색인 파일 로딩 오류 (새로 만듭니다): {e}")
+    with db_manager.get_connection() as conn:
+        if conn is None: return None
+        try:
+            recalls_df = pd.read_sql(SNAPSHOT_RECALLS_QUERY, conn)
+            junction_df = pd.read_sql(SNAPSHOT_JUNCTION_QUERY, conn)
+            keywords_df = pd.read_sql(SNAPSHOT_KEYWORDS_QUERY, conn)
+        except Exception as e:
+            print(f"embedded_engine 스냅샷 로딩 오류: {e}")
+            return None
+    return RecallSnapshot(recalls_df, junction_df, keywords_df, prebuilt, build_reason_index)
+
+
+@st.cache_resource(max_entries=1, show_spinner="리콜 데이터를 메모리에 불러오는 중입니다...")
+def _get_cached_snapshot(data_version):
+    # cache_resource: 세션마다 복사하지 않고 프로세스 전체가 같은 스냅샷 객체를 공유합니다.
+    # [수정] 시간(ttl) 대신 데이터 버전별로 한 번만 만들고, 새 적재가 커밋되면 이전 스냅샷을 버리고 다시 만듭니다.
+    build_reason_index, reason_index_path = _reason_index_settings()
+    snapshot = load_snapshot_from_db(build_reason_index, reason_index_path)
+    if snapshot is None:
+        raise RuntimeError("스냅샷을 만들 수 없습니다.")  # 실패 결과는 캐시하지 않음
+    return snapshot
+
+
+def get_snapshot(text=None):
+    """
+    임베디드 모드가 켜져 있으면 공유 스냅샷을, 꺼져 있거나 로딩에 실패하면 None을 반환합니다.
+    자유 검색어(text)가 있는데 스냅샷에 리콜 사유 색인이 없어도 None입니다.
+    호출하는 쪽은 None이면 기존 MySQL 쿼리로 처리합니다.
+    """
+    if not is_enabled():
+        return None
+    try:
+        snapshot = _get_cached_snapshot(get_data_version())
+    except Exception as e:
+        print(f"embedded_engine 비활성화 (MySQL로 조회): {e}")
+        return None
+    if parse_search_text(text) and not snapshot.supports_text_search:
+        return None
+    return snapshot
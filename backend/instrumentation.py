@@ -0,0 +1,436 @@
+# 파일 이름: backend/instrumentation.py
+# [신규] 조회 함수 / DB 호출 지연 시간 계측과 느린 쿼리 로그
+#  - 함수: cache_by_data_version으로 감싼 조회 함수와 @instrument() 함수의 호출 시간, 결과 행 수, 캐시 적중/실패, 오류
+#  - SQL: db_manager.get_connection()이 넘겨주는 커넥션의 모든 execute (실행 + fetch 시간, 행 수, 오류)
+#  - 커넥션: 풀에서 커넥션을 빌리는 데 걸린 시간
+# 시간은 로그 스케일 구간 히스토그램으로 모으므로 호출당 비용은 잠금 한 번과 덧셈 몇 번입니다.
+# slow_query_ms보다 오래 걸린 SQL은 SQL 문과 파라미터 개수/타입을 JSON 한 줄씩 slow_log_path에 기록합니다.
+# (파라미터 값은 기록하지 않습니다. 회원가입 INSERT의 이메일/비밀번호 해시처럼 개인정보가 들어갈 수 있으므로)
+# 집계는 관리자 페이지(pages/8_🛠️_관리자.py)에서 볼 수 있습니다.
+# secrets.toml 설정 (없으면 기본값):
+#   [instrumentation]
+#   enabled = true
+#   slow_query_ms = 500
+#   slow_log_path = "data/slow_queries.log"   # 프로젝트 루트 기준, 빈 문자열이면 파일에 쓰지 않음
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+# db_manager.PROJECT_ROOT와 같은 경로 (db_manager가 이 모듈을 임포트하므로 여기서 직접 계산합니다)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INSTRUMENTATION_DEFAULTS = {
+    'enabled': True,
+    'slow_query_ms': 500,
+    'slow_log_path': 'data/slow_queries.log',
+}
+# 히스토그램 구간 상한(ms). 마지막 구간은 그 이상 전부
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+MAX_SQL_STATS = 500 # 서로 다른 SQL 집계 항목 수 제한 (넘으면 '기타'로 모음)
+RECENT_SLOW_QUERIES = 200 # 관리자 페이지에 보여줄 최근 느린 쿼리 수
+SQL_LABEL_LENGTH = 120
+PARAMS_LOG_LENGTH = 200
+
+_current_function = contextvars.ContextVar('instrumented_function', default=None)
+
+
+class LatencyStats:
+    """호출 수 / 오류 / 행 수 / 캐시 적중 / 지연 시간 히스토그램"""
+    __slots__ = ('count', 'errors', 'rows', 'cache_hits', 'cache_misses', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = self.errors = self.rows = self.cache_hits = self.cache_misses = 0
+        self.total_ms = self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, elapsed_ms, rows=None, error=False):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        index = 0
+        while index < len(BUCKET_BOUNDS_MS) and elapsed_ms > BUCKET_BOUNDS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        if rows:
+            self.rows += rows
+        if error:
+            self.errors += 1
+
+    def percentile(self, p):
+        """구간 상한으로 추정한 백분위 지연 시간(ms). 마지막 구간이면 최댓값"""
+        if not self.count:
+            return 0.0
+        target, seen = self.count * p / 100, 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return float(BUCKET_BOUNDS_MS[index]) if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'calls': self.count, 'errors': self.errors, 'rows': self.rows,
+            'avg_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50), 'p95_ms': self.percentile(95), 'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms, 'total_ms': self.total_ms,
+            'cache_hit_rate': self.cache_hits / lookups if lookups else None,
+        }
+
+
+class Metrics:
+    """프로세스 전체의 계측 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self.functions = {}
+            self.sql = {}
+            self.acquire = LatencyStats()
+            self.recent_errors = deque(maxlen=50)
+            self.slow_queries = deque(maxlen=RECENT_SLOW_QUERIES)
+
+    def _stat(self, table, name):
+        stat = table.get(name)
+        if stat is None:
+            if table is self.sql and len(table) >= MAX_SQL_STATS:
+                name = '기타'
+                stat = table.get(name)
+            if stat is None:
+                stat = table[name] = LatencyStats()
+        return stat
+
+    def record_function(self, name, elapsed_ms, rows=None, error=False, cache_miss=None):
+        with self._lock:
+            stat = self._stat(self.functions, name)
+            stat.add(elapsed_ms, rows, error)
+            if cache_miss is True:
+                stat.cache_misses += 1
+            elif cache_miss is False:
+                stat.cache_hits += 1
+
+    def record_sql(self, name, elapsed_ms, rows=None, error=False):
+        with self._lock:
+            self._stat(self.sql, name).add(elapsed_ms, rows, error)
+
+    def record_acquire(self, elapsed_ms, error=False):
+        with self._lock:
+            self.acquire.add(elapsed_ms, error=error)
+
+    def record_error(self, name, error):
+        with self._lock:
+            self.recent_errors.append({'time': datetime.now().isoformat(timespec='seconds'),
+                                       'function': name, 'error': str(error)})
+
+    def record_slow_query(self, entry):
+        with self._lock:
+            self.slow_queries.append(entry)
+
+    def snapshot(self):
+        """관리자 페이지용 집계 (함수별/SQL별 DataFrame, 커넥션 대기 요약, 최근 느린 쿼리/오류 목록)"""
+        with self._lock:
+            functions = {name: stat.summary() for name, stat in self.functions.items()}
+            sql = {name: stat.summary() for name, stat in self.sql.items()}
+            acquire = self.acquire.summary()
+            slow_queries = list(self.slow_queries)
+            recent_errors = list(self.recent_errors)
+            started_at = self.started_at
+
+        def frame(table, index_name):
+            df = pd.DataFrame.from_dict(table, orient='index')
+            if not df.empty:
+                df.index.name = index_name
+                df = df.sort_values('total_ms', ascending=False)
+            return df
+
+        return {
+            'started_at': started_at,
+            'functions': frame(functions, '함수'),
+            'sql': frame(sql, 'SQL'),
+            'acquire': acquire,
+            'slow_queries': slow_queries[::-1],
+            'recent_errors': recent_errors[::-1],
+        }
+
+
+metrics = Metrics()
+
+_config = None
+_slow_log_lock = threading.Lock()
+
+
+def get_instrumentation_config():
+    global _config
+    if _config is None:
+        config = dict(INSTRUMENTATION_DEFAULTS)
+        try:
+            config.update(st.secrets.get('instrumentation', {}))
+        except Exception:
+            pass  # secrets.toml이 없으면 기본값 사용
+        path = config['slow_log_path']
+        if path and not os.path.isabs(path):
+            config['slow_log_path'] = os.path.join(PROJECT_ROOT, path)
+        _config = config
+    return _config
+
+
+def is_enabled():
+    return bool(get_instrumentation_config()['enabled'])
+
+
+def result_rows(result):
+    """조회 함수 결과의 행 수 (DataFrame/list/dict, 또는 그것으로 시작하는 튜플)"""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, (pd.DataFrame, list, dict)):
+        return len(result)
+    return None
+
+
+# --- 함수 계측 ---
+class _CallRecord:
+    __slots__ = ('name', 'cache_miss', 'rows')
+
+    def __init__(self, name):
+        self.name = name
+        self.cache_miss = None # None: 캐시 없는 함수 / True: 캐시 실패 / False: 캐시 적중
+        self.rows = None
+
+
+@contextmanager
+def track_call(name):
+    """with track_call('함수명') as call: 블록의 시간을 재고, call.rows에 넣은 행 수도 함께 기록합니다."""
+    if not is_enabled():
+        yield None
+        return
+    record = _CallRecord(name)
+    token = _current_function.set(record)
+    start = time.perf_counter()
+    error = False
+    try:
+        yield record
+    except BaseException as e:
+        error = True
+        metrics.record_error(name, e)
+        raise
+    finally:
+        _current_function.reset(token)
+        metrics.record_function(name, (time.perf_counter() - start) * 1000,
+                                record.rows, error, record.cache_miss)
+
+
+def mark_cache_miss():
+    """캐시된 함수의 본문이 실제로 실행될 때(캐시 실패) 부릅니다. 부르지 않은 호출은 캐시 적중으로 셉니다."""
+    record = _current_function.get()
+    if record is not None:
+        record.cache_miss = True
+
+
+def instrument(name=None, cached=False):
+    """
+    조회 함수 계측 데코레이터.
+    cached=True이면 캐시 데코레이터 바깥에 붙이고, 캐시된 본문에서 mark_cache_miss()를 부릅니다.
+    """
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_call(label) as record:
+                if record is not None and cached:
+                    record.cache_miss = False
+                result = func(*args, **kwargs)
+                if record is not None:
+                    record.rows = result_rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def record_error(name, error):
+    """print만 하고 넘어가던 오류를 관리자 페이지의 최근 오류 목록에도 남깁니다."""
+    if is_enabled():
+        metrics.record_error(name, error)
+
+
+# --- DB 호출 계측 ---
+# [신규] SQL 한 문장이 끝날 때마다 부를 함수 목록 (부하 테스트에서 화면 갱신당 쿼리 수를 세는 용도, 비어 있으면 비용 없음)
+_sql_listeners = []
+
+
+def add_sql_listener(listener):
+    """listener(function_name, elapsed_ms, rows, error)를 SQL 문장이 끝난 스레드에서 부릅니다."""
+    _sql_listeners.append(listener)
+
+
+def remove_sql_listener(listener):
+    if listener in _sql_listeners:
+        _sql_listeners.remove(listener)
+
+
+def _sql_label(function_name, query):
+    text = " ".join(str(query).split())
+    if len(text) > SQL_LABEL_LENGTH:
+        text = text[:SQL_LABEL_LENGTH] + "…"
+    return f"{function_name or '-'} | {text}"
+
+
+class InstrumentedCursor:
+    """execute부터 다음 execute/close까지(fetch 포함)를 한 문장의 시간으로 기록합니다."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._query = None
+        self._params = None
+        self._elapsed = 0.0
+        self._rows = 0
+        self._error = False
+        self._function = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception as e:
+            self._error = True
+            metrics.record_error(self._function or '-', e)
+            raise
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def _finish(self):
+        if self._query is None:
+            return
+        elapsed_ms = self._elapsed * 1000
+        rows = self._rows
+        if not rows:
+            rowcount = getattr(self._cursor, 'rowcount', -1)
+            rows = rowcount if isinstance(rowcount, int) and rowcount > 0 else 0
+        metrics.record_sql(_sql_label(self._function, self._query), elapsed_ms, rows, self._error)
+        for listener in _sql_listeners:
+            listener(self._function, elapsed_ms, rows, self._error)
+        threshold = get_instrumentation_config()['slow_query_ms']
+        if threshold is not None and elapsed_ms >= threshold:
+            _log_slow_query(self._function, self._query, self._params, elapsed_ms, rows, self._error)
+        self._query = None
+
+    def _start(self, query, params):
+        self._finish()
+        record = _current_function.get()
+        self._function = record.name if record is not None else None
+        self._query, self._params = query, params
+        self._elapsed, self._rows, self._error = 0.0, 0, False
+
+    def execute(self, query, params=None, *args, **kwargs):
+        self._start(query, params)
+        return self._timed(self._cursor.execute, query, params, *args, **kwargs)
+
+    def executemany(self, query, seq_of_params, *args, **kwargs):
+        self._start(query, f"<{len(seq_of_params)}건>" if hasattr(seq_of_params, '__len__') else None)
+        return self._timed(self._cursor.executemany, query, seq_of_params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._timed(self._cursor.fetchmany, *args, **kwargs)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+class InstrumentedConnection:
+    """커넥션의 cursor()가 InstrumentedCursor를 돌려주도록 감쌉니다. (나머지는 원래 커넥션에 위임)"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+
+# pd.read_sql은 sqlite3.Connection이 아닌 커넥션에 경고를 출력합니다. 감싼 커넥션도 DBAPI 그대로 동작하므로 숨깁니다.
+warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy connectable', category=UserWarning)
+
+
+def wrap_connection(conn):
+    return InstrumentedConnection(conn) if conn is not None and is_enabled() else conn
+
+
+def record_acquire(elapsed, error=False):
+    if is_enabled():
+        metrics.record_acquire(elapsed * 1000, error)
+
+
+def _describe_params(params):
+    """파라미터 값 대신 개수와 타입만 남깁니다. 예) (3, 'a@b.c') -> '2개: int, str'"""
+    if params is None:
+        return None
+    if isinstance(params, str):
+        return params # executemany의 '<N건>' 표시
+    if isinstance(params, dict):
+        types = ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items())
+    else:
+        try:
+            params = list(params)
+        except TypeError:
+            return type(params).__name__
+        types = ", ".join(type(value).__name__ for value in params)
+    return f"{len(params)}개: {types}"[:PARAMS_LOG_LENGTH]
+
+
+def _log_slow_query(function_name, query, params, elapsed_ms, rows, error):
+    entry = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'function': function_name,
+        'elapsed_ms': round(elapsed_ms, 1),
+        'rows': rows,
+        'error': error,
+        'sql': " ".join(str(query).split()),
+        'params': _describe_params(params),
+    }
+    metrics.record_slow_query(entry)
+    path = get_instrumentation_config()['slow_log_path']
+    if not path:
+        return
+    try:
+        with _slow_log_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+    except OSError as e:
+        print(f"느린 쿼리 로그 저장 오류: {e}")
@@ -0,0 +1,137 @@
+# 파일 이름: backend/keyword_tagger.py
+# [신규] 리콜 사유 키워드 태거
+# (streamlit에 의존하지 않으므로 sql/ 적재 스크립트나 재태깅 작업에서도 그대로 임포트해 사용할 수 있습니다.)
+import re
+
+try:
+    import ahocorasick  # pyahocorasick: C로 구현된 Aho-Corasick 오토마톤
+except ImportError:
+    ahocorasick = None  # 설치되지 않은 환경에서는 정규식 엔진으로 동작
+
+
+def _build_trie(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = True  # 키워드 끝 표시
+    return trie
+
+
+def _trie_to_regex(node):
+    """
+    트라이를 정규식으로 변환합니다. (예: ['시동', '시트'] -> '시(?:동|트)')
+    같은 접두사를 공유하는 키워드를 한 분기로 묶어서, 키워드가 늘어나도
+    한 위치에서 비교하는 분기 수가 '첫 글자 종류 수'를 넘지 않게 합니다.
+    """
+    is_end = "" in node
+    branches = [re.escape(ch) + _trie_to_regex(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if is_end:
+        # 더 긴 키워드를 우선(greedy) 매칭하고, 없으면 여기서 끝나도 매칭으로 인정
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordTagger:
+    """
+    여러 키워드를 한 번에 찾는 태거입니다.
+    리콜 사유마다 텍스트를 한 번만 스캔하여 (행, 키워드) 매칭 결과를 만듭니다.
+    - engine='ahocorasick': Aho-Corasick 오토마톤. 비용이 텍스트 길이 + 매칭 수에 비례하고
+      키워드 개수와 무관합니다. (pyahocorasick 필요, 'auto'일 때 설치되어 있으면 사용)
+    - engine='regex': 키워드 트라이를 정규식 하나로 컴파일한 대체 구현 (표준 라이브러리만 사용)
+    매칭 규칙은 기존 `keyword in reason_text`와 동일합니다. (대소문자 구분, 부분 문자열)
+    """
+
+    def __init__(self, keywords, engine='auto'):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._index = {k: i for i, k in enumerate(self.keywords)}
+
+        if engine not in ('auto', 'ahocorasick', 'regex'):
+            raise ValueError(f"알 수 없는 engine입니다: {engine!r} ('auto', 'ahocorasick', 'regex' 중 하나)")
+        if engine == 'auto':
+            engine = 'ahocorasick' if ahocorasick is not None else 'regex'
+        if engine == 'ahocorasick' and ahocorasick is None:
+            raise ImportError("engine='ahocorasick'을 사용하려면 pyahocorasick 패키지가 필요합니다.")
+        self.engine = engine
+
+        self._automaton = None
+        if engine == 'ahocorasick' and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for i, keyword in enumerate(self.keywords):
+                self._automaton.add_word(keyword, i)
+            self._automaton.make_automaton()
+
+        self._pattern = None
+        if engine == 'regex' and self.keywords:
+            # 가장 긴 매칭 키워드가 정해지면, 그 접두사인 키워드들도 같은 위치에서 매칭된 것입니다.
+            self._prefix_ids = {
+                k: [self._index[p] for p in self.keywords if k.startswith(p)]
+                for k in self.keywords
+            }
+            # 매칭된 구간 안쪽에서 다른 키워드가 시작될 수 있는 키워드들 (예: '에어백' 뒤의 '백미러')
+            # 이런 키워드가 나온 리콜 사유만 한 글자씩 다시 스캔해서 겹치는 매칭을 놓치지 않습니다.
+            self._overlapping = {
+                k for k in self.keywords
+                if any(k[i:].startswith(other) or other.startswith(k[i:])
+                       for i in range(1, len(k)) for other in self.keywords)
+            }
+            # 패턴이 트라이 분기로 시작하므로 re 엔진이 '키워드 첫 글자 집합'으로 후보 위치만 골라 건너뜁니다.
+            self._pattern = re.compile(_trie_to_regex(_build_trie(self.keywords)))
+
+    def _scan_overlapping(self, text):
+        """한 글자씩 이동하며 서로 겹치는 위치의 키워드까지 모두 찾습니다."""
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            yield match.group()
+            match = search(text, match.start() + 1)
+
+    def _keyword_ids(self, text):
+        """리콜 사유 하나에서 매칭된 키워드 인덱스 집합을 반환합니다."""
+        if not isinstance(text, str):
+            return set()
+        if self._automaton is not None:
+            return {keyword_idx for _, keyword_idx in self._automaton.iter(text)}
+        if self._pattern is None:
+            return set()
+        found = set(self._pattern.findall(text))
+        if found & self._overlapping:
+            found = set(self._scan_overlapping(text))
+        ids = set()
+        for keyword in found:
+            ids.update(self._prefix_ids[keyword])
+        return ids
+
+    def tag(self, text):
+        """리콜 사유 하나에 포함된 키워드 목록을 (키워드 목록 순서대로) 반환합니다."""
+        return [self.keywords[i] for i in sorted(self._keyword_ids(text))]
+
+    def tag_column(self, texts):
+        """
+        리콜 사유 컬럼 전체를 태깅하여 희소 (행 위치, 키워드 인덱스) 쌍 리스트를 반환합니다.
+        행 위치는 texts의 0부터 시작하는 순번이며, 결과는 (행, 키워드) 순으로 정렬됩니다.
+        """
+        keyword_ids = self._keyword_ids
+        return [
+            (row, keyword_idx)
+            for row, text in enumerate(texts)
+            for keyword_idx in sorted(keyword_ids(text))
+        ]
+
+    def bitmasks(self, texts):
+        """각 행마다 매칭된 키워드를 비트(1 << 키워드 인덱스)로 표시한 정수 리스트를 반환합니다."""
+        masks = []
+        for text in texts:
+            mask = 0
+            for keyword_idx in self._keyword_ids(text):
+                mask |= 1 << keyword_idx
+            masks.append(mask)
+        return masks
+
+    def keywords_from_mask(self, mask):
+        """비트마스크를 키워드 목록으로 되돌립니다."""
+        return [k for i, k in enumerate(self.keywords) if mask >> i & 1]
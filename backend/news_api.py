@@ -1,44 +1,211 @@
 # 파일 이름: backend/news_api.py
-import streamlit as st
-import requests
+# [수정] 검색어 여러 개를 동시에 조회하는 비동기 뉴스 클라이언트
+#  - 전용 이벤트 루프 스레드에서 httpx.AsyncClient 하나를 계속 사용합니다. (keep-alive로 연결 재사용, 요청마다 새 연결 X)
+#  - 동시에 보내는 요청 수는 concurrency로 제한하고 (네이버 API 호출 제한), 요청마다 timeout을 적용합니다.
+#  - 실패한 검색어만 오류 항목으로 바뀌고 나머지 결과는 그대로 반환합니다.
+#  - 결과는 검색어별로 NEWS_CACHE_TTL 동안 캐시하며 (여러 검색어를 한 번에 조회해도 검색어마다 저장), 오류 결과는 캐시하지 않습니다.
+# 설정은 secrets.toml의 [news] 섹션(concurrency, timeout, base_url)으로 바꿀 수 있습니다.
+# (base_url은 benchmarks/bench_news_client.py처럼 로컬 스텁 서버로 시험할 때 사용)
+import asyncio
+import math
 import re
-from urllib.parse import quote
+import threading
+import time
+from collections import OrderedDict
 
-@st.cache_data(ttl=3600)
-def get_naver_news(query):
-    """네이버 뉴스 API를 호출하여 뉴스 목록(list)을 반환합니다."""
+import httpx
+import streamlit as st
+
+from .instrumentation import instrument, mark_cache_miss, record_error # [신규] 호출 시간 / 캐시 적중 / 오류 계측
+
+NEWS_DEFAULTS = {
+    'base_url': "https://openapi.naver.com/v1/search/news.json",
+    'concurrency': 5, # 동시에 보내는 요청 수 상한 (네이버 검색 API 초당 호출 제한 고려)
+    'timeout': 5.0, # 요청 하나의 최대 시간(초, 연결 대기 포함)
+}
+NEWS_DISPLAY = 3 # [수정] display=5 -> display=3 (뉴스 3개만 가져오기)
+NEWS_CACHE_TTL = 3600 # 검색어별 뉴스 캐시 유지 시간(초)
+NEWS_CACHE_SIZE = 500 # 캐시하는 검색어 수 상한 (오래 쓰지 않은 검색어부터 밀려남)
+_TAG_PATTERN = re.compile(r'<[^>]+>|&quot;|&gt;|&lt;|&amp;')
+
+
+def _error_item(title, description, error=True):
+    """뉴스 대신 표시할 안내 항목. error=True이면 호출 실패 결과로 표시해 캐시하지 않습니다."""
+    item = {'title': title, 'link': "#", 'description': description}
+    if error:
+        item['error'] = True
+    return [item]
+
+
+def _is_error(news_list):
+    return any(item.get('error') for item in news_list)
+
+
+def _clean_news(query, news_data):
+    """API 응답(JSON)을 [{'title', 'link', 'description'}] 목록으로 정리합니다. (HTML 태그/엔티티 제거)"""
+    # 항목에 일부 필드가 빠져 있어도 그 항목만 빈 값으로 표시합니다.
+    clean_news_list = [{
+        'title': _TAG_PATTERN.sub('', item.get('title') or ''),
+        'link': item.get('link') or "#",
+        'description': _TAG_PATTERN.sub('', item.get('description') or ''),
+    } for item in news_data.get('items') or [] if isinstance(item, dict)]
+    if not clean_news_list:
+        return _error_item("검색 결과 없음", f"'{query}'에 대한 뉴스가 없습니다.", error=False)
+    return clean_news_list
+
+
+class NewsClient:
+    """
+    네이버 뉴스 검색 비동기 클라이언트.
+    search()는 일반(동기) 코드에서 부르며, 검색어들을 전용 이벤트 루프에서 동시에 조회해 {검색어: 뉴스 목록}을 반환합니다.
+    """
+
+    def __init__(self, base_url=NEWS_DEFAULTS['base_url'], concurrency=NEWS_DEFAULTS['concurrency'],
+                 timeout=NEWS_DEFAULTS['timeout']):
+        self.base_url = base_url
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = float(timeout)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='lemon-news', daemon=True)
+        self._thread.start()
+        self._client = None # 이벤트 루프 안에서 처음 요청할 때 생성
+        self._semaphore = None
+
+    def _ensure_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def _fetch_one(self, query, headers, display):
+        client = self._ensure_client()
+        async with self._semaphore:
+            try:
+                # 연결/읽기 단계별 timeout과 별개로 요청 전체에도 timeout을 겁니다. (응답이 조금씩 오는 경우)
+                response = await asyncio.wait_for(
+                    client.get(self.base_url, params={'query': query, 'display': display, 'sort': 'date'},
+                               headers=headers),
+                    self.timeout,
+                )
+                response.raise_for_status()
+                return _clean_news(query, response.json())
+            except Exception as e: # 검색어 하나의 오류(응답 형식 오류 포함)가 다른 검색어 결과를 막지 않도록
+                if isinstance(e, httpx.HTTPStatusError):
+                    message = f"HTTP {e.response.status_code}"
+                else:
+                    message = str(e) or f"{self.timeout}초 안에 응답이 없습니다."
+                print(f"뉴스 조회 오류 ('{query}'): {message}")
+                record_error('get_naver_news', f"{query}: {message}")
+                return _error_item(f"API 호출 오류: {message}", "네이버 서버에 연결할 수 없거나 API 키가 잘못되었습니다.")
+
+    async def _fetch_many(self, queries, headers, display):
+        results = await asyncio.gather(*(self._fetch_one(query, headers, display) for query in queries))
+        return dict(zip(queries, results))
+
+    def search(self, queries, client_id, client_secret, display=NEWS_DISPLAY):
+        """검색어 목록을 동시에 조회해 {검색어: 뉴스 목록}을 반환합니다. (같은 검색어는 한 번만 조회)"""
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+        headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
+        future = asyncio.run_coroutine_threadsafe(self._fetch_many(queries, headers, display), self._loop)
+        # 요청마다 timeout이 걸려 있으므로 (대기열 차례 수 x timeout)이 지나면 모두 끝나 있어야 합니다.
+        return future.result(timeout=self.timeout * math.ceil(len(queries) / self.concurrency) + 1)
+
+    def close(self):
+        """연결을 닫고 이벤트 루프 스레드를 멈춥니다."""
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(timeout=self.timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=self.timeout)
+
+
+_news_client = None
+_news_client_lock = threading.Lock()
+
+
+def get_news_client():
+    """프로세스 전체에서 공유하는 NewsClient (최초 호출 시 [news] 설정으로 생성)"""
+    global _news_client
+    if _news_client is None:
+        with _news_client_lock:
+            if _news_client is None:
+                config = dict(NEWS_DEFAULTS)
+                try:
+                    config.update(st.secrets.get('news', {}))
+                except Exception:
+                    pass  # secrets.toml이 없으면 기본값 사용
+                _news_client = NewsClient(config['base_url'], config['concurrency'], config['timeout'])
+    return _news_client
+
+
+def _fetch_news(queries):
+    """API 키를 읽어 검색어들을 동시에 조회합니다. 키 오류면 모든 검색어에 같은 오류 항목을 넣습니다."""
     try:
         client_id = st.secrets['naver_api']['client_id']
         client_secret = st.secrets['naver_api']['client_secret']
     except KeyError:
-        return [{'title': "API 키 오류", 'link': "#", 'description': "`.streamlit/secrets.toml` 파일을 확인하세요."}]
+        return {query: _error_item("API 키 오류", "`.streamlit/secrets.toml` 파일을 확인하세요.") for query in queries}
     except Exception as e:
-        return [{'title': f"Secrets 로딩 오류: {e}", 'link': "#", 'description': "secrets.toml 파일 접근 권한을 확인하세요."}]
-
-    # [수정] display=5 -> display=3 (뉴스 3개만 가져오기)
-    enc_query = quote(query)
-    url = f"https://openapi.naver.com/v1/search/news.json?query={enc_query}&display=3&sort=date"
-    
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret
-    }
-    
+        return {query: _error_item(f"Secrets 로딩 오류: {e}", "secrets.toml 파일 접근 권한을 확인하세요.")
+                for query in queries}
     try:
-        response = requests.get(url, headers=headers, timeout=5)
-        response.raise_for_status()
-        news_data = response.json()
-        clean_news_list = []
-        
-        for item in news_data.get('items', []):
-            clean_title = re.sub(r'<[^>]+>|&quot;|&gt;|&lt;|&amp;', '', item['title'])
-            clean_desc = re.sub(r'<[^>]+>|&quot;|&gt;|&lt;|&amp;', '', item['description'])
-            clean_news_list.append({
-                'title': clean_title, 'link': item['link'], 'description': clean_desc
-            })
-        
-        if not clean_news_list:
-            return [{'title': "검색 결과 없음", 'link': "#", 'description': f"'{query}'에 대한 뉴스가 없습니다."}]
-        return clean_news_list
-    except requests.exceptions.RequestException as e:
-        return [{'title': f"API 호출 오류: {e}", 'link': "#", 'description': "네이버 서버에 연결할 수 없거나 API 키가 잘못되었습니다."}]
\ No newline at end of file
+        return get_news_client().search(queries, client_id, client_secret)
+    except Exception as e:
+        print(f"뉴스 조회 오류: {e}")
+        record_error('get_naver_news', e)
+        return {query: _error_item(f"API 호출 오류: {e}", "네이버 서버에 연결할 수 없습니다.") for query in queries}
+
+
+_news_cache = OrderedDict() # {검색어: (만료 시각, 뉴스 목록)}
+_news_cache_lock = threading.Lock()
+
+
+def _get_news_cached(queries):
+    """
+    검색어별 캐시를 확인하고, 없거나 만료된 검색어만 모아서 한 번에 (동시에) 조회합니다.
+    정상 결과만 캐시하므로 오류가 난 검색어는 다음 호출에서 다시 조회합니다.
+    """
+    queries = list(dict.fromkeys(queries))
+    results = {}
+    now = time.monotonic()
+    with _news_cache_lock:
+        for query in queries:
+            entry = _news_cache.get(query)
+            if entry is not None and entry[0] > now:
+                _news_cache.move_to_end(query)
+                results[query] = entry[1]
+    missing = [query for query in queries if query not in results]
+    if missing:
+        mark_cache_miss()
+        fetched = _fetch_news(missing)
+        expires_at = time.monotonic() + NEWS_CACHE_TTL
+        with _news_cache_lock:
+            for query, news_list in fetched.items():
+                if not _is_error(news_list):
+                    _news_cache[query] = (expires_at, news_list)
+                    _news_cache.move_to_end(query)
+            while len(_news_cache) > NEWS_CACHE_SIZE:
+                _news_cache.popitem(last=False)
+        results.update(fetched)
+    return {query: results[query] for query in queries}
+
+
+@instrument(cached=True)
+def get_naver_news(query):
+    """네이버 뉴스 API를 호출하여 뉴스 목록(list)을 반환합니다."""
+    return _get_news_cached([query])[query]
+
+
+# [신규] 브랜드별 / 차종별 뉴스처럼 검색어가 여러 개일 때 한 번에 (동시에) 조회
+@instrument(cached=True)
+def get_naver_news_many(queries):
+    """
+    검색어 목록을 받아 {검색어: 뉴스 목록}을 반환합니다.
+    검색어를 차례로 부르지 않고 동시에 조회하므로 대기 시간은 대략 가장 느린 요청 하나만큼입니다.
+    캐시는 검색어별이므로 다른 화면에서 이미 조회한 검색어(get_naver_news 포함)는 다시 조회하지 않습니다.
+    """
+    return _get_news_cached(queries)
@@ -0,0 +1,260 @@
+# 파일 이름: backend/reason_index.py
+# [신규] 리콜 사유 2-gram 역색인 (프로세스 내 부분 문자열 검색)
+# (streamlit에 의존하지 않으므로 임베디드 엔진, 색인 생성 스크립트, 벤치마크에서 그대로 임포트해 사용합니다.)
+import re
+import time
+
+import numpy as np
+
+SEARCH_TEXT_MIN_LENGTH = 2 # 자유 검색어 최소 글자 수 (MySQL ngram_token_size 기본값과 같은 기준)
+
+
+def parse_search_text(text):
+    """
+    자유 검색어를 공백 기준 검색어 목록으로 나눕니다. (모든 검색어를 포함하는 리콜만 찾습니다)
+    전문 검색 불리언 모드의 연산자 문자는 지우고, 2글자 미만 검색어는 ngram 인덱스로 찾을 수 없으므로 제외합니다.
+    """
+    if not text:
+        return []
+    cleaned = re.sub(r'[+\-<>()~*"@]', ' ', str(text))
+    return list(dict.fromkeys(term for term in cleaned.split() if len(term) >= SEARCH_TEXT_MIN_LENGTH))
+
+
+def _intersect(a, b):
+    """정렬된 두 배열의 교집합. 작은 쪽 원소를 큰 쪽에서 이진 탐색합니다. (O(작은 쪽 * log 큰 쪽))"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    idx = np.searchsorted(b, a)
+    idx[idx == len(b)] = len(b) - 1
+    return a[b[idx] == a]
+
+
+class ReasonIndex:
+    """
+    리콜 사유 문자 n-gram(2글자, 3글자) 역색인입니다.
+    한국어는 띄어쓰기로 단어가 나뉘지 않으므로(예: '에어백인플레이터') 형태소 대신 글자 단위 n-gram을 색인하며,
+    `검색어 in 리콜사유`와 같은 부분 문자열 검색을 전체 스캔 없이 처리합니다.
+    - 같은 사유 문장이 여러 차종에 반복되므로 고유 문장 단위로 색인하고, 결과만 문서(행) 위치로 펼칩니다.
+    - 2글자 검색어는 2-gram 포스팅 리스트 그대로, 3글자 이상은 3-gram 포스팅 리스트를 짧은 것부터 교집합하고
+      4글자 이상이면 남은 후보 문장만 원문으로 확인합니다. (3-gram이 모두 있어도 연속으로 나오지 않을 수 있음)
+    - 여러 검색어: 결과가 적을 것 같은 검색어부터 처리하며, 다음 검색어는 앞의 결과 안에서만 교집합/확인합니다. (AND)
+    - 1글자 검색어는 색인하지 않고 고유 문장을 순회합니다. (상세 검색은 2글자 미만 검색어를 쓰지 않음)
+    문서 위치는 build에 넘긴 texts의 순번(0부터)이며, doc_ids(예: recall_id)를 함께 보관해 저장 파일 검증에 사용합니다.
+    """
+    GRAM_SIZES = (2, 3)
+    BUILD_CHUNK = 20000 # 색인 생성 시 한 번에 처리하는 고유 문장 수 (메모리 사용량 제한)
+
+    def __init__(self, unique_texts, text_of_doc, grams, gram_offsets, postings, doc_ids=None, build_seconds=0.0):
+        self._texts = unique_texts                        # 고유 문장 목록
+        self._text_of_doc = text_of_doc                   # 문서 위치 -> 고유 문장 번호 (-1: 사유 없음)
+        self._gram_index = {gram: i for i, gram in enumerate(grams)}
+        self._gram_offsets = gram_offsets                 # n-gram i의 포스팅 = postings[offsets[i]:offsets[i+1]]
+        self._postings = postings                         # 고유 문장 번호 (n-gram별로 정렬됨)
+        self.doc_ids = doc_ids
+        self.build_seconds = build_seconds
+
+        # 고유 문장 번호 -> 문서 위치 목록 (CSR 형태)
+        valid = text_of_doc >= 0
+        order = np.argsort(text_of_doc, kind='stable')
+        order = order[valid[order]]
+        counts = np.bincount(text_of_doc[valid], minlength=len(unique_texts))
+        self._doc_order = order.astype(np.int32)
+        self._doc_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    @classmethod
+    def build(cls, texts, doc_ids=None):
+        """리콜 사유 목록(문서 순서)으로 색인을 만듭니다. 문자열이 아닌 값은 사유 없음으로 처리합니다."""
+        start = time.perf_counter()
+        text_number = {}
+        text_of_doc = np.full(len(texts), -1, dtype=np.int32)
+        for pos, text in enumerate(texts):
+            if isinstance(text, str) and text:
+                text_of_doc[pos] = text_number.setdefault(text, len(text_number))
+        unique_texts = list(text_number)
+
+        # 글자를 촘촘한 번호(1부터, 0은 문장 구분자)로 바꿔 n-gram을 정수 하나로 표현합니다.
+        alphabet = set()
+        for chunk_start in range(0, len(unique_texts), cls.BUILD_CHUNK):
+            alphabet.update("".join(unique_texts[chunk_start:chunk_start + cls.BUILD_CHUNK]))
+        alphabet = sorted(alphabet)
+        char_table = np.zeros((ord(alphabet[-1]) + 1) if alphabet else 1, dtype=np.int64)
+        char_table[[ord(ch) for ch in alphabet]] = np.arange(1, len(alphabet) + 1)
+
+        grams, offsets, postings = [], [np.zeros(1, dtype=np.int64)], []
+        for n in cls.GRAM_SIZES:
+            gram_list, gram_offsets, gram_postings = cls._build_postings(unique_texts, alphabet, char_table, n)
+            grams += gram_list
+            offsets.append(gram_offsets[1:] + offsets[-1][-1])
+            postings.append(gram_postings)
+        ids = None if doc_ids is None else np.asarray(doc_ids, dtype=np.int64)
+        return cls(unique_texts, text_of_doc, grams, np.concatenate(offsets), np.concatenate(postings), ids,
+                   time.perf_counter() - start)
+
+    @classmethod
+    def _build_postings(cls, unique_texts, alphabet, char_table, n):
+        """n글자 gram의 (gram 목록, 포스팅 오프셋, 포스팅) — (gram 번호, 문장 번호)를 정수 키 하나로 묶어 정렬"""
+        n_chars, n_texts = len(alphabet) + 1, max(len(unique_texts), 1)
+        if n_chars ** n * n_texts >= 2**63:
+            raise ValueError("글자 종류와 문장 수가 너무 많아 색인 키를 만들 수 없습니다.")
+        keys = []
+        for chunk_start in range(0, len(unique_texts), cls.BUILD_CHUNK):
+            chunk = unique_texts[chunk_start:chunk_start + cls.BUILD_CHUNK]
+            codes = np.frombuffer("\0".join(chunk).encode('utf-32-le'), dtype=np.uint32)
+            chars = char_table[codes]
+            count = len(chars) - n + 1
+            if count <= 0:
+                continue
+            gram_number = np.zeros(count, dtype=np.int64)
+            valid = np.ones(count, dtype=bool)
+            for i in range(n):
+                gram_number = gram_number * n_chars + chars[i:i + count]
+                valid &= chars[i:i + count] != 0
+            pair = gram_number * n_texts + (np.cumsum(codes == 0)[:count] + chunk_start)
+            pair = np.sort(pair[valid])
+            keys.append(pair[np.concatenate([[True], pair[1:] != pair[:-1]])])
+        keys = np.sort(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+
+        gram_numbers = keys // n_texts
+        gram_starts = np.concatenate([[0], np.flatnonzero(np.diff(gram_numbers)) + 1]).astype(np.int64)
+        gram_offsets = np.concatenate([gram_starts, [len(keys)]]).astype(np.int64)
+        lookup = np.array([''] + alphabet, dtype=object)
+        number = gram_numbers[gram_starts] if len(keys) else np.empty(0, dtype=np.int64)
+        grams = np.full(len(number), '', dtype=object)
+        for _ in range(n):
+            grams = lookup[number % n_chars] + grams
+            number = number // n_chars
+        return grams.tolist(), gram_offsets, (keys % n_texts).astype(np.int32)
+
+    # --- 검색 ---
+    def _posting(self, gram):
+        i = self._gram_index.get(gram)
+        if i is None:
+            return None
+        return self._postings[self._gram_offsets[i]:self._gram_offsets[i + 1]]
+
+    def _term_postings(self, term):
+        """검색어를 찾는 데 교집합할 포스팅 리스트 목록 (짧은 순). 색인에 없는 n-gram이 있으면 None"""
+        size = 2 if len(term) == 2 else 3
+        lists = []
+        for gram in {term[i:i + size] for i in range(len(term) - size + 1)}:
+            posting = self._posting(gram)
+            if posting is None:
+                return None
+            lists.append(posting)
+        return sorted(lists, key=len)
+
+    def _match_term(self, term, within=None):
+        """검색어 하나를 포함하는 고유 문장 번호 배열 (within이 주어지면 그 안에서만 찾음)"""
+        texts = self._texts
+        if len(term) == 1:
+            candidates = within if within is not None else np.arange(len(texts), dtype=np.int32)
+            return candidates[[term in texts[number] for number in candidates.tolist()]]
+        lists = self._term_postings(term)
+        if lists is None:
+            return np.empty(0, dtype=np.int32)
+        if within is not None:
+            lists = sorted(lists + [within], key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            candidates = _intersect(candidates, posting)
+            if len(candidates) == 0:
+                return candidates
+        if len(term) <= 3:
+            return candidates
+        return candidates[[term in texts[number] for number in candidates.tolist()]]
+
+    def match_texts(self, terms):
+        """모든 검색어를 포함하는 고유 문장 번호 배열 (검색어가 없으면 None)"""
+        def estimate(term):
+            # 가장 짧은 포스팅 길이가 결과 수의 상한입니다. (1글자 검색어는 마지막에 결과 안에서 확인)
+            if len(term) == 1:
+                return len(self._texts) + 1
+            lists = self._term_postings(term)
+            return len(lists[0]) if lists else 0
+
+        result = None
+        for term in sorted(terms, key=estimate):
+            result = self._match_term(term, within=result)
+            if len(result) == 0:
+                break
+        return result
+
+    def _doc_positions(self, text_numbers):
+        """고유 문장 번호 배열을 해당 문장을 가진 문서 위치 배열로 펼칩니다. (정렬되지 않음)"""
+        starts = self._doc_offsets[text_numbers]
+        lengths = self._doc_offsets[text_numbers + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32)
+        # 각 문장의 문서 구간 [start, start+length)을 한 번에 펼칩니다.
+        shifts = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return self._doc_order[np.arange(total) + shifts]
+
+    def search(self, terms):
+        """모든 검색어를 포함하는 문서 위치 배열 (오름차순)"""
+        text_numbers = self.match_texts(terms)
+        if text_numbers is None:
+            return np.arange(len(self._text_of_doc), dtype=np.int32)
+        return np.sort(self._doc_positions(text_numbers))
+
+    def search_mask(self, terms):
+        """모든 검색어를 포함하는 문서를 True로 표시한 불리언 배열 (다른 필터 마스크와 바로 AND 할 수 있음)"""
+        text_numbers = self.match_texts(terms)
+        if text_numbers is None:
+            return np.ones(len(self._text_of_doc), dtype=bool)
+        mask = np.zeros(len(self._text_of_doc), dtype=bool)
+        mask[self._doc_positions(text_numbers)] = True
+        return mask
+
+    def occurrences(self, positions, terms):
+        """문서 위치별 검색어 등장 횟수의 합 (관련도). 고유 문장 단위로 한 번만 셉니다."""
+        text_numbers = self._text_of_doc[positions]
+        unique_numbers, inverse = np.unique(text_numbers, return_inverse=True)
+        counts = np.array(
+            [sum(self._texts[n].count(term) for term in terms) if n >= 0 else 0 for n in unique_numbers.tolist()],
+            dtype=np.int64
+        )
+        return counts[inverse]
+
+    # --- 크기 / 저장 ---
+    def stats(self):
+        """색인 크기 지표 (문서 수, 고유 문장 수, n-gram 수, 포스팅 수, 메모리 바이트, 생성 시간)"""
+        memory = (
+            self._postings.nbytes + self._gram_offsets.nbytes
+            + len(self._gram_index) * 150                      # n-gram 사전 항목 (키 문자열 + dict 슬롯) 근사치
+            + self._text_of_doc.nbytes + self._doc_order.nbytes + self._doc_offsets.nbytes
+            + len(self._texts) * 8                             # 고유 문장 목록 (문장 자체는 스냅샷과 공유)
+        )
+        return {
+            'docs': len(self._text_of_doc), 'unique_texts': len(self._texts), 'grams': len(self._gram_index),
+            'postings': len(self._postings), 'memory_bytes': memory, 'build_seconds': self.build_seconds,
+        }
+
+    def save(self, path):
+        """색인을 .npz 파일로 저장합니다. (앱 시작 시 다시 만들지 않고 load로 읽기 위함)"""
+        text_bytes = [t.encode('utf-8') for t in self._texts]
+        np.savez(
+            path,
+            texts=np.frombuffer(b"".join(text_bytes), dtype=np.uint8),
+            text_lengths=np.array([len(b) for b in text_bytes], dtype=np.int64),
+            grams=np.array(list(self._gram_index), dtype=str),
+            gram_offsets=self._gram_offsets,
+            postings=self._postings,
+            text_of_doc=self._text_of_doc,
+            doc_ids=self.doc_ids if self.doc_ids is not None else np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def load(cls, path):
+        start = time.perf_counter()
+        with np.load(path) as data:
+            raw = data['texts'].tobytes()
+            ends = np.cumsum(data['text_lengths']).tolist()
+            texts = [raw[s:e].decode('utf-8') for s, e in zip([0] + ends[:-1], ends)]
+            doc_ids = data['doc_ids'] if len(data['doc_ids']) else None
+            index = cls(texts, data['text_of_doc'], data['grams'].tolist(), data['gram_offsets'],
+                        data['postings'], doc_ids)
+        index.build_seconds = time.perf_counter() - start
+        return index
@@ -1,268 +1,574 @@
 # 파일 이름: backend/search_queries.py
 import pandas as pd
-import streamlit as st
 import decimal
+from datetime import date
 from . import db_manager # 같은 폴더의 db_manager를 임포트
+from . import embedded_engine # [신규] 임베디드 모드일 때 메모리 스냅샷에서 조회
+from .data_version import cache_by_data_version # [신규] 적재 시 바뀌는 데이터 버전으로 캐시 무효화
+from .instrumentation import instrument # [신규] 캐시하지 않는 조회 함수의 지연 시간 계측
+from .reason_index import SEARCH_TEXT_MIN_LENGTH, parse_search_text # [신규] 자유 검색어 파싱 (임베디드 엔진과 공용)
 
-@st.cache_data(ttl=3600)
+# --- [신규] 브랜드 -> 차종 카탈로그 ---
+# 검색/분석 화면의 브랜드·차종 선택 상자는 모두 이 카탈로그 하나로 채웁니다.
+# (브랜드를 바꿔도 DB를 조회하지 않음. 리콜 건수는 적재 시 계산되는 Model_Stats에서 읽습니다)
+CATALOG_QUERY = """
+SELECT b.brand_id, b.brand_name, m.model_id, m.model_name, COALESCE(ms.recall_count, 0) AS recall_count
+FROM Brand b
+LEFT JOIN Model m ON m.brand_id = b.brand_id
+LEFT JOIN Model_Stats ms ON ms.model_id = m.model_id
+ORDER BY b.brand_name, m.model_name
+"""
+# Model_Stats가 없는 DB(마이그레이션 004 이전)용: Brand / Model만으로 만들고 리콜 건수는 Recall에서 직접 셉니다.
+CATALOG_FALLBACK_QUERY = """
+SELECT b.brand_id, b.brand_name, m.model_id, m.model_name, COALESCE(rc.recall_count, 0) AS recall_count
+FROM Brand b
+LEFT JOIN Model m ON m.brand_id = b.brand_id
+LEFT JOIN (SELECT model_id, COUNT(*) AS recall_count FROM Recall GROUP BY model_id) rc ON rc.model_id = m.model_id
+ORDER BY b.brand_name, m.model_name
+"""
+
+
+@cache_by_data_version()
+def get_catalog():
+    """
+    전체 브랜드 -> 차종 목록을 쿼리 하나로 읽습니다. (데이터 버전마다 한 번)
+    반환: {브랜드명: {'brand_id': ID, 'recall_count': 브랜드 리콜 건수,
+                     'models': {차종명: {'model_id': ID, 'recall_count': 리콜 건수}}}}
+      브랜드와 차종은 이름순이며, 차종이 없는 브랜드는 models가 비어 있습니다. 조회 실패 시 빈 딕셔너리입니다.
+    """
+    with db_manager.get_connection() as conn:
+        if conn is None: return {}
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(CATALOG_QUERY)
+                rows = cursor.fetchall()
+            except Exception as e:
+                print(f"get_catalog: Model_Stats 조회 실패, Brand/Model 쿼리로 대체합니다. ({e})")
+                cursor.execute(CATALOG_FALLBACK_QUERY)
+                rows = cursor.fetchall()
+        except Exception as e:
+            print(f"get_catalog 오류: {e}")
+            db_manager.mark_failure()
+            return {}
+        finally:
+            if cursor: cursor.close()
+    catalog = {}
+    for brand_id, brand_name, model_id, model_name, recall_count in rows:
+        brand = catalog.get(brand_name)
+        if brand is None:
+            brand = catalog[brand_name] = {'brand_id': brand_id, 'recall_count': 0, 'models': {}}
+        if model_id is not None:
+            brand['models'][model_name] = {'model_id': model_id, 'recall_count': int(recall_count)}
+            brand['recall_count'] += int(recall_count)
+    return catalog
+
+
+# [수정] 브랜드/차종 목록은 카탈로그에서 꺼냅니다. (호출마다 DB를 조회하지 않음)
+@instrument()
 def get_all_brands():
-    query = "SELECT brand_name FROM Brand ORDER BY brand_name;"
-    conn = db_manager.create_connection()
-    if conn is None: return []
-    try:
-        df = pd.read_sql(query, conn)
-        return df['brand_name'].tolist()
-    except Exception as e:
-        print(f"get_all_brands 오류: {e}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-
-@st.cache_data(ttl=3600)
+    return list(get_catalog())
+
+@instrument()
 def get_models_by_brand(brand_name):
-    query = """
-    SELECT m.model_name FROM Model m
-    JOIN Brand b ON m.brand_id = b.brand_id
-    WHERE b.brand_name = %s ORDER BY m.model_name;
-    """
-    conn = db_manager.create_connection()
-    if conn is None: return []
-    try:
-        df = pd.read_sql(query, conn, params=(brand_name,))
-        return df['model_name'].tolist()
-    except Exception as e:
-        print(f"get_models_by_brand 오류: {e}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-
-@st.cache_data(ttl=3600)
+    brand = get_catalog().get(brand_name)
+    return list(brand['models']) if brand else []
+
+@cache_by_data_version()
 def get_all_keywords_with_desc():
     query = "SELECT keyword_text, keyword_desc FROM Keyword ORDER BY keyword_text;"
-    conn = db_manager.create_connection()
-    if conn is None: return {}
+    with db_manager.get_connection() as conn:
+        if conn is None: return {}
     
-    keyword_dict = {}
-    cursor = None
-    try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        keyword_dict = {}
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            rows = cursor.fetchall()
         
-        if rows:
-            for row in rows:
-                if isinstance(row, dict): 
-                    key = row.get('keyword_text')
-                    desc = row.get('keyword_desc')
-                    if key: 
-                        keyword_dict[key] = desc
+            if rows:
+                for row in rows:
+                    if isinstance(row, dict): 
+                        key = row.get('keyword_text')
+                        desc = row.get('keyword_desc')
+                        if key: 
+                            keyword_dict[key] = desc
                         
-        return keyword_dict
+            return keyword_dict
         
-    except Exception as e:
-        print(f"get_all_keywords_with_desc 오류: {e}")
-        return {}
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+        except Exception as e:
+            print(f"get_all_keywords_with_desc 오류: {e}")
+            db_manager.mark_failure()
+            return {}
+        finally:
+            if cursor: cursor.close()
 
 # --- [수정된 함수] ---
-def search_recalls(brand, model, year, keyword):
-    conn = db_manager.create_connection()
-    if conn is None: return pd.DataFrame() 
-    cursor = None
-    try:
-        query = """
-        SELECT 
-            r.recall_id AS '리콜ID', -- [★ 수정] 클릭 이벤트를 위해 recall_id 추가
-            b.brand_name AS '브랜드', 
-            m.model_name AS '차종', 
-            r.recall_date AS '리콜개시일',
-            r.prod_from AS '생산시작', 
-            r.prod_to AS '생산종료', 
-            r.reason AS '리콜사유',
-            r.recall_count AS '리콜대수', 
-            r.correction_count AS '시정대수', 
-            r.correction_rate AS '시정률(%)' 
-        FROM Recall AS r
-        JOIN Model AS m ON r.model_id = m.model_id
-        JOIN Brand AS b ON m.brand_id = b.brand_id
-        LEFT JOIN Recall_Keyword_Junction AS rkj ON r.recall_id = rkj.recall_id
-        LEFT JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
-        """
-        where_clauses = []
-        params = []
-        if brand and brand != "전체":
-            where_clauses.append("b.brand_name = %s")
-            params.append(brand)
-        if model and model != "전체":
-            where_clauses.append("m.model_name = %s")
-            params.append(model)
-        if year and year != "전체":
-            where_clauses.append("YEAR(r.recall_date) = %s")
-            params.append(str(year))
-        if keyword and keyword != "전체":
-            where_clauses.append("k.keyword_text = %s")
-            params.append(keyword)
-
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        query += " GROUP BY r.recall_id ORDER BY r.recall_date DESC LIMIT 200;"
+SEARCH_PAGE_SIZE = 50 # [신규] 상세 검색 한 페이지당 행 수
+
+
+def _uses_fulltext():
+    """MySQL은 Recall.reason의 FULLTEXT(ngram) 인덱스를 사용하고, SQLite 저장소는 문자열 검색으로 대신합니다."""
+    return db_manager.get_storage_config()['backend'] == 'mysql'
+
+
+def _build_text_filter(terms):
+    """자유 검색어 WHERE 절과 파라미터"""
+    if _uses_fulltext():
+        return "MATCH(r.reason) AGAINST (%s IN BOOLEAN MODE)", [_to_boolean_query(terms)]
+    return " AND ".join("instr(r.reason, %s) > 0" for _ in terms), list(terms)
+
+
+def _build_relevance_expr(terms):
+    """
+    관련도 식과 파라미터. MySQL은 전문 검색 점수(키셋 비교가 안정적이도록 소수 6자리로 반올림),
+    SQLite는 검색어 등장 횟수의 합입니다.
+    """
+    if _uses_fulltext():
+        return "ROUND(MATCH(r.reason) AGAINST (%s IN BOOLEAN MODE), 6)", [_to_boolean_query(terms)]
+    expr = " + ".join("(LENGTH(r.reason) - LENGTH(REPLACE(r.reason, %s, ''))) / LENGTH(%s)" for _ in terms)
+    return f"({expr})", [param for term in terms for param in (term, term)]
+
+
+def _to_boolean_query(terms):
+    # ngram 파서에서 "검색어"는 검색어의 n-gram이 연속으로 나오는 구절로 검색됩니다. (+: 모두 포함)
+    return " ".join(f'+"{term}"' for term in terms)
+
+
+def _build_search_filters(brand, model, year, keyword, text=None):
+    """검색 조건을 WHERE 절 목록과 파라미터로 변환합니다. (목록 조회 / 건수 조회 공통)"""
+    where_clauses = []
+    params = []
+    if brand and brand != "전체":
+        where_clauses.append("b.brand_name = %s")
+        params.append(brand)
+    if model and model != "전체":
+        where_clauses.append("m.model_name = %s")
+        params.append(model)
+    if year and year != "전체":
+        where_clauses.append("r.recall_date >= %s AND r.recall_date < %s")
+        params.extend([date(int(year), 1, 1), date(int(year) + 1, 1, 1)])
+    if keyword and keyword != "전체":
+        where_clauses.append("""EXISTS (
+            SELECT 1 FROM Recall_Keyword_Junction AS rkj
+            JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
+            WHERE rkj.recall_id = r.recall_id AND k.keyword_text = %s
+        )""")
+        params.append(keyword)
+    terms = parse_search_text(text)
+    if terms:
+        text_clause, text_params = _build_text_filter(terms)
+        where_clauses.append(text_clause)
+        params.extend(text_params)
+    return where_clauses, params
+
+
+def _build_seek_clause(seek, direction):
+    """
+    키셋 페이지네이션 조건을 만듭니다. 정렬 순서는 (recall_date DESC, recall_id DESC)이며
+    MySQL에서 NULL 날짜는 DESC 정렬 시 맨 뒤에 오므로 그 경우도 함께 처리합니다.
+    seek: 기준 행의 (recall_date, recall_id) / direction: 'next'(기준 다음) 또는 'prev'(기준 이전)
+    """
+    seek_date, seek_id = seek
+    if direction == 'next':
+        if seek_date is None:
+            return "(r.recall_date IS NULL AND r.recall_id < %s)", [seek_id]
+        return ("(r.recall_date < %s OR (r.recall_date = %s AND r.recall_id < %s) OR r.recall_date IS NULL)",
+                [seek_date, seek_date, seek_id])
+    if seek_date is None:
+        return "(r.recall_date IS NOT NULL OR r.recall_id > %s)", [seek_id]
+    return "(r.recall_date > %s OR (r.recall_date = %s AND r.recall_id > %s))", [seek_date, seek_date, seek_id]
+
+
+def _build_relevance_seek_clause(relevance_sql, relevance_params, seek, direction):
+    """자유 검색어 결과의 키셋 조건. 정렬 순서는 (관련도 DESC, recall_id DESC)입니다."""
+    seek_score, seek_id = seek
+    op = '<' if direction == 'next' else '>'
+    clause = f"({relevance_sql} {op} %s OR ({relevance_sql} = %s AND r.recall_id {op} %s))"
+    return clause, relevance_params + [seek_score] + relevance_params + [seek_score, seek_id]
+
+
+def build_search_query(brand, model, year, keyword, limit=200, seek=None, direction='next', text=None):
+    """
+    search_recalls의 SQL과 파라미터를 만듭니다. (실행 계획 점검 스크립트에서도 사용)
+    - 연도 필터는 YEAR(r.recall_date) 대신 반개구간 [해당 연도 1/1, 다음 연도 1/1)으로 비교하여
+      recall_date 인덱스를 사용할 수 있게 합니다.
+    - 키워드는 선택된 경우에만 EXISTS 세미조인으로 확인합니다. Junction을 LEFT JOIN 하지 않으므로
+      행이 늘어나지 않고, 따라서 GROUP BY도 필요 없습니다.
+    - seek가 주어지면 OFFSET 대신 (recall_date, recall_id) 기준 키셋 조건으로 다음/이전 페이지를 읽습니다.
+      (direction='prev'는 역순으로 읽으므로 호출하는 쪽에서 결과를 뒤집어야 합니다)
+    - text(자유 검색어)가 있으면 리콜사유 전문 검색 결과를 '관련도' 순으로 정렬하고,
+      키셋도 (관련도, recall_id) 기준이 됩니다.
+    """
+    terms = parse_search_text(text)
+    select_params = []
+    order_params = []
+    query = """
+    SELECT 
+        r.recall_id AS '리콜ID', -- [★ 수정] 클릭 이벤트를 위해 recall_id 추가
+        b.brand_name AS '브랜드', 
+        m.model_name AS '차종', 
+        r.recall_date AS '리콜개시일',
+        r.prod_from AS '생산시작', 
+        r.prod_to AS '생산종료', 
+        r.reason AS '리콜사유',
+        r.recall_count AS '리콜대수', 
+        r.correction_count AS '시정대수', 
+        r.correction_rate AS '시정률(%)' 
+    """
+    if terms:
+        relevance_sql, relevance_params = _build_relevance_expr(terms)
+        query += f", {relevance_sql} AS '관련도'"
+        select_params = list(relevance_params)
+    query += """
+    FROM Recall AS r
+    JOIN Model AS m ON r.model_id = m.model_id
+    JOIN Brand AS b ON m.brand_id = b.brand_id
+    """
+    where_clauses, params = _build_search_filters(brand, model, year, keyword, text)
+    if seek is not None:
+        if terms:
+            seek_clause, seek_params = _build_relevance_seek_clause(relevance_sql, relevance_params, seek, direction)
+        else:
+            seek_clause, seek_params = _build_seek_clause(seek, direction)
+        where_clauses.append(seek_clause)
+        params.extend(seek_params)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    # recall_id를 보조 정렬 키로 두어 같은 날짜(관련도)의 리콜도 항상 같은 순서로 반환합니다.
+    order = "ASC" if direction == 'prev' else "DESC"
+    if terms:
+        query += f" ORDER BY {relevance_sql} {order}, r.recall_id {order}"
+        order_params = list(relevance_params)
+    else:
+        query += f" ORDER BY r.recall_date {order}, r.recall_id {order}"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return query + ";", tuple(select_params + params + order_params)
+
+
+@instrument()
+def search_recalls(brand, model, year, keyword, text=None):
+    snapshot = embedded_engine.get_snapshot(text)
+    if snapshot is not None:
+        return snapshot.search_recalls(brand, model, year, keyword, text=text)
+    with db_manager.get_connection() as conn:
+        if conn is None: return pd.DataFrame() 
+        cursor = None
+        try:
+            query, params = build_search_query(brand, model, year, keyword, text=text)
         
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query, tuple(params))
-        results_list = cursor.fetchall()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, params)
+            results_list = cursor.fetchall()
 
-        if not results_list:
+            if not results_list:
+                return pd.DataFrame()
+            return pd.DataFrame(results_list)
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (search_recalls): {e}")
+            db_manager.mark_failure()
             return pd.DataFrame()
-        return pd.DataFrame(results_list)
-    except Exception as e:
-        print(f"백엔드 쿼리 오류 (search_recalls): {e}")
-        return pd.DataFrame()
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+        finally:
+            if cursor: cursor.close()
+
+
+# --- [신규] 키셋 페이지네이션 검색 ---
+@instrument()
+def search_recalls_page(brand, model, year, keyword, seek=None, direction='next', page_size=SEARCH_PAGE_SIZE,
+                        text=None):
+    """
+    검색 결과의 한 페이지를 반환합니다. 페이지가 깊어져도 OFFSET처럼 앞 행을 건너뛰며 읽지 않으므로
+    모든 페이지의 비용이 같습니다.
+    - seek=None: 첫 페이지
+    - seek=(리콜개시일, 리콜ID), direction='next': 해당 행 다음 페이지 (현재 페이지의 마지막 행 기준)
+    - seek=(리콜개시일, 리콜ID), direction='prev': 해당 행 이전 페이지 (현재 페이지의 첫 행 기준)
+    - text: 리콜사유 자유 검색어. 주어지면 관련도 순으로 정렬하며 seek는 (관련도, 리콜ID)입니다.
+    반환: (결과 DataFrame, page_info)
+      page_info = {'has_next', 'has_prev', 'first': (정렬 값, ID), 'last': (정렬 값, ID)}
+    """
+    page_info = {'has_next': False, 'has_prev': False, 'first': None, 'last': None}
+    snapshot = embedded_engine.get_snapshot(text)
+    if snapshot is not None:
+        return snapshot.search_recalls_page(brand, model, year, keyword, seek, direction, page_size, text)
+    with db_manager.get_connection() as conn:
+        if conn is None: return pd.DataFrame(), page_info
+        cursor = None
+        try:
+            # 한 행을 더 읽어서 그 방향으로 페이지가 더 있는지 판단합니다.
+            query, params = build_search_query(brand, model, year, keyword, limit=page_size + 1,
+                                               seek=seek, direction=direction, text=text)
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (search_recalls_page): {e}")
+            db_manager.mark_failure()
+            return pd.DataFrame(), page_info
+        finally:
+            if cursor: cursor.close()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == 'prev':
+        rows.reverse()
+        page_info['has_prev'] = has_more
+        page_info['has_next'] = True
+    else:
+        page_info['has_next'] = has_more
+        page_info['has_prev'] = seek is not None
+
+    if not rows:
+        return pd.DataFrame(), page_info
+    sort_column = '관련도' if parse_search_text(text) else '리콜개시일'
+    page_info['first'] = (rows[0][sort_column], rows[0]['리콜ID'])
+    page_info['last'] = (rows[-1][sort_column], rows[-1]['리콜ID'])
+    return pd.DataFrame(rows), page_info
+
+
+@cache_by_data_version()
+def count_search_results(brand, model, year, keyword, text=None):
+    """검색 조건에 맞는 전체 리콜 건수를 반환합니다. (페이지 목록과 별도의 건수 조회)"""
+    snapshot = embedded_engine.get_snapshot(text)
+    if snapshot is not None:
+        return snapshot.count_search_results(brand, model, year, keyword, text)
+    where_clauses, params = _build_search_filters(brand, model, year, keyword, text)
+    query = "SELECT COUNT(*) FROM Recall AS r"
+    # 브랜드/차종 필터가 있을 때만 Model/Brand를 조인합니다.
+    if (brand and brand != "전체") or (model and model != "전체"):
+        query += " JOIN Model AS m ON r.model_id = m.model_id JOIN Brand AS b ON m.brand_id = b.brand_id"
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    with db_manager.get_connection() as conn:
+        if conn is None: return 0
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(params))
+            result = cursor.fetchone()
+            return int(result[0]) if result else 0
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (count_search_results): {e}")
+            db_manager.mark_failure()
+            return 0
+        finally:
+            if cursor: cursor.close()
 # --- [수정 끝] ---
 
 
-def get_recall_comparison(brand, model):
-    if not brand or not model or brand == "전체" or model == "전체":
-        return None, pd.DataFrame() 
-    conn = db_manager.create_connection()
-    if conn is None:
-        return None, pd.DataFrame()
-    
-    stats = {'total_recalls': 0, 'avg_correction_rate': 0}
-    keywords_df = pd.DataFrame()
-    cursor = None
-    
-    try:
-        cursor = conn.cursor(dictionary=True)
-        stats_query = """
-        SELECT COUNT(DISTINCT r.recall_id) as total_recalls, AVG(r.correction_rate) as avg_correction_rate
-        FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
-        WHERE b.brand_name = %s AND m.model_name = %s;
-        """
-        cursor.execute(stats_query, (brand, model))
-        stats_result = cursor.fetchone()
-        
-        if isinstance(stats_result, dict):
+# --- [신규] 여러 차종 비교 (한 번의 쿼리) ---
+COMPARE_MAX_MODELS = 6 # 차량 비교 탭에서 한 번에 비교할 수 있는 최대 차종 수
+
+# 적재 시 미리 계산된 차종별 집계(Model_Stats, Model_Keyword_Stats)를 여러 차종에 대해 한 번에 읽습니다.
+# (sql/migrations/004 참고) 키워드 TOP 10은 차종별로 파이썬에서 자릅니다.
+MODEL_COMPARISON_QUERY = """
+SELECT ms.brand_name, ms.model_name, ms.recall_count AS total_recalls, ms.avg_correction_rate,
+       k.keyword_text, k.keyword_desc, mks.keyword_count
+FROM Model_Stats ms
+LEFT JOIN Model_Keyword_Stats mks ON mks.model_id = ms.model_id
+LEFT JOIN Keyword k ON mks.keyword_id = k.keyword_id
+WHERE {conditions}
+ORDER BY ms.model_id, mks.keyword_count DESC, mks.keyword_id;
+"""
+
+# Model_Stats / Model_Keyword_Stats가 아직 없는 DB(마이그레이션 004 이전)용: 같은 형태의 결과를
+# 선택한 차종의 Recall⋈Model⋈Brand(⋈Junction) 집계로 계산합니다. ({conditions}는 두 번 들어갑니다)
+MODEL_COMPARISON_FALLBACK_QUERY = """
+SELECT ms.brand_name, ms.model_name, ms.recall_count AS total_recalls, ms.avg_correction_rate,
+       k.keyword_text, k.keyword_desc, mks.keyword_count
+FROM (
+    SELECT m.model_id, b.brand_name, m.model_name,
+           COUNT(r.recall_id) AS recall_count, AVG(r.correction_rate) AS avg_correction_rate
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    WHERE {conditions}
+    GROUP BY m.model_id, b.brand_name, m.model_name
+) ms
+LEFT JOIN (
+    SELECT r.model_id, rkj.keyword_id, COUNT(*) AS keyword_count
+    FROM Recall r JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+    JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    WHERE {conditions}
+    GROUP BY r.model_id, rkj.keyword_id
+) mks ON mks.model_id = ms.model_id
+LEFT JOIN Keyword k ON mks.keyword_id = k.keyword_id
+ORDER BY ms.model_id, mks.keyword_count DESC, mks.keyword_id;
+"""
+
+
+def _normalize_models(models):
+    """비교할 (브랜드, 차종) 목록에서 '전체'/빈 값을 빼고 중복을 제거합니다. (순서 유지)"""
+    valid = [(b, m) for b, m in models if b and m and b != "전체" and m != "전체"]
+    return list(dict.fromkeys(valid))
+
+
+def _comparison_stats(total_recalls, avg_rate):
+    """Model_Stats 한 행을 기존 get_recall_comparison의 stats 형식으로 변환합니다."""
+    total_recalls_count = 0
+    if isinstance(total_recalls, (int, float, decimal.Decimal, str)):
+        try:
+            total_recalls_count = int(float(total_recalls))
+        except (ValueError, TypeError):
             total_recalls_count = 0
-            value = stats_result.get('total_recalls')
-            if isinstance(value, (int, float, decimal.Decimal, str)):
-                try:
-                    total_recalls_count = int(float(value)) 
-                except (ValueError, TypeError):
-                    total_recalls_count = 0
-            
-            if total_recalls_count > 0:
-                final_avg_rate = 0
-                avg_rate = stats_result.get('avg_correction_rate') 
-                if isinstance(avg_rate, (decimal.Decimal, float, int)):
-                    final_avg_rate = round(float(avg_rate), 2)
-                
-                stats = {'total_recalls': total_recalls_count, 'avg_correction_rate': final_avg_rate}
-
-        keywords_query = """
-        SELECT k.keyword_text, k.keyword_desc, COUNT(k.keyword_text) as keyword_count
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
-        JOIN Keyword k ON rkj.keyword_id = k.keyword_id
-        WHERE b.brand_name = %s AND m.model_name = %s
-        GROUP BY k.keyword_text, k.keyword_desc ORDER BY keyword_count DESC LIMIT 10;
-        """
-        cursor.execute(keywords_query, (brand, model))
-        keywords_list = cursor.fetchall()
-        if keywords_list:
-            keywords_df = pd.DataFrame(keywords_list)
-            
-    except Exception as e:
-        print(f"백엔드 쿼리 오류 (get_recall_comparison): {e}")
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+    if total_recalls_count <= 0:
+        return {'total_recalls': 0, 'avg_correction_rate': 0}
+    final_avg_rate = 0
+    if isinstance(avg_rate, (decimal.Decimal, float, int)):
+        final_avg_rate = round(float(avg_rate), 2)
+    return {'total_recalls': total_recalls_count, 'avg_correction_rate': final_avg_rate}
+
+
+def _fetch_model_comparisons(models):
+    """
+    {(브랜드, 차종): (stats, 키워드 TOP 10 DataFrame)}를 반환합니다. 차종 수와 관계없이 쿼리는 한 번입니다.
+    데이터가 없는 차종은 ({'total_recalls': 0, 'avg_correction_rate': 0}, 빈 DataFrame)입니다.
+    """
+    empty = {model: ({'total_recalls': 0, 'avg_correction_rate': 0}, pd.DataFrame()) for model in models}
+    if not models:
+        return {}
+    snapshot = embedded_engine.get_snapshot()
+    if snapshot is not None:
+        return {model: snapshot.get_recall_comparison(*model) for model in models}
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return {model: (None, pd.DataFrame()) for model in models}
+        cursor = None
+        try:
+            params = tuple(value for model in models for value in model)
+            cursor = conn.cursor(dictionary=True)
+            try:
+                conditions = " OR ".join("(ms.brand_name = %s AND ms.model_name = %s)" for _ in models)
+                cursor.execute(MODEL_COMPARISON_QUERY.format(conditions=conditions), params)
+                rows = cursor.fetchall()
+            except Exception as e:
+                print(f"compare_models: Model_Stats 조회 실패, 집계 쿼리로 대체합니다. ({e})")
+                conditions = " OR ".join("(b.brand_name = %s AND m.model_name = %s)" for _ in models)
+                cursor.execute(MODEL_COMPARISON_FALLBACK_QUERY.format(conditions=conditions), params + params)
+                rows = cursor.fetchall()
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (compare_models): {e}")
+            db_manager.mark_failure()
+            return empty
+        finally:
+            if cursor: cursor.close()
 
-    return stats, keywords_df
+    results = dict(empty)
+    keywords = {}
+    for row in rows:
+        model = (row['brand_name'], row['model_name'])
+        if model not in results:
+            continue
+        if model not in keywords:
+            results[model] = (_comparison_stats(row['total_recalls'], row['avg_correction_rate']), pd.DataFrame())
+            keywords[model] = []
+        if row['keyword_text'] is not None and len(keywords[model]) < 10:
+            keywords[model].append({'keyword_text': row['keyword_text'], 'keyword_desc': row['keyword_desc'],
+                                    'keyword_count': row['keyword_count']})
+    for model, keyword_rows in keywords.items():
+        if keyword_rows:
+            results[model] = (results[model][0], pd.DataFrame(keyword_rows))
+    return results
 
-@st.cache_data(ttl=3600)
+
+@cache_by_data_version()
+def compare_models(models):
+    """
+    여러 차종의 리콜 통계와 핵심 키워드 TOP 10을 한 번의 쿼리로 조회합니다. (차종 목록 단위로 캐시)
+    - models: [(브랜드, 차종), ...] (차량 비교 탭은 최대 COMPARE_MAX_MODELS개)
+    반환: models와 같은 순서의 [(stats, keywords_df), ...]
+      '전체'나 빈 값이 들어간 항목은 get_recall_comparison과 같이 (None, 빈 DataFrame)입니다.
+    """
+    models = [tuple(model) for model in models]
+    results = _fetch_model_comparisons(_normalize_models(models))
+    return [results.get(model, (None, pd.DataFrame())) for model in models]
+
+
+@cache_by_data_version()
+def get_recall_comparison(brand, model):
+    """차종 하나의 리콜 통계와 핵심 키워드 TOP 10 (compare_models와 같은 조회)"""
+    results = _fetch_model_comparisons(_normalize_models([(brand, model)]))
+    return results.get((brand, model), (None, pd.DataFrame()))
+
+@cache_by_data_version()
 def get_model_profile_data(brand, model):
     if not brand or not model or brand == "전체" or model == "전체":
         return pd.DataFrame(), "" 
-    conn = db_manager.create_connection()
-    if conn is None:
-        return pd.DataFrame(), ""
-    history_df = pd.DataFrame()
-    all_reasons_string = ""
-    cursor = None 
-    try:
-        query = """
-        SELECT 
-            r.recall_date AS '리콜개시일', r.reason AS '리콜사유',
-            r.recall_count AS '리콜대수', r.correction_rate AS '시정률(%)'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        WHERE b.brand_name = %s AND m.model_name = %s
-        ORDER BY r.recall_date DESC;
-        """
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query, (brand, model))
-        rows = cursor.fetchall()
+    snapshot = embedded_engine.get_snapshot()
+    if snapshot is not None:
+        return snapshot.get_model_profile_data(brand, model)
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return pd.DataFrame(), ""
+        history_df = pd.DataFrame()
+        all_reasons_string = ""
+        cursor = None 
+        try:
+            query = """
+            SELECT 
+                r.recall_date AS '리콜개시일', r.reason AS '리콜사유',
+                r.recall_count AS '리콜대수', r.correction_rate AS '시정률(%)'
+            FROM Recall r
+            JOIN Model m ON r.model_id = m.model_id
+            JOIN Brand b ON m.brand_id = b.brand_id
+            WHERE b.brand_name = %s AND m.model_name = %s
+            ORDER BY r.recall_date DESC;
+            """
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, (brand, model))
+            rows = cursor.fetchall()
         
-        if rows:
-            history_df = pd.DataFrame(rows)
+            if rows:
+                history_df = pd.DataFrame(rows)
             
-            reason_list = []
-            for row in rows:
-                if isinstance(row, dict):
-                    reason = row.get('리콜사유')
-                    if isinstance(reason, str): 
-                        reason_list.append(reason)
+                reason_list = []
+                for row in rows:
+                    if isinstance(row, dict):
+                        reason = row.get('리콜사유')
+                        if isinstance(reason, str): 
+                            reason_list.append(reason)
             
-            all_reasons_string = " ".join(reason_list)
+                all_reasons_string = " ".join(reason_list)
             
-    except Exception as e:
-        print(f"get_model_profile_data 오류: {e}")
-    finally:
-        if cursor: cursor.close() 
-        if conn and conn.is_connected(): conn.close()
-    return history_df, all_reasons_string
+        except Exception as e:
+            print(f"get_model_profile_data 오류: {e}")
+            db_manager.mark_failure()
+        finally:
+            if cursor: cursor.close() 
+        return history_df, all_reasons_string
 
 # --- [★ 신규 함수] ---
-@st.cache_data(ttl=600) # 10분간 캐시
+@cache_by_data_version()
 def get_keywords_for_recall(recall_id):
     """특정 recall_id에 연결된 모든 키워드를 조회합니다."""
     
-    conn = db_manager.create_connection()
-    if conn is None:
-        return []
-
-    keywords = []
-    cursor = None
-    try:
-        query = """
-        SELECT k.keyword_text 
-        FROM Recall_Keyword_Junction j
-        JOIN Keyword k ON j.keyword_id = k.keyword_id
-        WHERE j.recall_id = %s;
-        """
-        cursor = conn.cursor()
-        cursor.execute(query, (recall_id,))
-        rows = cursor.fetchall()
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return []
+
+        keywords = []
+        cursor = None
+        try:
+            query = """
+            SELECT k.keyword_text 
+            FROM Recall_Keyword_Junction j
+            JOIN Keyword k ON j.keyword_id = k.keyword_id
+            WHERE j.recall_id = %s;
+            """
+            cursor = conn.cursor()
+            cursor.execute(query, (recall_id,))
+            rows = cursor.fetchall()
         
-        if rows:
-            keywords = [row[0] for row in rows] # (('엔진',), ('화재',)) -> ['엔진', '화재']
-
-    except Exception as e:
-        print(f"get_keywords_for_recall 오류: {e}")
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+            if rows:
+                keywords = [row[0] for row in rows] # (('엔진',), ('화재',)) -> ['엔진', '화재']
+
+        except Exception as e:
+            print(f"get_keywords_for_recall 오류: {e}")
+            db_manager.mark_failure()
+        finally:
+            if cursor: cursor.close()
     
-    return keywords
+        return keywords
 # --- [신규 함수 끝] ---
\ No newline at end of file
@@ -0,0 +1,279 @@
+# 파일 이름: backend/shared_cache.py
+# [신규] 여러 Streamlit 프로세스(레플리카)가 함께 쓰는 조회 결과 캐시
+# st.cache_data는 프로세스마다 따로 있으므로, 레플리카가 여러 개면 같은 순위/요약/차종 조회를 각자 실행합니다.
+# cache_by_data_version(backend/data_version.py)으로 감싼 조회 함수는 프로세스 캐시에 없을 때
+# 먼저 이 공유 캐시를 확인하고, 여기에도 없을 때만 DB를 조회한 뒤 결과를 저장합니다.
+#  - 키: 함수 이름 + 데이터 버전 + 인자 해시 (새 적재가 커밋되면 다른 키가 되므로 바로 무효화)
+#  - 값: pickle(최신 프로토콜, DataFrame은 컬럼 버퍼를 그대로 직렬화) + 큰 값은 zlib 압축
+#  - 만료: ttl(초)이 지나면 버전과 관계없이 다시 조회 (이전 버전 항목도 이 시간이 지나면 정리됨)
+# 사용하려면 secrets.toml에 아래 설정을 추가합니다. (없으면 프로세스 캐시만 사용)
+#   [shared_cache]
+#   backend = "sqlite"                        # "sqlite"(같은 서버의 프로세스끼리), "redis", "local"(프로세스 내부, 검증용)
+#   path = "data/shared_cache.db"             # sqlite: 캐시 파일 (프로젝트 루트 기준)
+#   url = "redis://cache-host:6379/0"         # redis: 접속 주소 (redis 패키지 필요: pip install redis)
+#   ttl = 86400                               # (선택) 항목 유지 시간(초)
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+
+import streamlit as st
+
+from . import db_manager
+
+SHARED_CACHE_DEFAULTS = {
+    'backend': None,          # None이면 사용하지 않음
+    'path': 'data/shared_cache.db',
+    'url': 'redis://localhost:6379/0',
+    'ttl': 86400,
+    'prefix': 'lemon',        # 같은 저장소를 다른 앱과 함께 쓸 때 키 구분용
+    'compress_threshold': 65536, # 직렬화 결과가 이 크기(바이트) 이상이면 압축
+    'socket_timeout': 0.5,    # redis: 응답 대기 시간(초). 캐시가 느리면 DB 조회가 더 빠름
+}
+
+_RAW, _COMPRESSED = b'P', b'Z' # 값 앞의 1바이트 (압축 여부)
+
+
+def serialize(value, compress_threshold=SHARED_CACHE_DEFAULTS['compress_threshold']):
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if compress_threshold is not None and len(data) >= compress_threshold:
+        return _COMPRESSED + zlib.compress(data, 1)
+    return _RAW + data
+
+
+def deserialize(data):
+    if data[:1] == _COMPRESSED:
+        return pickle.loads(zlib.decompress(data[1:]))
+    return pickle.loads(data[1:])
+
+
+def make_key(prefix, func, data_version, args, kwargs):
+    """함수/데이터 버전/인자로 만든 캐시 키 (인자는 pickle 해시, 조회 함수의 인자는 문자열/숫자/튜플)"""
+    arg_hash = hashlib.sha1(pickle.dumps((args, sorted(kwargs.items())), protocol=4)).hexdigest()
+    return f"{prefix}:{func.__module__}.{func.__qualname__}:{data_version}:{arg_hash}"
+
+
+# --- 저장소 (get/set/clear만 구현하면 됩니다) ---
+class LocalCacheStore:
+    """프로세스 내부 딕셔너리 저장소 (검증 스크립트용 대역, 레플리카 간 공유는 되지 않음)"""
+    name = 'local'
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return data
+
+    def set(self, key, data, ttl=None):
+        with self._lock:
+            self._entries[key] = (data, time.time() + ttl if ttl else None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheStore:
+    """SQLite 파일 저장소 (같은 서버에서 실행하는 여러 프로세스가 공유). 스레드마다 커넥션을 따로 엽니다."""
+    name = 'sqlite'
+    PRUNE_EVERY = 500 # 이 횟수만큼 저장할 때마다 만료된 항목을 지웁니다.
+
+    def __init__(self, path):
+        self.path = path if os.path.isabs(path) else os.path.join(db_manager.PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL
+        )
+        """)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL") # 읽는 프로세스가 쓰는 프로세스를 기다리지 않음
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, data, ttl=None):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, sqlite3.Binary(data), now + ttl if ttl else None))
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        conn.commit()
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries")
+        conn.commit()
+
+
+class RedisCacheStore:
+    """Redis 프로토콜 저장소 (여러 서버의 레플리카가 공유). redis 패키지가 있어야 합니다."""
+    name = 'redis'
+
+    def __init__(self, url, prefix, socket_timeout=0.5):
+        import redis  # 사용할 때만 임포트 (선택 의존성)
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=socket_timeout,
+                                            socket_connect_timeout=socket_timeout)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, data, ttl=None):
+        self._client.set(key, data, ex=int(ttl) if ttl else None)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f"{self.prefix}:*", count=1000):
+            self._client.delete(key)
+
+
+# --- 설정 / 저장소 선택 ---
+_store = None
+_store_config = dict(SHARED_CACHE_DEFAULTS)
+_store_ready = False
+_store_override = None
+_store_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {'hits': Counter(), 'misses': Counter(), 'errors': Counter()}
+
+
+def get_shared_cache_config():
+    """현재 공유 캐시 설정(dict)을 반환합니다. (configure_shared_cache > secrets.toml [shared_cache] > 기본값)"""
+    config = dict(SHARED_CACHE_DEFAULTS)
+    if _store_override is not None:
+        config.update(_store_override)
+        return config
+    try:
+        config.update(st.secrets.get('shared_cache', {}))
+    except Exception:
+        pass  # secrets.toml이 없으면 사용하지 않음
+    return config
+
+
+def configure_shared_cache(backend, **options):
+    """
+    secrets.toml 대신 코드에서 공유 캐시를 지정합니다. backend=None이면 끕니다.
+    (벤치마크/검증 스크립트용) 예: configure_shared_cache('local'), configure_shared_cache('sqlite', path='/tmp/c.db')
+    """
+    global _store, _store_ready, _store_override
+    with _store_lock:
+        _store_override = dict(options, backend=backend)
+        _store, _store_ready = None, False
+
+
+def _make_store(config):
+    backend = config['backend']
+    if backend == 'local':
+        return LocalCacheStore()
+    if backend == 'sqlite':
+        return SQLiteCacheStore(config['path'])
+    if backend == 'redis':
+        return RedisCacheStore(config['url'], config['prefix'], config['socket_timeout'])
+    raise ValueError(f"지원하지 않는 공유 캐시입니다: {backend} (sqlite, redis 또는 local)")
+
+
+def get_store():
+    """설정된 공유 캐시 저장소를 반환합니다. 사용하지 않거나 만들 수 없으면 None (프로세스 캐시만 사용)"""
+    global _store, _store_config, _store_ready
+    if not _store_ready:
+        with _store_lock:
+            if not _store_ready:
+                config = _store_config = get_shared_cache_config()
+                if config['backend']:
+                    try:
+                        _store = _make_store(config)
+                    except Exception as e:
+                        print(f"공유 캐시 비활성화 (프로세스 캐시만 사용): {e}")
+                        _store = None
+                _store_ready = True
+    return _store
+
+
+def _count(kind, name):
+    with _stats_lock:
+        _stats[kind][name] += 1
+
+
+def cached_call(func, args, kwargs, data_version):
+    """
+    공유 캐시에서 func(*args, **kwargs)의 결과를 찾고, 없으면 실행해서 저장합니다.
+    공유 캐시를 쓰지 않거나 저장소 오류가 나면 func를 그대로 실행합니다. (캐시 장애가 화면 오류가 되지 않도록)
+    DB에 연결하지 못했거나 쿼리 오류로 기본값을 받은 호출의 결과는 저장하지 않습니다.
+    (cache_by_data_version과 같은 db_manager.connection_failure_scope / mark_failure 신호)
+    """
+    store = get_store()
+    if store is None:
+        return func(*args, **kwargs)
+    config = _store_config
+    name = func.__qualname__
+    key = make_key(config['prefix'], func, data_version, args, kwargs)
+    try:
+        data = store.get(key)
+        if data is not None:
+            value = deserialize(data)
+            _count('hits', name)
+            return value
+    except Exception as e:
+        _count('errors', name)
+        print(f"공유 캐시 읽기 오류 ({name}): {e}")
+    _count('misses', name)
+    with db_manager.connection_failure_scope() as scope:
+        value = func(*args, **kwargs)
+    if scope['failed']:
+        # 연결 실패 / 쿼리 오류로 받은 기본값(빈 결과)은 모든 레플리카가 ttl 동안 보게 되므로 저장하지 않습니다.
+        return value
+    try:
+        store.set(key, serialize(value, config['compress_threshold']), config['ttl'])
+    except Exception as e:
+        _count('errors', name)
+        print(f"공유 캐시 저장 오류 ({name}): {e}")
+    return value
+
+
+def get_shared_cache_stats():
+    """공유 캐시 적중/실패/오류 횟수 (전체 합계와 함수별)"""
+    with _stats_lock:
+        names = set(_stats['hits']) | set(_stats['misses']) | set(_stats['errors'])
+        functions = {name: {kind: _stats[kind][name] for kind in _stats} for name in sorted(names)}
+        totals = {kind: sum(counter.values()) for kind, counter in _stats.items()}
+    store = _store if _store_ready else None
+    lookups = totals['hits'] + totals['misses']
+    return dict(totals, backend=store.name if store else None,
+                hit_rate=totals['hits'] / lookups if lookups else 0.0, functions=functions)
+
+
+def reset_shared_cache_stats():
+    with _stats_lock:
+        for counter in _stats.values():
+            counter.clear()
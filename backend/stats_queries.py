@@ -1,129 +1,161 @@
 # 파일 이름: backend/stats_queries.py
 import pandas as pd
-import streamlit as st
 from datetime import date, datetime # [수정] datetime 객체도 import
 from . import db_manager # 같은 폴더의 db_manager를 임포트
+from . import embedded_engine # [신규] 임베디드 모드일 때 메모리 스냅샷에서 조회
+from .data_version import cache_by_data_version # [신규] 적재 시 바뀌는 데이터 버전으로 캐시 무효화
 import decimal # 타입 검사를 위해 임포트
 
-# --- [수정] Pylance 경고를 해결하기 위해 로직 재구성 ---
-@st.cache_data(ttl=3600)
+# --- [신규] 요약 통계 조회 쿼리 ---
+# 적재 스크립트가 미리 계산해 둔 Summary_Stats 한 행을 기본키로 읽습니다. (sql/migrations/003 참고)
+SUMMARY_STATS_QUERY = """
+SELECT total_recalls, total_brands, total_models, top_brand_name, top_brand_recalls,
+       min_recall_date AS min_date, max_recall_date AS max_date
+FROM Summary_Stats WHERE stat_id = 1
+"""
+
+# Summary_Stats가 아직 없는 DB(마이그레이션 003 이전)용: 같은 값을 쿼리 하나로 계산합니다.
+SUMMARY_STATS_FALLBACK_QUERY = """
+SELECT
+    (SELECT COUNT(recall_id) FROM Recall) AS total_recalls,
+    (SELECT COUNT(brand_id) FROM Brand) AS total_brands,
+    (SELECT COUNT(model_id) FROM Model) AS total_models,
+    top.brand_name AS top_brand_name,
+    top.count AS top_brand_recalls,
+    (SELECT MIN(recall_date) FROM Recall) AS min_date,
+    (SELECT MAX(recall_date) FROM Recall) AS max_date
+FROM (SELECT 1) AS one
+LEFT JOIN (
+    SELECT b.brand_name, COUNT(r.recall_id) AS count
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_name ORDER BY count DESC LIMIT 1
+) AS top ON TRUE
+"""
+
+# --- [신규] 브랜드 순위 쿼리 ---
+# 적재 시 미리 계산된 Brand_Stats를 읽습니다. (sql/migrations/004 참고)
+BRAND_RECALL_RANK_QUERY = """
+SELECT 
+    brand_name AS '브랜드', recall_count AS '총 리콜 건수'
+FROM Brand_Stats
+ORDER BY recall_count DESC, brand_name;
+"""
+BRAND_RATE_RANK_QUERY = """
+SELECT 
+    brand_name AS '브랜드', avg_correction_rate AS '평균 시정률 (%)',
+    recall_count AS '리콜 건수'
+FROM Brand_Stats
+WHERE recall_count >= 5 
+ORDER BY avg_correction_rate DESC, brand_name;
+"""
+
+# Brand_Stats가 아직 없는 DB(마이그레이션 004 이전)용: 같은 순위를 Recall⋈Model⋈Brand 집계로 계산합니다.
+BRAND_RECALL_RANK_FALLBACK_QUERY = """
+SELECT 
+    b.brand_name AS '브랜드', COUNT(DISTINCT r.recall_id) AS '총 리콜 건수'
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY b.brand_name ORDER BY `총 리콜 건수` DESC, b.brand_name;
+"""
+BRAND_RATE_RANK_FALLBACK_QUERY = """
+SELECT 
+    b.brand_name AS '브랜드', AVG(r.correction_rate) AS '평균 시정률 (%)',
+    COUNT(DISTINCT r.recall_id) AS '리콜 건수'
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY b.brand_name HAVING `리콜 건수` >= 5 
+ORDER BY `평균 시정률 (%)` DESC, b.brand_name;
+"""
+
+
+# Pylance를 위한 안전한 int 변환 헬퍼 함수
+def safe_int_from_value(value, default=0):
+    if isinstance(value, (int, float, decimal.Decimal, str)):
+        try:
+            return int(float(value)) 
+        except (ValueError, TypeError):
+            return default 
+    return default
+
+
+# --- [수정] 쿼리 5개 대신 요약 행 하나를 읽도록 변경 (반환 형태는 동일) ---
+@cache_by_data_version()
 def get_summary_stats():
     """상단 요약 대시보드를 위한 통계 데이터를 가져옵니다."""
     stats = {
         'total_recalls': 0, 'total_brands': 0, 'total_models': 0,
         'most_recall_brand': ('N/A', 0), 'data_period': ('N/A', 'N/A')
     }
-    conn = db_manager.create_connection()
-    if conn is None: return stats
+    with db_manager.get_connection() as conn:
+        if conn is None: return stats
     
-    cursor = None 
+        cursor = None 
     
-    try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Pylance를 위한 안전한 int 변환 헬퍼 함수
-        def safe_int_from_value(value, default=0):
-            if isinstance(value, (int, float, decimal.Decimal, str)):
-                try:
-                    return int(float(value)) 
-                except (ValueError, TypeError):
-                    return default 
-            return default
+        try:
+            cursor = conn.cursor(dictionary=True)
 
-        # 1. 총 리콜 건수
-        cursor.execute("SELECT COUNT(recall_id) as count FROM Recall")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-             stats['total_recalls'] = safe_int_from_value(result.get('count'))
+            try:
+                cursor.execute(SUMMARY_STATS_QUERY)
+                result = cursor.fetchone()
+            except Exception as e:
+                print(f"get_summary_stats: Summary_Stats 조회 실패, 집계 쿼리로 대체합니다. ({e})")
+                result = None
+            if not isinstance(result, dict):
+                cursor.execute(SUMMARY_STATS_FALLBACK_QUERY)
+                result = cursor.fetchone()
 
-        # 2. 총 브랜드 수
-        cursor.execute("SELECT COUNT(brand_id) as count FROM Brand")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            stats['total_brands'] = safe_int_from_value(result.get('count'))
+            if isinstance(result, dict):
+                stats['total_recalls'] = safe_int_from_value(result.get('total_recalls'))
+                stats['total_brands'] = safe_int_from_value(result.get('total_brands'))
+                stats['total_models'] = safe_int_from_value(result.get('total_models'))
 
-        # 3. 총 차종 수
-        cursor.execute("SELECT COUNT(model_id) as count FROM Model")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            stats['total_models'] = safe_int_from_value(result.get('count'))
+                if result.get('top_brand_name') is not None:
+                    stats['most_recall_brand'] = (
+                        result['top_brand_name'], safe_int_from_value(result.get('top_brand_recalls'))
+                    )
 
-        # 4. 최다 리콜 브랜드
-        query = """
-        SELECT b.brand_name, COUNT(r.recall_id) as count 
-        FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name ORDER BY count DESC LIMIT 1;
-        """
-        cursor.execute(query)
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            brand_name = result.get('brand_name', 'N/A')
-            brand_count = safe_int_from_value(result.get('count'))
-            stats['most_recall_brand'] = (brand_name, brand_count)
-            
-        # 5. 데이터 기준 기간 (MIN/MAX 날짜)
-        cursor.execute("SELECT MIN(recall_date) as min_date, MAX(recall_date) as max_date FROM Recall WHERE recall_date IS NOT NULL")
-        result = cursor.fetchone()
-        
-        # --- [수정된 부분] Pylance 경고 해결 ---
-        if isinstance(result, dict):
-            min_date_val = result.get('min_date')
-            max_date_val = result.get('max_date')
+                min_date_val = result.get('min_date')
+                max_date_val = result.get('max_date')
+                # [안전 블록] strftime은 date 또는 datetime 객체에서만 호출
+                if isinstance(min_date_val, (date, datetime)) and isinstance(max_date_val, (date, datetime)):
+                    stats['data_period'] = (min_date_val.strftime('%Y-%m-%d'), max_date_val.strftime('%Y-%m-%d'))
             
-            # [안전 블록] strftime은 date 또는 datetime 객체에서만 호출
-            if isinstance(min_date_val, (date, datetime)) and isinstance(max_date_val, (date, datetime)):
-                min_date_str = min_date_val.strftime('%Y-%m-%d')
-                max_date_str = max_date_val.strftime('%Y-%m-%d')
-                stats['data_period'] = (min_date_str, max_date_str)
-        # --- [수정 끝] ---
-            
-    except Exception as e:
-        print(f"get_summary_stats 오류: {e}")
-    finally:
-        if cursor: cursor.close() 
-        if conn and conn.is_connected():
-            conn.close()
-    return stats
+        except Exception as e:
+            print(f"get_summary_stats 오류: {e}")
+            db_manager.mark_failure()
+        finally:
+            if cursor: cursor.close() 
+        return stats
 # --- [수정된 함수 끝] ---
 
 
-@st.cache_data(ttl=3600)
+@cache_by_data_version()
 def get_brand_rankings():
     """브랜드 리포트 페이지를 위한 순위 데이터를 가져옵니다."""
-    conn = db_manager.create_connection()
-    if conn is None:
-        return pd.DataFrame(), pd.DataFrame()
-    df_recall_count = pd.DataFrame()
-    df_correction_rate = pd.DataFrame()
-    try:
-        recall_count_query = """
-        SELECT 
-            b.brand_name AS '브랜드', COUNT(DISTINCT r.recall_id) AS '총 리콜 건수'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name ORDER BY `총 리콜 건수` DESC;
-        """
-        df_recall_count = pd.read_sql(recall_count_query, conn)
-        df_recall_count.index = df_recall_count.index + 1
-
-        correction_rate_query = """
-        SELECT 
-            b.brand_name AS '브랜드', AVG(r.correction_rate) AS '평균 시정률 (%)',
-            COUNT(DISTINCT r.recall_id) AS '리콜 건수'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name HAVING `리콜 건수` >= 5 
-        ORDER BY `평균 시정률 (%)` DESC;
-        """
-        df_correction_rate = pd.read_sql(correction_rate_query, conn)
-        df_correction_rate.index = df_correction_rate.index + 1
-        df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
-    except Exception as e:
-        print(f"get_brand_rankings 오류: {e}")
-        return pd.DataFrame(), pd.DataFrame() 
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-    return df_recall_count, df_correction_rate
\ No newline at end of file
+    snapshot = embedded_engine.get_snapshot()
+    if snapshot is not None:
+        return snapshot.get_brand_rankings()
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return pd.DataFrame(), pd.DataFrame()
+        df_recall_count = pd.DataFrame()
+        df_correction_rate = pd.DataFrame()
+        try:
+            # [수정] 적재 시 미리 계산된 Brand_Stats를 읽습니다. (없으면 집계 쿼리로 대체)
+            try:
+                df_recall_count = pd.read_sql(BRAND_RECALL_RANK_QUERY, conn)
+                df_correction_rate = pd.read_sql(BRAND_RATE_RANK_QUERY, conn)
+            except Exception as e:
+                print(f"get_brand_rankings: Brand_Stats 조회 실패, 집계 쿼리로 대체합니다. ({e})")
+                df_recall_count = pd.read_sql(BRAND_RECALL_RANK_FALLBACK_QUERY, conn)
+                df_correction_rate = pd.read_sql(BRAND_RATE_RANK_FALLBACK_QUERY, conn)
+            df_recall_count.index = df_recall_count.index + 1
+            df_correction_rate.index = df_correction_rate.index + 1
+            df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
+        except Exception as e:
+            print(f"get_brand_rankings 오류: {e}")
+            db_manager.mark_failure()
+            return pd.DataFrame(), pd.DataFrame() 
+        return df_recall_count, df_correction_rate
\ No newline at end of file
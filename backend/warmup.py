@@ -0,0 +1,240 @@
+# 파일 이름: backend/warmup.py
+# [신규] 캐시 예열(warm-up)
+# 배포 직후나 새 데이터 적재 직후에는 캐시가 비어 있어, 첫 사용자가 모든 조회(브랜드/차종 카탈로그, 순위, 요약, 키워드 사전,
+# 자주 보는 차종 프로필)의 DB 시간을 기다리게 됩니다. 여기서는 그 조회들을 백그라운드 스레드에서 미리 실행해 둡니다.
+#  - 앱: 프로세스가 데이터 버전을 처음 확인할 때(시작 직후)와 적재가 커밋되어 버전이 바뀔 때
+#        backend/data_version.py가 schedule_warmup()을 부릅니다. 첫 요청은 예열을 기다리지 않습니다.
+#  - 명령줄: python sql/warm_up_cache.py (공유 캐시를 쓰는 경우 적재 후 실행하면 모든 레플리카가 함께 사용)
+# 자주 보는 차종은 분석 리포트 '모델 프로필' 탭의 조회 기록(record_model_view)으로 정하며,
+# 기록이 없으면 리콜이 많은 차종 순으로 정합니다.
+# secrets.toml 설정 (없으면 기본값):
+#   [warmup]
+#   enabled = true
+#   top_models = 20                    # 미리 불러올 차종 프로필 수
+#   views_path = "data/model_views.db" # 차종 조회 기록 파일 (프로젝트 루트 기준)
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from . import db_manager
+
+WARMUP_DEFAULTS = {
+    'enabled': True,
+    'top_models': 20,
+    'views_path': 'data/model_views.db',
+}
+
+WARMUP_THREAD_NAME = 'lemon-warmup'
+
+# 조회 기록이 없을 때 사용할 차종 순서 (적재 시 계산되는 Model_Stats)
+TOP_RECALLED_MODELS_QUERY = """
+SELECT brand_name, model_name FROM Model_Stats
+ORDER BY recall_count DESC, model_id
+LIMIT %s
+"""
+# Model_Stats가 아직 없는 DB(마이그레이션 004 이전)용: 같은 순서를 Recall⋈Model⋈Brand 집계로 계산합니다.
+TOP_RECALLED_MODELS_FALLBACK_QUERY = """
+SELECT b.brand_name, m.model_name
+FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY m.model_id, b.brand_name, m.model_name
+ORDER BY COUNT(r.recall_id) DESC, m.model_id
+LIMIT %s
+"""
+
+
+def get_warmup_config():
+    config = dict(WARMUP_DEFAULTS)
+    try:
+        config.update(st.secrets.get('warmup', {}))
+    except Exception:
+        pass  # secrets.toml이 없으면 기본값 사용
+    return config
+
+
+# --- 차종 프로필 조회 기록 ---
+class ModelViewLog:
+    """(브랜드, 차종)별 프로필 조회 횟수를 SQLite 파일에 누적합니다. (같은 서버의 프로세스끼리 공유)"""
+
+    def __init__(self, path):
+        self.path = path if os.path.isabs(path) else os.path.join(db_manager.PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS model_views (
+            brand_name TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            view_count INTEGER NOT NULL DEFAULT 0,
+            last_viewed_at REAL NOT NULL,
+            PRIMARY KEY (brand_name, model_name)
+        )
+        """)
+        self._conn.commit()
+
+    def record(self, brand, model):
+        with self._lock:
+            self._conn.execute("""
+            INSERT INTO model_views (brand_name, model_name, view_count, last_viewed_at) VALUES (?, ?, 1, ?)
+            ON CONFLICT(brand_name, model_name) DO UPDATE
+            SET view_count = view_count + 1, last_viewed_at = excluded.last_viewed_at
+            """, (brand, model, time.time()))
+            self._conn.commit()
+
+    def top(self, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT brand_name, model_name FROM model_views ORDER BY view_count DESC, last_viewed_at DESC LIMIT ?",
+                (limit,)).fetchall()
+        return [tuple(row) for row in rows]
+
+
+_view_log = None
+_view_log_lock = threading.Lock()
+
+
+def _get_view_log():
+    global _view_log
+    if _view_log is None:
+        with _view_log_lock:
+            if _view_log is None:
+                _view_log = ModelViewLog(get_warmup_config()['views_path'])
+    return _view_log
+
+
+def record_model_view(brand, model):
+    """차종 프로필을 열 때 호출합니다. (기록 실패는 화면에 영향을 주지 않음)"""
+    try:
+        _get_view_log().record(brand, model)
+    except Exception as e:
+        print(f"record_model_view 오류: {e}")
+
+
+def top_viewed_models(limit):
+    """가장 많이 조회된 차종 limit개. 기록이 부족하면 리콜이 많은 차종으로 채웁니다."""
+    models = []
+    try:
+        models = _get_view_log().top(limit)
+    except Exception as e:
+        print(f"top_viewed_models 오류 (조회 기록 없이 진행): {e}")
+    if len(models) < limit:
+        with db_manager.get_connection() as conn:
+            if conn is not None:
+                cursor = None
+                try:
+                    cursor = conn.cursor()
+                    try:
+                        cursor.execute(TOP_RECALLED_MODELS_QUERY, (limit,))
+                        rows = cursor.fetchall()
+                    except Exception as e:
+                        print(f"top_viewed_models: Model_Stats 조회 실패, 집계 쿼리로 대체합니다. ({e})")
+                        cursor.execute(TOP_RECALLED_MODELS_FALLBACK_QUERY, (limit,))
+                        rows = cursor.fetchall()
+                    for brand, model in rows:
+                        if len(models) >= limit:
+                            break
+                        if (brand, model) not in models:
+                            models.append((brand, model))
+                except Exception as e:
+                    print(f"top_viewed_models 오류: {e}")
+                finally:
+                    if cursor: cursor.close()
+    return models
+
+
+# --- 예열 ---
+def warm_up(top_models=None):
+    """
+    첫 화면에 필요한 조회를 미리 실행해 캐시에 넣고, 단계별 소요 시간(초)을 반환합니다.
+    (이미 캐시된 조회는 바로 끝나므로 여러 번 실행해도 안전합니다)
+    """
+    from . import search_queries, stats_queries, wordcloud_cache # 순환 임포트 방지 (data_version -> warmup)
+
+    if top_models is None:
+        top_models = int(get_warmup_config()['top_models'])
+    timings = {}
+    start = time.perf_counter()
+
+    def step(name, func):
+        step_start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            print(f"[warm-up] {name} 실패: {e}")
+            result = None
+        timings[name] = time.perf_counter() - step_start
+        return result
+
+    step('요약 통계', stats_queries.get_summary_stats)
+    step('브랜드 순위', stats_queries.get_brand_rankings)
+    step('키워드 사전', search_queries.get_all_keywords_with_desc)
+    step('브랜드/차종 카탈로그', search_queries.get_catalog)
+
+    def warm_profiles():
+        for brand, model in top_viewed_models(top_models):
+            search_queries.get_recall_comparison(brand, model)
+            _, reasons = search_queries.get_model_profile_data(brand, model)
+            try:
+                wordcloud_cache.get_wordcloud_png(brand, model, reasons)
+            except Exception as e:  # wordcloud 미설치 등: 화면에서 그릴 때와 같은 오류이므로 건너뜀
+                print(f"[warm-up] 워드 클라우드 건너뜀 ({brand} {model}): {e}")
+                break
+    step(f'차종 프로필 TOP {top_models}', warm_profiles)
+
+    total = time.perf_counter() - start
+    details = ", ".join(f"{name} {seconds:.2f}초" for name, seconds in timings.items())
+    print(f"[warm-up] 완료: {total:.2f}초 ({details})")
+    timings['전체'] = total
+    return timings
+
+
+class _WarmupThreadFilter(logging.Filter):
+    """예열 스레드는 화면(세션) 없이 캐시 함수를 부르므로, 그때마다 나오는 'missing ScriptRunContext' 경고를 숨깁니다."""
+
+    def filter(self, record):
+        return record.threadName != WARMUP_THREAD_NAME
+
+
+logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(_WarmupThreadFilter())
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_warmup_pending = False
+
+
+def _run_warmups(reason):
+    global _warmup_thread, _warmup_pending
+    while True:
+        print(f"[warm-up] 시작 ({reason})")
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"[warm-up] 오류: {e}")
+        with _warmup_lock:
+            if not _warmup_pending:
+                _warmup_thread = None
+                return
+            # 예열 중에 데이터 버전이 다시 바뀌었으면 새 버전으로 한 번 더 실행합니다.
+            _warmup_pending = False
+            reason = '예열 중 데이터 버전 변경'
+
+
+def schedule_warmup(reason):
+    """
+    백그라운드 스레드에서 warm_up()을 시작합니다. 이미 실행 중이면 끝난 뒤 한 번 더 실행하도록 예약합니다.
+    [warmup] enabled = false이거나 Streamlit 서버 밖(스크립트)에서는 아무것도 하지 않습니다.
+    """
+    global _warmup_thread, _warmup_pending
+    if not st.runtime.exists() or not get_warmup_config()['enabled']:
+        return False
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            _warmup_pending = True
+            return False
+        _warmup_thread = threading.Thread(target=_run_warmups, args=(reason,), name=WARMUP_THREAD_NAME, daemon=True)
+        _warmup_thread.start()
+    return True
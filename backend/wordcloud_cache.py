@@ -0,0 +1,135 @@
+# 파일 이름: backend/wordcloud_cache.py
+# [신규] 차종별 리콜 사유 워드 클라우드 이미지 캐시
+# 워드 클라우드는 (브랜드, 차종, 데이터 버전)마다 한 번만 그려서 PNG 바이트로 보관하고,
+# 같은 차종을 다시 열면 그리지 않고 바로 반환합니다.
+#  - 메모리: 최근 사용한 이미지 MEMORY_CACHE_SIZE개 (프로세스 안의 모든 세션이 공유)
+#  - 디스크: CACHE_DIR 아래 PNG 파일 최대 DISK_CACHE_SIZE개 (프로세스 재시작 후에도 유지, 오래된 파일부터 삭제)
+# 데이터 버전은 적재 스크립트가 기록하는 Data_Version 토큰(backend/data_version.py)이므로, 데이터를 다시 적재하면 새로 그립니다.
+# 적재 후 sql/prerender_wordclouds.py로 모든 차종을 미리 그려 둘 수 있습니다.
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from . import db_manager
+from .data_version import get_data_version # 조회 함수 캐시와 같은 데이터 버전
+
+CACHE_DIR = os.path.join(db_manager.PROJECT_ROOT, 'data', 'wordcloud_cache')
+MEMORY_CACHE_SIZE = 64
+DISK_CACHE_SIZE = 5000 # 전체 차종 수(약 3,300개)보다 크게
+
+WORDCLOUD_OPTIONS = {'width': 800, 'height': 400, 'background_color': 'white'}
+# 한글 폰트 후보 (Windows 맑은 고딕, 리눅스 나눔고딕, macOS 애플 SD 고딕 네오)
+FONT_CANDIDATES = [
+    "c:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+]
+
+
+def find_font_path():
+    """설치된 한글 폰트 경로 (없으면 None: wordcloud 기본 폰트로 그리며 한글이 깨질 수 있음)"""
+    return next((path for path in FONT_CANDIDATES if os.path.exists(path)), None)
+
+
+def render_wordcloud_png(text, font_path=None):
+    """리콜 사유 문자열로 워드 클라우드를 그려 PNG 바이트로 반환합니다. (matplotlib figure를 만들지 않음)"""
+    from wordcloud import WordCloud  # 렌더링할 때만 임포트 (캐시 적중 시에는 필요 없음)
+    image = WordCloud(font_path=font_path, **WORDCLOUD_OPTIONS).generate(text).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def cache_key(brand, model, version, font_path):
+    raw = "\x1f".join([str(brand), str(model), str(version), str(font_path), repr(sorted(WORDCLOUD_OPTIONS.items()))])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class ImageCache:
+    """메모리 LRU + 디스크 파일로 이루어진 크기 제한 이미지 캐시 (키: cache_key의 해시 문자열)"""
+
+    def __init__(self, directory=CACHE_DIR, memory_size=MEMORY_CACHE_SIZE, disk_size=DISK_CACHE_SIZE):
+        self.directory = directory
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def contains(self, key):
+        return key in self._memory or os.path.exists(self._path(key))
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data, prune=True):
+        self._remember(key, data)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+            if prune:
+                self.prune()
+        except OSError as e:
+            print(f"워드 클라우드 디스크 캐시 저장 오류: {e}")
+
+    def prune(self, keep=None):
+        """디스크 파일이 disk_size개를 넘으면 오래된 것부터 지웁니다. keep이 주어지면 그 키 외의 파일은 모두 지웁니다."""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.png')]
+        except OSError:
+            return
+        if keep is not None:
+            stale = [entry for entry in entries if entry.name[:-4] not in keep]
+        else:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            stale = entries[:max(0, len(entries) - self.disk_size)]
+        for entry in stale:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+image_cache = ImageCache()
+
+
+def get_wordcloud_png(brand, model, text, version=None):
+    """
+    (브랜드, 차종)의 워드 클라우드 PNG 바이트를 반환합니다. 캐시에 없으면 text로 그려서 저장합니다.
+    version을 생략하면 get_data_version()으로 읽습니다. text가 비어 있으면 None을 반환합니다.
+    """
+    if not text:
+        return None
+    font_path = find_font_path()
+    key = cache_key(brand, model, version if version is not None else get_data_version(), font_path)
+    data = image_cache.get(key)
+    if data is None:
+        data = render_wordcloud_png(text, font_path)
+        image_cache.put(key, data)
+    return data
@@ -0,0 +1,83 @@
+# 파일 이름: benchmarks/_common.py
+# [신규] 벤치마크 스크립트 공용 도구: 조회 함수 목록, 실행 시간 측정, 결과 비교, 현재 커밋 이름
+# (각 스크립트는 benchmarks/ 폴더에서 실행되므로 `from _common import ...`로 가져옵니다)
+import math
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend import search_queries, stats_queries
+
+FILTER_NAMES = ['브랜드', '차종', '연도', '키워드']
+# MySQL FLOAT(단정밀도)와 SQLite REAL(배정밀도), pandas 집계의 표현 차이를 허용하는 오차
+FLOAT_TOLERANCE = 1e-5
+
+# 벤치마크하는 조회 함수 (st.cache_data를 거치지 않도록 캐시 전 원본 함수)
+QUERY_FUNCTIONS = {
+    name: getattr(func, '__wrapped__', func)
+    for name, func in [
+        ('get_catalog', search_queries.get_catalog),
+        ('get_all_keywords_with_desc', search_queries.get_all_keywords_with_desc),
+        ('search_recalls', search_queries.search_recalls),
+        ('search_recalls_page', search_queries.search_recalls_page),
+        ('count_search_results', search_queries.count_search_results),
+        ('get_recall_comparison', search_queries.get_recall_comparison),
+        ('get_model_profile_data', search_queries.get_model_profile_data),
+        ('get_keywords_for_recall', search_queries.get_keywords_for_recall),
+        ('get_summary_stats', stats_queries.get_summary_stats),
+        ('get_brand_rankings', stats_queries.get_brand_rankings),
+    ]
+}
+
+
+def git_commit():
+    """현재 커밋의 짧은 해시 (결과 파일 이름과 비교 표시에 사용)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """func(*args, **kwargs)를 repeat번 실행하고 (마지막 결과, 실행 시간(초) 목록)을 반환합니다."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def same_value(a, b):
+    """조회 결과 비교 (float는 허용 오차, 리스트/튜플/딕셔너리/DataFrame은 원소별로 비교)"""
+    if isinstance(a, float) or isinstance(b, float):
+        try:
+            return math.isclose(float(a), float(b), rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE) or (a != a and b != b)
+        except (TypeError, ValueError):
+            return False
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same_value(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same_value(a[k], b[k]) for k in a)
+    if hasattr(a, 'itertuples') and hasattr(b, 'itertuples'):
+        return same_frame(a, b)
+    return a == b
+
+
+def same_frame(a, b, sort_by=None):
+    """두 DataFrame을 행 단위로 비교합니다. (컬럼 이름/순서와 값, sort_by가 있으면 정렬 후 비교)"""
+    if a.empty and b.empty:
+        return True
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    if sort_by:
+        a = a.sort_values(sort_by, kind='stable')
+        b = b.sort_values(sort_by, kind='stable')
+    return all(same_value(tuple(x), tuple(y))
+               for x, y in zip(a.itertuples(index=False), b.itertuples(index=False)))
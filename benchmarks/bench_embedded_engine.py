@@ -0,0 +1,156 @@
+# 파일 이름: benchmarks/bench_embedded_engine.py
+# [신규] 임베디드(인메모리) 엔진 vs MySQL 조회 함수 비교
+#  - search_recalls / search_recalls_page(앞뒤 페이지 순회) / count_search_results /
+#    get_recall_comparison / get_model_profile_data / get_brand_rankings 결과가 같은지 확인하고
+#  - 함수별 실행 시간을 비교합니다.
+# 앱과 같은 .streamlit/secrets.toml의 [db_credentials]로 접속하므로 프로젝트 루트에서 실행합니다.
+# 실행 예:
+#   python benchmarks/bench_embedded_engine.py
+#   python benchmarks/bench_embedded_engine.py --models 30 --repeat 10
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend import embedded_engine
+from _common import FILTER_NAMES, QUERY_FUNCTIONS, same_frame, same_value, timed
+
+# MySQL 경로로 실행합니다. (QUERY_FUNCTIONS는 st.cache_data를 거치지 않는 캐시 전 원본 함수)
+embedded_engine.MODE_OVERRIDE = 'mysql'
+
+
+def same_top_keywords(a, b):
+    """TOP 10 키워드 비교. 10위 동점 키워드는 어느 쪽이 잘릴지 정해져 있지 않으므로 빈도 목록과 그 위 순위만 비교합니다."""
+    if a.empty or b.empty:
+        return a.empty and b.empty
+    counts_a, counts_b = a['keyword_count'].tolist(), b['keyword_count'].tolist()
+    if counts_a != counts_b:
+        return False
+    cutoff = counts_a[-1]
+    above = lambda df: set(df.loc[df['keyword_count'] > cutoff, 'keyword_text'])
+    return above(a) == above(b)
+
+
+def walk_pages(page_func, filters, page_size):
+    """끝까지 다음 페이지로 이동한 뒤 처음까지 이전 페이지로 돌아오며 (전체 ID 목록, 되돌아오기 일치 여부)를 반환합니다."""
+    pages, seek = [], None
+    while True:
+        page, info = page_func(*filters, seek=seek, direction='next', page_size=page_size)
+        if page.empty:
+            break
+        pages.append((page['리콜ID'].tolist(), info))
+        if not info['has_next']:
+            break
+        seek = info['last']
+    backward_ok = True
+    for i in range(len(pages) - 1, 0, -1):
+        page, _ = page_func(*filters, seek=pages[i][1]['first'], direction='prev', page_size=page_size)
+        backward_ok &= page['리콜ID'].tolist() == pages[i - 1][0]
+    return [recall_id for ids, _ in pages for recall_id in ids], backward_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베디드 엔진과 MySQL 조회 함수의 결과/성능 비교")
+    parser.add_argument('--models', type=int, default=20, help="비교할 차종 수 (리콜이 많은 순, 기본값: 20)")
+    parser.add_argument('--page-size', type=int, default=50, help="페이지 순회 비교 시 페이지 크기 (기본값: 50)")
+    parser.add_argument('--repeat', type=int, default=5, help="함수별 반복 실행 횟수 (중앙값 기준)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = embedded_engine.load_snapshot_from_db()
+    if snapshot is None:
+        print("[오류] 스냅샷을 만들 수 없습니다. .streamlit/secrets.toml의 [db_credentials]를 확인하세요.")
+        sys.exit(1)
+    print(f"스냅샷 로딩: Recall {snapshot.size:,}건 / {time.perf_counter() - start:.2f}초\n")
+
+    top_models = snapshot.df.groupby(['brand_name', 'model_name']).size().sort_values(ascending=False)
+    models = list(top_models.index[:args.models])
+    brand, model = models[0]
+    model_rows = snapshot.df[(snapshot.df['brand_name'] == brand) & (snapshot.df['model_name'] == model)]
+    year = int(model_rows['recall_date'].dt.year.mode().iloc[0])
+    keyword = max(snapshot._keyword_rows, key=lambda k: len(snapshot._keyword_rows[k]))
+    samples = [brand, model, year, keyword]
+    print(f"예시 필터 값: {dict(zip(FILTER_NAMES, samples))} / 비교 차종 {len(models)}개\n")
+
+    mismatches = []
+    timings = {} # 함수 이름 -> (MySQL 시간 목록, 임베디드 시간 목록)
+
+    def compare(name, sql_func, embedded_func, check, label):
+        sql_result, sql_times = timed(sql_func, repeat=args.repeat)
+        embedded_result, embedded_times = timed(embedded_func, repeat=args.repeat)
+        sql_timings, embedded_timings = timings.setdefault(name, ([], []))
+        sql_timings.append(statistics.median(sql_times))
+        embedded_timings.append(statistics.median(embedded_times))
+        if not check(sql_result, embedded_result):
+            mismatches.append(f"{name} ({label})")
+
+    # 1) 상세 검색: 16가지 필터 조합
+    for enabled in itertools.product([False, True], repeat=len(FILTER_NAMES)):
+        filters = [value if on else "전체" for value, on in zip(samples, enabled)]
+        label = "+".join(name for name, on in zip(FILTER_NAMES, enabled) if on) or "필터 없음"
+
+        compare('search_recalls',
+                lambda: QUERY_FUNCTIONS['search_recalls'](*filters),
+                lambda: snapshot.search_recalls(*filters),
+                same_frame, label)
+        compare('count_search_results',
+                lambda: QUERY_FUNCTIONS['count_search_results'](*filters),
+                lambda: snapshot.count_search_results(*filters),
+                lambda a, b: a == b, label)
+        compare('search_recalls_page',
+                lambda: QUERY_FUNCTIONS['search_recalls_page'](*filters, page_size=args.page_size),
+                lambda: snapshot.search_recalls_page(*filters, page_size=args.page_size),
+                lambda a, b: same_frame(a[0], b[0]) and a[1] == b[1], label)
+
+        sql_ids, sql_back = walk_pages(QUERY_FUNCTIONS['search_recalls_page'], filters, args.page_size)
+        embedded_ids, embedded_back = walk_pages(snapshot.search_recalls_page, filters, args.page_size)
+        if not (sql_ids == embedded_ids and sql_back and embedded_back):
+            mismatches.append(f"search_recalls_page 페이지 순회 ({label})")
+
+    # 2) 분석 리포트: 차종별 비교 / 프로필
+    for brand_name, model_name in models:
+        label = f"{brand_name} {model_name}"
+        compare('get_recall_comparison',
+                lambda: QUERY_FUNCTIONS['get_recall_comparison'](brand_name, model_name),
+                lambda: snapshot.get_recall_comparison(brand_name, model_name),
+                lambda a, b: (a[0].keys() == b[0].keys()
+                              and all(same_value(a[0][k], b[0][k]) for k in a[0])
+                              and same_top_keywords(a[1], b[1])),
+                label)
+        # 같은 날짜 안의 순서는 SQL에서 정해져 있지 않으므로 정렬 후 비교
+        compare('get_model_profile_data',
+                lambda: QUERY_FUNCTIONS['get_model_profile_data'](brand_name, model_name),
+                lambda: snapshot.get_model_profile_data(brand_name, model_name),
+                lambda a, b: (same_frame(a[0], b[0], sort_by=list(a[0].columns) if not a[0].empty else None)
+                              and sorted(a[1].split(" ")) == sorted(b[1].split(" "))),
+                label)
+
+    # 3) 브랜드 순위 (동점 브랜드의 순서는 정해져 있지 않으므로 브랜드명으로 정렬 후 비교)
+    compare('get_brand_rankings',
+            QUERY_FUNCTIONS['get_brand_rankings'],
+            snapshot.get_brand_rankings,
+            lambda a, b: same_frame(a[0], b[0], sort_by='브랜드') and same_frame(a[1], b[1], sort_by='브랜드'),
+            "전체")
+
+    print(f"{'함수':<24} {'호출 수':>7} {'MySQL(ms)':>11} {'임베디드(ms)':>13} {'개선':>8}")
+    for name, (sql_times, embedded_times) in timings.items():
+        sql_ms = statistics.median(sql_times) * 1000
+        embedded_ms = statistics.median(embedded_times) * 1000
+        speedup = sql_ms / embedded_ms if embedded_ms else 0
+        print(f"{name:<24} {len(sql_times):>7} {sql_ms:>11.2f} {embedded_ms:>13.2f} {speedup:>7.1f}x")
+
+    if mismatches:
+        print(f"\n[경고] {len(mismatches)}건의 결과가 다릅니다:")
+        for item in mismatches:
+            print(f" - {item}")
+        sys.exit(1)
+    print("\n[완료] 모든 비교 항목에서 MySQL과 임베디드 엔진의 결과가 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# 파일 이름: benchmarks/bench_keyword_tagger.py
+# [신규] 키워드 태깅 벤치마크: 기존 행 x 키워드 이중 루프 vs KeywordTagger (한 번 스캔)
+# 실행: python benchmarks/bench_keyword_tagger.py [--repeat 3] [--scale 1 10]
+import argparse
+import glob
+import os
+import sys
+from collections import Counter
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'sql'))
+
+from backend.keyword_tagger import KeywordTagger, ahocorasick
+from load_data_from_excel import KEYWORDS_DATA
+from _common import timed
+
+
+def load_reasons():
+    """data/ 폴더의 KOTSA 원본 CSV에서 리콜사유 컬럼을 읽어옵니다."""
+    csv_files = glob.glob(os.path.join(ROOT_DIR, 'data', '*.csv'))
+    if not csv_files:
+        print("[오류] data/ 폴더에서 원본 CSV 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+    try:
+        df = pd.read_csv(csv_files[0], encoding='cp949')
+    except UnicodeDecodeError:
+        df = pd.read_csv(csv_files[0], encoding='utf-8')
+    return df['리콜사유'].dropna().astype(str).tolist()
+
+
+def extra_keywords(reasons, count):
+    """실제 리콜 사유에서 자주 나오는 2~3글자 단어를 추가 키워드로 뽑습니다. (키워드 수 확장 실험용)"""
+    counter = Counter()
+    for text in reasons[:2000]:
+        for word in text.split():
+            if 2 <= len(word) <= 3:
+                counter[word] += 1
+    return [w for w, _ in counter.most_common(count)]
+
+
+def nested_loop(reasons, keywords):
+    """기존 insert_data_to_db의 방식 (행마다 모든 키워드에 대해 `in` 검사)"""
+    pairs = []
+    for row, reason_text in enumerate(reasons):
+        for idx, keyword_text in enumerate(keywords):
+            if keyword_text in reason_text:
+                pairs.append((row, idx))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 태거 벤치마크")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (최솟값 기준)")
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10], help="리콜 사유 복제 배수")
+    parser.add_argument('--keywords', type=int, nargs='+', default=[25, 100, 400], help="키워드 개수")
+    args = parser.parse_args()
+
+    base_reasons = load_reasons()
+    base_keywords = [k[0] for k in KEYWORDS_DATA]
+    pool = base_keywords + [w for w in extra_keywords(base_reasons, max(args.keywords)) if w not in base_keywords]
+
+    engines = ['regex'] + (['ahocorasick'] if ahocorasick is not None else [])
+    if ahocorasick is None:
+        print("[알림] pyahocorasick이 설치되지 않아 regex 엔진만 측정합니다.")
+
+    print(f"{'rows':>9} {'chars':>11} {'keywords':>9} {'engine':>12} {'nested(s)':>10} {'tagger(s)':>10} {'speedup':>8}")
+    for scale in args.scale:
+        reasons = base_reasons * scale
+        total_chars = sum(len(t) for t in reasons)
+        for n_keywords in args.keywords:
+            keywords = pool[:n_keywords]
+            expected, times = timed(nested_loop, reasons, keywords, repeat=args.repeat)
+            nested_time = min(times)
+            for engine in engines:
+                tagger = KeywordTagger(keywords, engine=engine)
+                actual, times = timed(tagger.tag_column, reasons, repeat=args.repeat)
+                tagger_time = min(times)
+                if expected != actual:
+                    print(f"[경고] 결과 불일치: nested={len(expected)}쌍, tagger={len(actual)}쌍")
+                print(f"{len(reasons):>9,} {total_chars:>11,} {len(keywords):>9} {engine:>12} "
+                      f"{nested_time:>10.3f} {tagger_time:>10.3f} {nested_time / tagger_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
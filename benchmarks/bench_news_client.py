@@ -0,0 +1,188 @@
+# 파일 이름: benchmarks/bench_news_client.py
+# [신규] 뉴스 클라이언트 벤치마크 / 동작 확인: 검색어마다 requests.get (기존) vs NewsClient (동시 조회, 연결 재사용)
+# 네이버 API 대신 로컬 스텁 서버(응답 지연을 흉내 냄)를 띄워서 실행하므로 인터넷 연결과 API 키가 필요 없습니다.
+# 확인 항목: 검색어별 결과 / HTML 태그 제거 / 연결 재사용 수 / 동시 요청 수 상한 / 느린·오류 검색어만 오류 항목으로 대체 /
+#           필드가 빠진 응답 항목 처리
+# 실행: python benchmarks/bench_news_client.py [--queries 20] [--latency 0.2] [--concurrency 5] [--timeout 1]
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend.news_api import NEWS_DISPLAY, NewsClient
+from _common import timed
+
+SLOW_QUERY = "느린 응답 리콜" # 스텁 서버가 timeout보다 늦게 답하는 검색어
+ERROR_QUERY = "서버 오류 리콜" # 스텁 서버가 500을 돌려주는 검색어
+PARTIAL_QUERY = "필드 누락 리콜" # 스텁 서버가 title/link/description이 빠진 항목을 돌려주는 검색어
+BROKEN_QUERY = "형식 오류 리콜" # 스텁 서버가 items를 목록이 아닌 값으로 돌려주는 검색어
+BRANDS = ["현대", "기아", "BMW", "벤츠", "아우디", "폭스바겐", "토요타", "혼다", "포드", "볼보", "테슬라", "르노", "쉐보레",
+          "포르쉐", "렉서스", "닛산", "푸조", "지프", "미니", "랜드로버"]
+
+
+class StubNaverServer(ThreadingHTTPServer):
+    """네이버 뉴스 검색 API 흉내 (GET /v1/search/news.json?query=...). 새 연결 수 / 동시에 처리 중인 요청 수를 기록합니다."""
+    daemon_threads = True
+
+    def __init__(self, latency, slow_latency):
+        super().__init__(('127.0.0.1', 0), StubNaverHandler)
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/search/news.json"
+
+    def reset_counts(self):
+        with self.lock:
+            self.connections = self.requests = self.max_in_flight = 0
+
+
+class StubNaverHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive 지원
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            params = parse_qs(urlparse(self.path).query)
+            query = params.get('query', [''])[0]
+            display = int(params.get('display', ['10'])[0])
+            if not self.headers.get('X-Naver-Client-Id') or not self.headers.get('X-Naver-Client-Secret'):
+                self._send_json(401, {'errorMessage': "Not Exist Client ID"})
+                return
+            time.sleep(server.slow_latency if query == SLOW_QUERY else server.latency)
+            if query == ERROR_QUERY:
+                self._send_json(500, {'errorMessage': "System Error"})
+                return
+            if query == PARTIAL_QUERY:
+                self._send_json(200, {'total': 3, 'items': [{'title': f"<b>{query}</b>"}, {'link': "#"}, {}]})
+                return
+            if query == BROKEN_QUERY:
+                self._send_json(200, {'total': 1, 'items': 1})
+                return
+            self._send_json(200, {'total': display, 'items': [{
+                'title': f"<b>{query}</b> 관련 기사 {no} &quot;속보&quot;",
+                'link': f"https://news.example.com/{no}",
+                'description': f"{query} 대상 차량 <b>무상 수리</b> 안내 {no}",
+            } for no in range(display)]})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def fetch_sequential(url, queries, timeout):
+    """기존 방식: 검색어마다 requests.get (매번 새 연결, 차례로 호출)"""
+    headers = {"X-Naver-Client-Id": "stub", "X-Naver-Client-Secret": "stub"}
+    results = {}
+    for query in queries:
+        response = requests.get(url, params={'query': query, 'display': NEWS_DISPLAY, 'sort': 'date'},
+                                headers=headers, timeout=timeout)
+        response.raise_for_status()
+        results[query] = response.json()['items']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 클라이언트 벤치마크 (로컬 스텁 서버)")
+    parser.add_argument('--queries', type=int, default=20, help="검색어 수 (기본값: 20, 브랜드별 리콜 뉴스)")
+    parser.add_argument('--latency', type=float, default=0.2, help="스텁 서버 응답 지연(초, 기본값: 0.2)")
+    parser.add_argument('--concurrency', type=int, default=5, help="NewsClient 동시 요청 수 상한 (기본값: 5)")
+    parser.add_argument('--timeout', type=float, default=1.0, help="요청 하나의 timeout(초, 기본값: 1)")
+    args = parser.parse_args()
+
+    server = StubNaverServer(args.latency, slow_latency=args.timeout + 1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    queries = [f"{BRANDS[i % len(BRANDS)]} 리콜" + (f" {i // len(BRANDS)}" if i >= len(BRANDS) else "")
+               for i in range(args.queries)]
+    client = NewsClient(server.url, concurrency=args.concurrency, timeout=args.timeout)
+    failures = []
+
+    def check(condition, message):
+        if not condition:
+            failures.append(message)
+
+    try:
+        print(f"스텁 서버: {server.url} (응답 지연 {args.latency}초), 검색어 {len(queries)}개")
+
+        # 1) 기존 방식
+        _, (sequential_sec,) = timed(fetch_sequential, server.url, queries, args.timeout)
+        print(f"[기존] requests.get x {len(queries)}: {sequential_sec:.2f}초, 연결 {server.connections}개")
+
+        # 2) NewsClient 첫 호출 / 두 번째 호출 (연결 재사용)
+        for label in ("첫 호출", "두 번째 호출"):
+            server.reset_counts()
+            results, (elapsed,) = timed(client.search, queries, "stub", "stub")
+            print(f"[NewsClient {label}] {elapsed:.2f}초 ({sequential_sec / elapsed:.1f}배), "
+                  f"새 연결 {server.connections}개, 동시 요청 최대 {server.max_in_flight}개")
+            check(list(results) == queries, f"{label}: 검색어별 결과가 빠졌거나 순서가 다릅니다.")
+            check(all(len(items) == NEWS_DISPLAY for items in results.values()),
+                  f"{label}: 검색어마다 뉴스 {NEWS_DISPLAY}개가 아닙니다.")
+            check(all('<b>' not in item['title'] and '&quot;' not in item['title']
+                      for items in results.values() for item in items), f"{label}: HTML 태그가 남아 있습니다.")
+            check(server.max_in_flight <= args.concurrency, f"{label}: 동시 요청이 {args.concurrency}개를 넘었습니다.")
+            if label == "첫 호출":
+                check(server.connections <= args.concurrency, "첫 호출: 연결이 재사용되지 않았습니다.")
+            else:
+                check(server.connections == 0, "두 번째 호출: 새 연결을 만들었습니다. (keep-alive 미사용)")
+
+        # 3) 느린 / 오류 검색어는 해당 검색어만 오류 항목으로 대체
+        mixed = [queries[0], SLOW_QUERY, ERROR_QUERY, PARTIAL_QUERY, BROKEN_QUERY]
+        results, (elapsed,) = timed(client.search, mixed, "stub", "stub")
+        print(f"[실패 격리] 정상 1 / 느림 1 / 오류 1 / 필드 누락 1 / 형식 오류 1: {elapsed:.2f}초")
+        for query in mixed:
+            print(f"  - {query}: {results[query][0]['title']}")
+        check(len(results[queries[0]]) == NEWS_DISPLAY, "실패 격리: 정상 검색어 결과가 없습니다.")
+        check(results[SLOW_QUERY][0]['title'].startswith("API 호출 오류"), "실패 격리: 느린 검색어가 시간 초과되지 않았습니다.")
+        check(results[ERROR_QUERY][0]['title'].startswith("API 호출 오류"), "실패 격리: 500 응답이 오류 항목이 아닙니다.")
+        check([item['title'] for item in results[PARTIAL_QUERY]] == [PARTIAL_QUERY, '', ''],
+              "실패 격리: 필드가 빠진 항목이 빈 값으로 표시되지 않았습니다.")
+        check(results[BROKEN_QUERY][0]['title'].startswith("API 호출 오류"), "실패 격리: 형식 오류 응답이 오류 항목이 아닙니다.")
+        check(elapsed < args.timeout + 0.5, f"실패 격리: {elapsed:.2f}초 걸렸습니다. (timeout {args.timeout}초)")
+    finally:
+        client.close()
+        server.shutdown()
+
+    if failures:
+        print(f"\n[경고] {len(failures)}개 항목이 실패했습니다:")
+        for failure in failures:
+            print(f" - {failure}")
+        sys.exit(1)
+    print("\n[완료] 모든 확인 항목을 통과했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# 파일 이름: benchmarks/bench_reason_index.py
+# [신규] 리콜 사유 n-gram 역색인(backend/reason_index.py) 규모별 성능 측정
+#  - 실제 리콜 사유 문장을 잘라 붙여 원하는 건수(기본 100만 건)의 가상 리콜 사유를 만들고
+#  - 색인 생성 시간 / 메모리 / 파일 저장·로딩 시간과
+#  - 검색어 유형별(2글자, 3글자 이상, 여러 검색어 AND, 없는 검색어) 검색 시간을 측정하며
+#  - 일부 검색어는 전체 문장 순회(`검색어 in 리콜사유`) 결과와 같은지 확인합니다.
+# 앱과 같은 .streamlit/secrets.toml의 [db_credentials]로 접속하므로 프로젝트 루트에서 실행합니다.
+# 실행 예:
+#   python benchmarks/bench_reason_index.py
+#   python benchmarks/bench_reason_index.py --sqlite data/lemon_scanner.db --size 200000 --distinct-ratio 1.0
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend import db_manager, embedded_engine
+from backend.reason_index import ReasonIndex
+from _common import timed
+
+
+def synthesize_reasons(source, size, distinct_ratio, rng):
+    """
+    실제 리콜 사유를 두 개씩 골라 앞/뒤 조각을 이어 붙여 size건의 리콜 사유를 만듭니다.
+    고유 문장 수는 size * distinct_ratio건이고 나머지 행은 그 문장을 반복합니다. (실제 데이터도 같은 사유가 반복됨)
+    """
+    distinct_count = max(1, int(size * distinct_ratio))
+    distinct = dict.fromkeys(source[:distinct_count])
+    while len(distinct) < distinct_count:
+        a, b = rng.choice(source), rng.choice(source)
+        distinct[a[:rng.randrange(1, len(a) + 1)] + b[rng.randrange(len(b)):]] = None
+    distinct = list(distinct)
+    reasons = distinct + [rng.choice(distinct) for _ in range(size - len(distinct))]
+    rng.shuffle(reasons)
+    return reasons
+
+
+def sample_queries(source, count, rng):
+    """검색어 유형별 질의 목록 {유형: [검색어 목록, ...]}"""
+    def substring(length):
+        text = rng.choice([t for t in source if len(t) > length])
+        start = rng.randrange(len(text) - length)
+        term = text[start:start + length].strip()
+        return term if len(term) >= 2 else substring(length)
+
+    return {
+        '2글자': [[substring(2)] for _ in range(count)],
+        '3~6글자': [[substring(rng.randint(3, 6))] for _ in range(count)],
+        '10글자 이상': [[substring(rng.randint(10, 20))] for _ in range(count)],
+        '여러 검색어 AND': [[substring(rng.randint(2, 4)) for _ in range(rng.randint(2, 3))] for _ in range(count)],
+        '없는 검색어': [['리콜없음' + str(i)] for i in range(count)],
+    }
+
+
+def timed_ms(func, *args):
+    result, (elapsed,) = timed(func, *args)
+    return result, elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리콜 사유 역색인의 생성/검색 성능 측정")
+    parser.add_argument('--size', type=int, default=1_000_000, help="가상 리콜 사유 건수 (기본값: 1,000,000)")
+    parser.add_argument('--distinct-ratio', type=float, default=None,
+                        help="고유 문장 비율 (기본값: 실제 데이터의 비율, 1.0이면 모든 행이 서로 다른 문장)")
+    parser.add_argument('--queries', type=int, default=200, help="유형별 검색어 수 (기본값: 200)")
+    parser.add_argument('--verify', type=int, default=20, help="유형별로 전체 순회 결과와 비교할 검색어 수")
+    parser.add_argument('--sqlite', metavar='DB_PATH', help="MySQL 대신 SQLite 저장소 파일에서 원본 리콜 사유를 읽습니다.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.sqlite:
+        db_manager.configure_storage('sqlite', path=args.sqlite, read_only=True)
+    snapshot = embedded_engine.load_snapshot_from_db(build_reason_index=False)
+    if snapshot is None:
+        print("[오류] 리콜 데이터를 읽을 수 없습니다. (DB 접속 설정 확인)")
+        sys.exit(1)
+    real = [r for r in snapshot.df['reason'] if isinstance(r, str) and r]
+    source = list(dict.fromkeys(real))
+    ratio = args.distinct_ratio if args.distinct_ratio is not None else len(source) / len(real)
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    reasons = synthesize_reasons(source, args.size, ratio, rng)
+    print(f"원본 리콜 사유 {len(real):,}건(고유 {len(source):,}건) -> 가상 리콜 사유 {len(reasons):,}건 "
+          f"(고유 비율 {ratio:.2f}) 생성: {time.perf_counter() - start:.1f}초\n")
+
+    index = ReasonIndex.build(reasons, doc_ids=np.arange(len(reasons)))
+    stats = index.stats()
+    print(f"[색인 생성] {stats['build_seconds']:.2f}초 / 메모리 약 {stats['memory_bytes'] / 2**20:.1f}MB "
+          f"(고유 문장 {stats['unique_texts']:,} / n-gram {stats['grams']:,} / 포스팅 {stats['postings']:,})")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reason_index.npz')
+        _, save_ms = timed_ms(index.save, path)
+        loaded, load_ms = timed_ms(ReasonIndex.load, path)
+        print(f"[색인 파일] 저장 {save_ms / 1000:.2f}초 / 로딩 {load_ms / 1000:.2f}초 / "
+              f"{os.path.getsize(path) / 2**20:.1f}MB\n")
+    same_after_load = np.array_equal(loaded.search(['에어백']), index.search(['에어백']))
+    del loaded
+
+    queries = sample_queries(source, args.queries, rng)
+    mismatches = []
+    print(f"{'검색어 유형':<16} {'색인 조회 중앙값(ms)':>18} {'p95(ms)':>9} {'+행 마스크(ms)':>14} "
+          f"{'평균 결과 행':>12} {'전체 순회(ms)':>13}")
+    for kind, term_lists in queries.items():
+        lookup_ms, mask_ms, hits = [], [], []
+        for terms in term_lists:
+            _, elapsed = timed_ms(index.match_texts, terms)
+            lookup_ms.append(elapsed)
+            mask, elapsed = timed_ms(index.search_mask, terms)
+            mask_ms.append(elapsed)
+            hits.append(int(mask.sum()))
+
+        scan_ms = []
+        for terms in term_lists[:args.verify]:
+            expected, elapsed = timed_ms(
+                lambda t: [p for p, text in enumerate(reasons) if all(term in text for term in t)], terms)
+            scan_ms.append(elapsed)
+            if index.search(terms).tolist() != expected:
+                mismatches.append(f"{kind}: {terms}")
+
+        p95 = sorted(lookup_ms)[int(len(lookup_ms) * 0.95) - 1] if lookup_ms else 0
+        scan = f"{statistics.median(scan_ms):>13.1f}" if scan_ms else f"{'-':>13}"
+        print(f"{kind:<16} {statistics.median(lookup_ms):>18.3f} {p95:>9.3f} {statistics.median(mask_ms):>14.3f} "
+              f"{statistics.mean(hits):>12,.0f} {scan}")
+
+    if mismatches or not same_after_load:
+        print(f"\n[경고] 전체 순회 결과와 다른 검색어 {len(mismatches)}건 (파일 로딩 후 일치: {same_after_load}):")
+        for item in mismatches:
+            print(f" - {item}")
+        sys.exit(1)
+    print("\n[완료] 확인한 모든 검색어에서 색인 결과가 전체 순회 결과와 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
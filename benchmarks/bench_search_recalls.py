@@ -0,0 +1,180 @@
+# 파일 이름: benchmarks/bench_search_recalls.py
+# [신규] search_recalls 쿼리 빌더 비교: 기존(LEFT JOIN + GROUP BY) vs 현재(필요한 조인만, EXISTS 세미조인)
+#  - 모든 필터 조합(브랜드/차종/연도/키워드 16가지)에서 두 쿼리의 결과가 같은지 확인하고
+#  - 조합별 실행 시간을 비교합니다.
+# 실행 예:
+#   python benchmarks/bench_search_recalls.py                                  (현재 DB 그대로)
+#   python benchmarks/bench_search_recalls.py --bench-db lemon_bench --scale 50 (원본 데이터를 50배 복제한 DB에서)
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+import mysql.connector
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'sql'))
+
+from backend.search_queries import build_search_query
+from load_data_from_excel import DB_CONFIG
+
+FILTER_NAMES = ['브랜드', '차종', '연도', '키워드']
+TABLES = ['Brand', 'Model', 'Keyword', 'Recall', 'Recall_Keyword_Junction']
+
+
+def build_legacy_search_query(brand, model, year, keyword, limit=200):
+    """변경 전 search_recalls의 쿼리 (항상 Junction/Keyword LEFT JOIN + GROUP BY)"""
+    query = """
+    SELECT
+        r.recall_id AS '리콜ID', b.brand_name AS '브랜드', m.model_name AS '차종',
+        r.recall_date AS '리콜개시일', r.prod_from AS '생산시작', r.prod_to AS '생산종료',
+        r.reason AS '리콜사유', r.recall_count AS '리콜대수', r.correction_count AS '시정대수',
+        r.correction_rate AS '시정률(%)'
+    FROM Recall AS r
+    JOIN Model AS m ON r.model_id = m.model_id
+    JOIN Brand AS b ON m.brand_id = b.brand_id
+    LEFT JOIN Recall_Keyword_Junction AS rkj ON r.recall_id = rkj.recall_id
+    LEFT JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
+    """
+    where_clauses = []
+    params = []
+    if brand and brand != "전체":
+        where_clauses.append("b.brand_name = %s")
+        params.append(brand)
+    if model and model != "전체":
+        where_clauses.append("m.model_name = %s")
+        params.append(model)
+    if year and year != "전체":
+        where_clauses.append("YEAR(r.recall_date) = %s")
+        params.append(str(year))
+    if keyword and keyword != "전체":
+        where_clauses.append("k.keyword_text = %s")
+        params.append(keyword)
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    query += " GROUP BY r.recall_id ORDER BY r.recall_date DESC"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return query + ";", tuple(params)
+
+
+def create_scaled_copy(cursor, source_db, bench_db, scale):
+    """source_db의 데이터를 scale배 복제한 벤치마크용 DB를 만듭니다. (원본 DB는 읽기만 합니다)"""
+    print(f"'{bench_db}'에 '{source_db}' 데이터를 {scale}배 복제하는 중...")
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{bench_db}`")
+    for table in reversed(TABLES):
+        cursor.execute(f"DROP TABLE IF EXISTS `{bench_db}`.`{table}`")
+    for table in TABLES:
+        cursor.execute(f"CREATE TABLE `{bench_db}`.`{table}` LIKE `{source_db}`.`{table}`")
+    for table in ['Brand', 'Model', 'Keyword']:
+        cursor.execute(f"INSERT INTO `{bench_db}`.`{table}` SELECT * FROM `{source_db}`.`{table}`")
+
+    cursor.execute(f"SELECT COALESCE(MAX(recall_id), 0) FROM `{source_db}`.Recall")
+    offset = int(cursor.fetchone()[0])
+    for copy_no in range(scale):
+        # 복제본마다 리콜 날짜를 조금씩 옮겨서 정렬/연도 필터가 실제 데이터처럼 분산되게 합니다.
+        cursor.execute(f"""
+        INSERT INTO `{bench_db}`.Recall (recall_id, recall_key, model_id, reason, prod_from, prod_to, recall_date,
+                                         recall_count, correction_count, correction_rate)
+        SELECT recall_id + %s, SHA2(CONCAT(recall_key, '#', %s), 256), model_id, reason, prod_from, prod_to,
+               DATE_SUB(recall_date, INTERVAL %s DAY), recall_count, correction_count, correction_rate
+        FROM `{source_db}`.Recall
+        """, (offset * copy_no, copy_no, copy_no % 365))
+        cursor.execute(f"""
+        INSERT INTO `{bench_db}`.Recall_Keyword_Junction (recall_id, keyword_id)
+        SELECT recall_id + %s, keyword_id FROM `{source_db}`.Recall_Keyword_Junction
+        """, (offset * copy_no,))
+    cursor.execute(f"ANALYZE TABLE `{bench_db}`.Recall, `{bench_db}`.Recall_Keyword_Junction")
+    cursor.fetchall()
+
+
+def pick_sample_filters(cursor):
+    cursor.execute("""
+    SELECT b.brand_name, m.model_name, YEAR(r.recall_date)
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    WHERE r.recall_date IS NOT NULL
+    GROUP BY b.brand_name, m.model_name, YEAR(r.recall_date)
+    ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    brand, model, year = cursor.fetchone()
+    cursor.execute("""
+    SELECT k.keyword_text FROM Keyword k JOIN Recall_Keyword_Junction j ON k.keyword_id = j.keyword_id
+    GROUP BY k.keyword_id, k.keyword_text ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    (keyword,) = cursor.fetchone()
+    return [brand, model, year, keyword]
+
+
+def run_query(cursor, builder, args, limit):
+    query, params = builder(*args, limit=limit)
+    start = time.perf_counter()
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="search_recalls 쿼리 빌더 결과/성능 비교")
+    parser.add_argument('--bench-db', help="원본 데이터를 복제해 만들 벤치마크용 DB 이름 (지정 시 해당 DB에서 측정)")
+    parser.add_argument('--scale', type=int, default=10, help="--bench-db 사용 시 복제 배수 (기본값: 10)")
+    parser.add_argument('--repeat', type=int, default=5, help="조합별 반복 실행 횟수 (중앙값 기준)")
+    args = parser.parse_args()
+
+    config = dict(DB_CONFIG)
+    if args.bench_db:
+        conn = mysql.connector.connect(**config)
+        cursor = conn.cursor()
+        create_scaled_copy(cursor, config['database'], args.bench_db, args.scale)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        config['database'] = args.bench_db
+
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Recall")
+    print(f"DB '{config['database']}': Recall {cursor.fetchone()[0]:,}건")
+    samples = pick_sample_filters(cursor)
+    print(f"예시 필터 값: {dict(zip(FILTER_NAMES, samples))}\n")
+
+    mismatches = 0
+    print(f"{'필터 조합':<22} {'행 수':>7} {'기존(ms)':>10} {'현재(ms)':>10} {'개선':>7}  결과")
+    for enabled in itertools.product([False, True], repeat=len(FILTER_NAMES)):
+        filters = [value if on else "전체" for value, on in zip(samples, enabled)]
+        label = "+".join(name for name, on in zip(FILTER_NAMES, enabled) if on) or "필터 없음"
+
+        # 1) 결과 동일성: LIMIT 없이 전체 결과를 recall_id 기준으로 비교
+        legacy_rows, _ = run_query(cursor, build_legacy_search_query, filters, limit=None)
+        current_rows, _ = run_query(cursor, build_search_query, filters, limit=None)
+        same_rows = sorted(legacy_rows) == sorted(current_rows)
+
+        # 2) LIMIT 200 결과: 날짜 순서가 같은지 비교 (같은 날짜 내 순서는 기존 쿼리에서 정해져 있지 않음)
+        legacy_page, _ = run_query(cursor, build_legacy_search_query, filters, limit=200)
+        current_page, _ = run_query(cursor, build_search_query, filters, limit=200)
+        same_page = [row[3] for row in legacy_page] == [row[3] for row in current_page]
+
+        # 3) 실행 시간 (LIMIT 200, 중앙값)
+        legacy_time = statistics.median(
+            run_query(cursor, build_legacy_search_query, filters, 200)[1] for _ in range(args.repeat))
+        current_time = statistics.median(
+            run_query(cursor, build_search_query, filters, 200)[1] for _ in range(args.repeat))
+
+        ok = same_rows and same_page
+        mismatches += 0 if ok else 1
+        print(f"{label:<22} {len(current_rows):>7,} {legacy_time * 1000:>10.1f} {current_time * 1000:>10.1f} "
+              f"{legacy_time / current_time if current_time else 0:>6.1f}x  {'일치' if ok else '불일치'}")
+
+    cursor.close()
+    conn.close()
+    if mismatches:
+        print(f"\n[경고] {mismatches}개 조합에서 결과가 다릅니다.")
+        sys.exit(1)
+    print("\n[완료] 모든 필터 조합에서 결과가 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
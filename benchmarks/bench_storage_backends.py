@@ -0,0 +1,155 @@
+# 파일 이름: benchmarks/bench_storage_backends.py
+# [신규] 저장소 어댑터 비교: MySQL vs 임베디드 SQLite
+#  - MySQL DB를 같은 ID 그대로 SQLite 파일로 복제한 뒤(조회 전용 복제본),
+#  - search_queries / stats_queries의 모든 조회 함수를 두 저장소에서 실행해 결과가 같은지 확인하고
+#  - 함수별 실행 시간을 비교합니다.
+# 앱과 같은 .streamlit/secrets.toml의 [db_credentials]로 접속하므로 프로젝트 루트에서 실행합니다.
+# 실행 예:
+#   python benchmarks/bench_storage_backends.py
+#   python benchmarks/bench_storage_backends.py --sqlite-path data/lemon_replica.db --repeat 10
+import argparse
+import itertools
+import os
+import sqlite3
+import statistics
+import sys
+from datetime import date
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend import db_manager, embedded_engine
+from _common import FILTER_NAMES, QUERY_FUNCTIONS, same_frame, same_value, timed
+
+SQLITE_SCHEMA_PATH = os.path.join(ROOT_DIR, 'sql', 'create_tables_sqlite.sql')
+# 복제 순서 (외래키 순서)
+TABLES = ['Brand', 'Model', 'Keyword', 'Recall', 'Recall_Keyword_Junction',
+          'Summary_Stats', 'Brand_Stats', 'Model_Stats', 'Model_Keyword_Stats']
+
+# 저장소만 비교하도록 임베디드 엔진은 끕니다. (QUERY_FUNCTIONS는 st.cache_data를 거치지 않는 캐시 전 원본 함수)
+embedded_engine.MODE_OVERRIDE = 'mysql'
+
+
+def build_sqlite_replica(path):
+    """MySQL의 모든 테이블을 recall_id 등 키 값 그대로 SQLite 파일로 복사합니다."""
+    if os.path.exists(path):
+        os.remove(path)
+    target = sqlite3.connect(path)
+    with open(SQLITE_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        target.executescript(f.read())
+
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            raise RuntimeError("MySQL에 연결할 수 없습니다. .streamlit/secrets.toml의 [db_credentials]를 확인하세요.")
+        cursor = conn.cursor()
+        for table in TABLES:
+            cursor.execute(f"SELECT * FROM {table}")
+            columns = [col[0] for col in cursor.description]
+            rows = [
+                tuple(v.isoformat() if isinstance(v, date) else v for v in row)
+                for row in cursor.fetchall()
+            ]
+            placeholders = ", ".join("?" for _ in columns)
+            target.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+            print(f" -> {table}: {len(rows):,}행 복사")
+        cursor.close()
+    target.commit()
+    target.close()
+
+
+def run_cases(cases, repeat):
+    """(함수 이름, 인자, 비교 함수) 목록을 현재 저장소에서 실행해 [(결과, 시간)]을 반환합니다."""
+    results = []
+    for name, args, _ in cases:
+        result, times = timed(QUERY_FUNCTIONS[name], *args, repeat=repeat)
+        results.append((result, statistics.median(times)))
+    return results
+
+
+def build_cases():
+    """MySQL 데이터에서 예시 값을 골라 비교할 호출 목록을 만듭니다."""
+    catalog = QUERY_FUNCTIONS['get_catalog']()
+    summary = QUERY_FUNCTIONS['get_summary_stats']()
+    brand = summary['most_recall_brand'][0]
+    models = list(catalog[brand]['models'])
+    counts = {model: QUERY_FUNCTIONS['count_search_results'](brand, model, "전체", "전체") for model in models}
+    model = max(counts, key=counts.get)
+    keywords = QUERY_FUNCTIONS['get_all_keywords_with_desc']()
+    keyword = max(keywords, key=lambda k: QUERY_FUNCTIONS['count_search_results']("전체", "전체", "전체", k))
+    sample_page = QUERY_FUNCTIONS['search_recalls'](brand, model, "전체", "전체")
+    year = sample_page['리콜개시일'].iloc[0].year
+    recall_ids = sample_page['리콜ID'].head(5).tolist()
+    samples = [brand, model, year, keyword]
+    print(f"예시 필터 값: {dict(zip(FILTER_NAMES, samples))}\n")
+
+    # 같은 날짜 안의 순서는 SQL에서 정해져 있지 않은 결과는 정렬 후 비교합니다.
+    profile_check = lambda a, b: (same_frame(a[0], b[0], sort_by=list(a[0].columns) if not a[0].empty else None)
+                                  and sorted(a[1].split(" ")) == sorted(b[1].split(" ")))
+    rankings_check = lambda a, b: (same_frame(a[0], b[0], sort_by='브랜드')
+                                   and same_frame(a[1], b[1], sort_by='브랜드'))
+    keywords_check = lambda a, b: (same_value(a[0], b[0])
+                                   and list(a[1].get('keyword_count', [])) == list(b[1].get('keyword_count', [])))
+
+    cases = [
+        ('get_catalog', (), same_value),
+        ('get_all_keywords_with_desc', (), same_value),
+        ('get_summary_stats', (), same_value),
+        ('get_brand_rankings', (), rankings_check),
+    ]
+    for enabled in itertools.product([False, True], repeat=len(FILTER_NAMES)):
+        filters = tuple(value if on else "전체" for value, on in zip(samples, enabled))
+        cases.append(('search_recalls', filters, same_value))
+        cases.append(('search_recalls_page', filters, same_value))
+        cases.append(('count_search_results', filters, same_value))
+    for model_name in sorted(counts, key=counts.get, reverse=True)[:10]:
+        cases.append(('get_recall_comparison', (brand, model_name), keywords_check))
+        cases.append(('get_model_profile_data', (brand, model_name), profile_check))
+    cases += [('get_keywords_for_recall', (int(recall_id),), lambda a, b: sorted(a) == sorted(b))
+              for recall_id in recall_ids]
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MySQL과 SQLite 저장소에서 조회 함수 결과/성능 비교")
+    parser.add_argument('--sqlite-path', default=os.path.join(ROOT_DIR, 'data', 'lemon_bench.db'),
+                        help="MySQL을 복제할 SQLite 파일 경로 (기존 파일은 덮어씀)")
+    parser.add_argument('--repeat', type=int, default=5, help="호출별 반복 실행 횟수 (중앙값 기준)")
+    args = parser.parse_args()
+
+    db_manager.configure_storage('mysql')
+    print(f"[1] MySQL -> SQLite 복제 ({args.sqlite_path})")
+    build_sqlite_replica(args.sqlite_path)
+    print()
+
+    cases = build_cases()
+    mysql_results = run_cases(cases, args.repeat)
+    db_manager.configure_storage('sqlite', path=args.sqlite_path, read_only=True)
+    sqlite_results = run_cases(cases, args.repeat)
+
+    mismatches = []
+    timings = {}
+    for (name, call_args, check), (mysql_result, mysql_time), (sqlite_result, sqlite_time) in zip(
+            cases, mysql_results, sqlite_results):
+        if not check(mysql_result, sqlite_result):
+            mismatches.append(f"{name}{call_args}")
+        mysql_times, sqlite_times = timings.setdefault(name, ([], []))
+        mysql_times.append(mysql_time)
+        sqlite_times.append(sqlite_time)
+
+    print(f"{'함수':<28} {'호출 수':>7} {'MySQL(ms)':>11} {'SQLite(ms)':>12} {'개선':>8}")
+    for name, (mysql_times, sqlite_times) in timings.items():
+        mysql_ms = statistics.median(mysql_times) * 1000
+        sqlite_ms = statistics.median(sqlite_times) * 1000
+        speedup = mysql_ms / sqlite_ms if sqlite_ms else 0
+        print(f"{name:<28} {len(mysql_times):>7} {mysql_ms:>11.2f} {sqlite_ms:>12.2f} {speedup:>7.1f}x")
+
+    if mismatches:
+        print(f"\n[경고] {len(mismatches)}건의 결과가 다릅니다:")
+        for item in mismatches:
+            print(f" - {item}")
+        sys.exit(1)
+    print(f"\n[완료] {len(cases)}개 호출 모두 MySQL과 SQLite의 결과가 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
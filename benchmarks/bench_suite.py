@@ -0,0 +1,275 @@
+# 파일 이름: benchmarks/bench_suite.py
+# [신규] 조회 함수 / 적재 성능 회귀 확인용 벤치마크 모음
+#  - 원본 Excel 데이터를 리콜 N건(기본 1만 / 10만 / 100만)으로 늘린 SQLite DB를 만들면서 적재 속도(rows/sec)를 재고,
+#  - 그 DB에서 search_recalls / search_recalls_page / count_search_results(필터 조합 16가지 + 자유 검색어),
+#    get_brand_rankings / get_summary_stats / get_recall_comparison / get_model_profile_data 실행 시간을 잽니다.
+#  - 결과는 JSON 파일로 저장하며(커밋 해시 포함), --compare로 이전 결과 파일과 항목별로 비교할 수 있습니다.
+# MySQL 없이 로컬에서 돌릴 수 있도록 저장소 어댑터의 SQLite 백엔드를 사용합니다.
+# (적재는 insert_data_to_db와 같은 recall_key upsert / 키워드 태깅 경로인 insert_data_to_db_sqlite로 측정)
+# 실행 예:
+#   python benchmarks/bench_suite.py                                   (1만 / 10만 / 100만 건, 결과: data/bench/)
+#   python benchmarks/bench_suite.py --scales 10000 --repeat 3
+#   python benchmarks/bench_suite.py --scales 10000,100000 --compare data/bench/bench_suite_abc1234.json
+#   python benchmarks/bench_suite.py --data synthetic --seed 0     (복제 대신 sql/generate_recall_data.py의 합성 데이터)
+import argparse
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'sql'))
+
+from backend import db_manager, embedded_engine
+from _common import FILTER_NAMES, QUERY_FUNCTIONS, git_commit, timed
+from generate_recall_data import RecallProfile, write_synthetic_csv
+from load_data_from_excel import EXCEL_FILE_PATH, SHEET_NAMES, insert_data_to_db_sqlite, load_and_clean_data
+
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+DEFAULT_WORK_DIR = os.path.join(ROOT_DIR, 'data', 'bench')
+SAMPLE_TEXT = "에어백"
+PROFILE_MODELS = 5 # 차종 비교/프로필을 잴 차종 수 (가장 리콜이 많은 브랜드의 상위 차종)
+REGRESSION_THRESHOLD = 1.2 # --compare 시 이 배수 이상 느려진 항목을 표시
+REGRESSION_MIN_MS = 1.0 # 이보다 적게 느려진 항목은 측정 오차로 보고 표시하지 않음
+
+# --- 1. 데이터 / 적재 ---
+def scale_dataset(base_df, rows):
+    """
+    원본 데이터를 rows건이 될 때까지 복제합니다. 복제본마다 recall_key를 새로 만들고(중복 없이 모두 적재되도록)
+    리콜개시일을 며칠씩 옮겨서 연도 필터/정렬이 실제 데이터처럼 분산되게 합니다.
+    """
+    copies = []
+    for copy_no in range(-(-rows // len(base_df))):
+        copy = base_df.copy()
+        if copy_no:
+            copy['recall_key'] = [hashlib.sha256(f"{key}#{copy_no}".encode('utf-8')).hexdigest()
+                                  for key in copy['recall_key'].tolist()]
+            copy['리콜개시일'] = pd.to_datetime(copy['리콜개시일']) - pd.Timedelta(days=copy_no % 365)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True).head(rows)
+
+
+def synthetic_dataset(profile, rows, seed, work_dir):
+    """원본 CSV 분포로 만든 합성 데이터 rows건을 CSV로 쓰고, 적재 스크립트와 같은 전처리를 거쳐 반환합니다."""
+    path = os.path.join(work_dir, f"synthetic_{rows}_{seed}.csv")
+    with contextlib.redirect_stdout(io.StringIO()):
+        write_synthetic_csv(profile, path, rows, seed=seed)
+        return load_and_clean_data(path, SHEET_NAMES)
+
+
+def load_scaled_db(df, path):
+    """SQLite DB를 새로 만들어 df를 적재하고 (소요 시간, 적재된 리콜 수)를 반환합니다."""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log): # 적재 진행 메시지는 실패했을 때만 출력
+        insert_data_to_db_sqlite(df, path)
+    elapsed = time.perf_counter() - start
+    conn = sqlite3.connect(path)
+    try:
+        loaded = conn.execute("SELECT COUNT(*) FROM Recall").fetchone()[0]
+    except sqlite3.Error:
+        loaded = 0
+    finally:
+        conn.close()
+    if not loaded:
+        print(log.getvalue())
+        raise RuntimeError(f"적재에 실패했습니다: {path}")
+    if loaded < len(df):
+        # 차종 매핑에 실패한 행(제작자 없음 등)은 적재 스크립트가 건너뜁니다. 처리 속도는 실제 적재 건수 기준입니다.
+        print(f"   (적재되지 않은 행 {len(df) - loaded:,}건은 제외하고 측정합니다)")
+    return elapsed, loaded
+
+
+# --- 2. 조회 ---
+def result_rows(result):
+    """결과 크기 (DataFrame은 행 수, 튜플은 첫 번째 값 기준). 다른 커밋과 결과가 같은지 확인하는 용도입니다."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    if isinstance(result, (list, dict)):
+        return len(result)
+    if isinstance(result, int):
+        return result
+    return None
+
+
+def build_cases():
+    """현재 DB에서 예시 값을 골라 (항목 이름, 함수 이름, 인자, 키워드 인자) 목록을 만듭니다."""
+    catalog = QUERY_FUNCTIONS['get_catalog']()
+    brand = max(catalog, key=lambda name: catalog[name]['recall_count'])
+    models = sorted(catalog[brand]['models'].items(), key=lambda item: -item[1]['recall_count'])
+    model = models[0][0]
+    keywords = QUERY_FUNCTIONS['get_all_keywords_with_desc']()
+    keyword = max(keywords, key=lambda k: QUERY_FUNCTIONS['count_search_results']("전체", "전체", "전체", k))
+    sample_page = QUERY_FUNCTIONS['search_recalls'](brand, model, "전체", "전체")
+    year = sample_page['리콜개시일'].dropna().iloc[0].year
+    samples = [brand, model, year, keyword]
+
+    cases = [
+        ('get_summary_stats', 'get_summary_stats', (), {}),
+        ('get_brand_rankings', 'get_brand_rankings', (), {}),
+    ]
+    for enabled in itertools.product([False, True], repeat=len(FILTER_NAMES)):
+        filters = tuple(value if on else "전체" for value, on in zip(samples, enabled))
+        label = "+".join(name for name, on in zip(FILTER_NAMES, enabled) if on) or "필터 없음"
+        for name in ('search_recalls', 'search_recalls_page', 'count_search_results'):
+            cases.append((f"{name}[{label}]", name, filters, {}))
+    for name in ('search_recalls', 'search_recalls_page', 'count_search_results'):
+        cases.append((f"{name}[검색어]", name, ("전체", "전체", "전체", "전체"), {'text': SAMPLE_TEXT}))
+        cases.append((f"{name}[브랜드+검색어]", name, (brand, "전체", "전체", "전체"), {'text': SAMPLE_TEXT}))
+    for rank, (model_name, _) in enumerate(models[:PROFILE_MODELS], start=1):
+        cases.append((f"get_recall_comparison[차종 {rank}위]", 'get_recall_comparison', (brand, model_name), {}))
+        cases.append((f"get_model_profile_data[차종 {rank}위]", 'get_model_profile_data', (brand, model_name), {}))
+    return samples, cases
+
+
+def run_queries(repeat):
+    samples, cases = build_cases()
+    print(f"   예시 필터 값: {dict(zip(FILTER_NAMES, samples))}")
+    results = []
+    for case, name, args, kwargs in cases:
+        result, times = timed(QUERY_FUNCTIONS[name], *args, repeat=repeat, **kwargs)
+        results.append({
+            'case': case,
+            'rows': result_rows(result),
+            'median_ms': round(statistics.median(times) * 1000, 3),
+            'min_ms': round(min(times) * 1000, 3),
+            'max_ms': round(max(times) * 1000, 3),
+        })
+    return results
+
+
+# --- 3. 결과 출력 / 비교 ---
+def print_results(scale_result):
+    loader = scale_result['loader']
+    print(f"   적재: {loader['rows']:,}건 / {loader['seconds']:.2f}초 = {loader['rows_per_sec']:,.0f} rows/sec")
+    print(f"   {'항목':<42} {'행 수':>9} {'중앙값(ms)':>11} {'최소(ms)':>10}")
+    for item in scale_result['queries']:
+        rows = '' if item['rows'] is None else f"{item['rows']:,}"
+        print(f"   {item['case']:<42} {rows:>9} {item['median_ms']:>11.2f} {item['min_ms']:>10.2f}")
+
+
+def compare_results(previous, current):
+    """같은 규모/항목끼리 중앙값을 비교해 출력하고, 기준 이상 느려진 항목 수를 반환합니다."""
+    print(f"\n[비교] {previous['meta']['commit']} -> {current['meta']['commit']}")
+    regressions = 0
+    old_scales = {result['scale']: result for result in previous['scales']}
+    for result in current['scales']:
+        old = old_scales.get(result['scale'])
+        if old is None:
+            continue
+        print(f" - 리콜 {result['scale']:,}건")
+        old_rate, new_rate = old['loader']['rows_per_sec'], result['loader']['rows_per_sec']
+        print(f"   {'적재(rows/sec)':<42} {old_rate:>12,.0f} {new_rate:>12,.0f} {new_rate / old_rate:>7.2f}x")
+        old_queries = {item['case']: item for item in old['queries']}
+        for item in result['queries']:
+            before = old_queries.get(item['case'])
+            if before is None:
+                continue
+            ratio = item['median_ms'] / before['median_ms'] if before['median_ms'] else 0
+            flags = []
+            if ratio >= REGRESSION_THRESHOLD and item['median_ms'] - before['median_ms'] >= REGRESSION_MIN_MS:
+                flags.append("느려짐")
+                regressions += 1
+            if item['rows'] != before['rows']:
+                flags.append(f"행 수 변경 {before['rows']} -> {item['rows']}")
+            print(f"   {item['case']:<42} {before['median_ms']:>10.2f}ms {item['median_ms']:>10.2f}ms "
+                  f"{ratio:>7.2f}x  {', '.join(flags)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 함수 / 적재 성능 벤치마크 (SQLite, 여러 데이터 규모)")
+    parser.add_argument('--scales', default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="측정할 리콜 건수 (쉼표로 구분, 기본값: 10000,100000,1000000)")
+    parser.add_argument('--repeat', type=int, default=5, help="조회 항목별 반복 실행 횟수 (중앙값 기준)")
+    parser.add_argument('--engine', choices=['sql', 'embedded'], default='sql',
+                        help="조회 경로: sql(SQL 조회, 기본값) 또는 embedded(인메모리 스냅샷)")
+    parser.add_argument('--data', choices=['replicate', 'synthetic'], default='replicate',
+                        help="데이터: replicate(원본 Excel 복제, 기본값) 또는 synthetic(원본 CSV 분포의 합성 데이터)")
+    parser.add_argument('--seed', type=int, default=0, help="--data synthetic의 난수 시드 (기본값: 0)")
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help="벤치마크용 SQLite 파일과 결과를 저장할 폴더")
+    parser.add_argument('--output', help="결과 JSON 파일 경로 (기본값: <work-dir>/bench_suite_<커밋>.json)")
+    parser.add_argument('--compare', metavar='JSON', help="비교할 이전 결과 파일 (느려진 항목이 있으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    os.makedirs(args.work_dir, exist_ok=True)
+    embedded_engine.MODE_OVERRIDE = 'embedded' if args.engine == 'embedded' else 'mysql'
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        base_df = load_and_clean_data(EXCEL_FILE_PATH, SHEET_NAMES)
+    if base_df is None:
+        print(f"[오류] 원본 데이터를 읽을 수 없습니다: {EXCEL_FILE_PATH}")
+        sys.exit(1)
+    profile = RecallProfile.from_csv() if args.data == 'synthetic' else None
+    print(f"원본 데이터 {len(base_df):,}건 / 데이터: {args.data} / 규모: {', '.join(f'{s:,}' for s in scales)} "
+          f"/ 조회 경로: {args.engine}\n")
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'engine': args.engine,
+            'data': args.data,
+            'seed': args.seed if args.data == 'synthetic' else None,
+            'repeat': args.repeat,
+            'base_rows': len(base_df),
+        },
+        'scales': [],
+    }
+    for scale in scales:
+        print(f"[리콜 {scale:,}건]")
+        path = os.path.join(args.work_dir, f"bench_{scale}.db")
+        if profile is not None:
+            df = synthetic_dataset(profile, scale, args.seed, args.work_dir)
+        else:
+            df = scale_dataset(base_df, scale)
+        seconds, loaded = load_scaled_db(df, path)
+        del df
+        db_manager.configure_storage('sqlite', path=path, read_only=True)
+        scale_result = {
+            'scale': scale,
+            'loader': {'rows': loaded, 'seconds': round(seconds, 3), 'rows_per_sec': round(loaded / seconds, 1)},
+            'queries': run_queries(args.repeat),
+        }
+        report['scales'].append(scale_result)
+        print_results(scale_result)
+        print()
+
+    output = args.output or os.path.join(args.work_dir, f"bench_suite_{commit}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[완료] 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare_results(previous, report)
+        if regressions:
+            print(f"\n[경고] {regressions}개 항목이 {REGRESSION_THRESHOLD}배 이상 느려졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# 파일 이름: benchmarks/check_failure_cache.py
+# [신규] 조회 실패 기본값 캐시 여부 확인
+# 조회 함수는 쿼리 오류가 나면 빈 결과/0을 반환합니다. 이 값이 데이터 버전 캐시(backend/data_version.py)에 남으면
+# 다음 적재 전까지 계속 빈 화면이 보이므로, 실패한 호출은 캐시하지 않고 다음 호출에서 다시 조회해야 합니다.
+# 레플리카 공유 캐시(backend/shared_cache.py)에도 실패 결과가 저장되지 않아야 합니다. (모든 레플리카가 ttl 동안 보게 됨)
+# 같은 데이터 버전 토큰을 가진 SQLite 복사본 두 개(테이블을 지운 복사본 / 정상 복사본)를 차례로 조회해서
+#  1) 테이블이 없는 복사본에서는 기본값을 받고
+#  2) 정상 복사본으로 바꾼 뒤 같은 호출이 캐시된 기본값 대신 실제 결과를 돌려주는지 확인합니다.
+# 프로세스 캐시만 쓰는 경우와, 공유 캐시(SQLite 파일)를 쓰면서 레플리카가 바뀌는 경우(프로세스 캐시 비움)를 확인합니다.
+# 실행: python benchmarks/check_failure_cache.py [--sqlite data/lemon_scanner.db]
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from _common import ROOT_DIR, same_value
+
+from backend import db_manager, search_queries, shared_cache, stats_queries
+
+CHECK_VERSION = 'check-failure-cache' # 두 복사본에 똑같이 기록하는 데이터 버전 토큰
+
+
+def prepare_copies(source, tmp_dir):
+    """정상 복사본과 Data_Version 외의 테이블을 모두 지운 복사본을 만들고 (정상, 고장) 경로를 반환합니다."""
+    healthy = os.path.join(tmp_dir, 'healthy.db')
+    broken = os.path.join(tmp_dir, 'broken.db')
+    shutil.copyfile(source, healthy)
+    with sqlite3.connect(healthy) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS Data_Version "
+                     "(version_id INTEGER PRIMARY KEY, version TEXT NOT NULL, loaded_at DATETIME NOT NULL)")
+        conn.execute("INSERT OR REPLACE INTO Data_Version VALUES (1, ?, datetime('now'))", (CHECK_VERSION,))
+    conn.close()
+    shutil.copyfile(healthy, broken)
+    conn = sqlite3.connect(broken)
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'Data_Version' AND name NOT LIKE 'sqlite_%'")]
+    for table in tables:
+        try:
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        except sqlite3.Error:
+            pass  # FTS 보조 테이블 등은 본 테이블과 함께 지워집니다.
+    conn.commit()
+    conn.close()
+    return healthy, broken
+
+
+def sample_args(path):
+    """리콜이 가장 많은 차종과 키워드가 있는 리콜 ID (조회 인자)"""
+    conn = sqlite3.connect(path)
+    brand, model = conn.execute("""
+        SELECT b.brand_name, m.model_name FROM Recall r
+        JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+        GROUP BY m.model_id ORDER BY COUNT(*) DESC LIMIT 1""").fetchone()
+    recall_id = conn.execute("SELECT recall_id FROM Recall_Keyword_Junction LIMIT 1").fetchone()[0]
+    conn.close()
+    return brand, model, recall_id
+
+
+def build_cases(brand, model, recall_id):
+    return [
+        (stats_queries.get_summary_stats, ()),
+        (stats_queries.get_brand_rankings, ()),
+        (search_queries.get_catalog, ()),
+        (search_queries.get_all_keywords_with_desc, ()),
+        (search_queries.count_search_results, (brand, "전체", "전체", "전체")),
+        (search_queries.compare_models, (((brand, model),),)),
+        (search_queries.get_recall_comparison, (brand, model)),
+        (search_queries.get_model_profile_data, (brand, model)),
+        (search_queries.get_keywords_for_recall, (recall_id,)),
+    ]
+
+
+def run_phase(label, cases, expected, healthy, broken, check, clear_between):
+    """
+    1) 테이블이 없는 복사본: 쿼리 오류로 기본값을 받습니다.
+    2) 정상 복사본 (데이터 버전이 같으므로 캐시 키도 같음): 실패 결과가 캐시되었다면 기본값이 다시 나옵니다.
+    clear_between=True이면 2) 전에 프로세스 캐시를 비워 다른 레플리카처럼 공유 캐시부터 읽게 합니다.
+    """
+    for func, _ in cases:
+        func.clear()
+    db_manager.configure_storage('sqlite', path=broken, read_only=True)
+    defaults = [func(*call_args) for func, call_args in cases]
+    if clear_between:
+        for func, _ in cases:
+            func.clear()
+
+    db_manager.configure_storage('sqlite', path=healthy, read_only=True)
+    print(f"\n[{label}]\n{'함수':<28} {'실패 시 기본값':>14} {'재조회 결과':>12}")
+    for (func, call_args), want, default in zip(cases, expected, defaults):
+        name = func.__qualname__
+        got = func(*call_args)
+        failed_default = not same_value(default, want)
+        refreshed = same_value(got, want)
+        print(f"{name:<28} {'O' if failed_default else 'X':>14} {'O' if refreshed else 'X':>12}")
+        check(failed_default, f"[{label}] {name}: 테이블이 없는데도 정상 결과와 같습니다. (확인 불가)")
+        check(refreshed, f"[{label}] {name}: 실패했을 때의 기본값이 캐시되어 다시 조회하지 않았습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 실패 기본값이 캐시되지 않는지 확인")
+    parser.add_argument('--sqlite', dest='db_path', default=os.path.join(ROOT_DIR, 'data', 'lemon_scanner.db'),
+                        help="원본 SQLite DB (복사해서 사용하며 원본은 바꾸지 않음)")
+    args = parser.parse_args()
+    if not os.path.exists(args.db_path):
+        print(f"[오류] SQLite DB가 없습니다: {args.db_path} (python sql/load_data_from_excel.py --sqlite 로 생성)")
+        sys.exit(1)
+
+    failures = []
+
+    def check(condition, message):
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        healthy, broken = prepare_copies(args.db_path, tmp_dir)
+        cases = build_cases(*sample_args(healthy))
+
+        # 캐시를 거치지 않은 정상 결과
+        db_manager.configure_storage('sqlite', path=healthy, read_only=True)
+        expected = [func.__wrapped__(*call_args) for func, call_args in cases]
+
+        # 프로세스 캐시만 사용
+        run_phase("프로세스 캐시", cases, expected, healthy, broken, check, clear_between=False)
+
+        # 공유 캐시 사용: 실패한 레플리카가 저장한 값을 다른 레플리카(프로세스 캐시가 빈 상태)가 읽지 않아야 합니다.
+        shared_cache.configure_shared_cache('sqlite', path=os.path.join(tmp_dir, 'shared_cache.db'))
+        run_phase("공유 캐시", cases, expected, healthy, broken, check, clear_between=True)
+        shared_cache.configure_shared_cache(None)
+
+    if failures:
+        print(f"\n[경고] {len(failures)}개 항목이 실패했습니다:")
+        for failure in failures:
+            print(f" - {failure}")
+        sys.exit(1)
+    print("\n[완료] 실패한 조회는 캐시되지 않고 다음 호출에서 다시 조회합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# 파일 이름: benchmarks/load_test_pages.py
+# [신규] Streamlit 페이지 동시 세션 부하 테스트
+#  - Streamlit의 AppTest로 가상 세션 N개를 동시에 실행합니다. 세션마다 별도 프로세스를 씁니다.
+#    (AppTest는 Runtime / st.secrets / 페이지 정보를 전역으로 바꿔 가며 실행하고 매 실행마다 스크립트를 다시 컴파일하므로
+#     한 프로세스의 여러 스레드에서 동시에 돌리면 서로 간섭합니다)
+#    프로세스마다 예열 흐름을 한 번 실행한 뒤 동시에 측정을 시작하므로, 캐시가 데워진 서버 레플리카 N개에 한 명씩 붙은 상황에 가깝습니다.
+#    DB / 공유 캐시(redis)에 걸리는 동시 부하는 실제와 같습니다.
+#  - 세션마다 실제 사용 흐름을 반복합니다.
+#      홈(로그인 후 대시보드) -> 상세 검색(브랜드 선택, 조건 검색, 결과 행 클릭, 다음 페이지)
+#      -> 분석 리포트(차량 비교, 브랜드 리포트, 모델 프로필 선택 / 연도 필터)
+#  - 화면 갱신(rerun)마다 걸린 시간과 실행된 SQL 수(backend/instrumentation.py)를 모아
+#    페이지별 / 동작별 p50 / p95 / p99와 갱신당 쿼리 수를 출력하고 JSON으로 저장합니다.
+#  - --compare로 이전 결과와 비교해 p95가 기준 이상 느려졌거나 갱신당 쿼리 수가 늘어난 동작이 있으면 종료 코드 1을 반환합니다.
+# DB는 .streamlit/secrets.toml 설정을 그대로 쓰거나 --sqlite로 SQLite 파일을 지정합니다.
+# (네이버 뉴스 API 키는 넘기지 않으므로 외부 호출은 하지 않습니다)
+# 실행 예:
+#   python benchmarks/load_test_pages.py --sqlite data/lemon_scanner.db --sessions 10 --iterations 3
+#   python benchmarks/load_test_pages.py --sqlite data/bench/bench_100000.db --sessions 20 --compare data/bench/load_test_abc1234.json
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import tomllib
+import traceback
+from collections import defaultdict
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from streamlit.testing.v1 import AppTest
+
+from backend import embedded_engine, instrumentation
+from _common import git_commit
+
+HOME_PATH = os.path.join(ROOT_DIR, 'Home.py')
+SEARCH_PAGE = 'pages/2_🍋_상세_검색.py'
+REPORT_PAGE = 'pages/3_📊_분석_리포트.py'
+SECRETS_PATH = os.path.join(ROOT_DIR, '.streamlit', 'secrets.toml')
+DEFAULT_WORK_DIR = os.path.join(ROOT_DIR, 'data', 'bench')
+ROW_CLICKS = 2 # 검색 한 번에 클릭해 볼 결과 행 수
+REGRESSION_THRESHOLD = 1.2 # --compare 시 p95가 이 배수 이상 느려진 동작을 표시
+REGRESSION_MIN_MS = 5.0 # 이보다 적게 느려진 동작은 측정 오차로 보고 표시하지 않음
+
+
+def load_secrets(sqlite_path=None):
+    """AppTest에 넘길 secrets (secrets.toml + --sqlite). 외부 API 키는 빼고, 백그라운드 예열은 끕니다."""
+    secrets = {}
+    if os.path.exists(SECRETS_PATH):
+        with open(SECRETS_PATH, 'rb') as f:
+            secrets = tomllib.load(f)
+    secrets.pop('naver_api', None)
+    if sqlite_path:
+        secrets['storage'] = {'backend': 'sqlite', 'path': os.path.abspath(sqlite_path), 'read_only': True}
+    secrets['warmup'] = {'enabled': False} # 예열 스레드의 쿼리가 세션 측정에 섞이지 않도록
+    return secrets
+
+
+def percentile(values, p):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[p - 1]
+
+
+class QueryCounter:
+    """이 프로세스에서 실행된 SQL 수를 셉니다. (화면 스레드와 concurrent_fetch 작업 스레드에서 함께 불림)"""
+
+    def __init__(self):
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, function_name, elapsed_ms, rows, error):
+        with self._lock:
+            self._count += 1
+
+    def get(self):
+        with self._lock:
+            return self._count
+
+
+class SimulatedSession:
+    """가상 사용자 한 명. 하나의 AppTest(세션 상태 유지)로 페이지를 옮겨 다니며 동작마다 갱신 시간을 기록합니다."""
+
+    def __init__(self, session_no, secrets, counter, seed, timeout, think_time):
+        self.session_no = session_no
+        self.counter = counter
+        self.rng = random.Random(seed * 100003 + session_no)
+        self.think_time = think_time
+        self.samples = []
+        self.at = AppTest.from_file(HOME_PATH, default_timeout=timeout)
+        for section, values in secrets.items():
+            self.at.secrets[section] = values
+        self.at.session_state['logged_in'] = True # 홈은 로그인한 사용자의 대시보드를 봅니다.
+        self.at.session_state['user_name'] = f"부하 테스트 {session_no}"
+
+    def step(self, page, action, run):
+        """run()으로 화면을 한 번 갱신하고 시간 / SQL 수 / 예외를 기록합니다."""
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+        before = self.counter.get()
+        start = time.perf_counter()
+        error = None
+        try:
+            run()
+            if self.at.exception:
+                error = self.at.exception[0].message
+        except Exception as e:  # 시간 초과, 화면에 없는 위젯 등
+            error = f"{type(e).__name__}: {e}"
+        self.samples.append({
+            'page': page,
+            'action': action,
+            'ms': (time.perf_counter() - start) * 1000,
+            'queries': self.counter.get() - before,
+            'error': error,
+        })
+        return error is None
+
+    def _choose(self, widget, allow_all=0.0):
+        """선택 상자에서 '전체'가 아닌 값을 고릅니다. (allow_all 확률로 '전체' 유지)"""
+        options = [option for option in widget.options if option != "전체"]
+        if not options or self.rng.random() < allow_all:
+            return "전체"
+        return self.rng.choice(options)
+
+    # --- 흐름 ---
+    def home(self):
+        self.at.switch_page(HOME_PATH)
+        self.step('홈', '대시보드', self.at.run)
+
+    def search(self):
+        at = self.at
+        at.switch_page(SEARCH_PAGE)
+        if not self.step('상세 검색', '첫 화면', at.run):
+            return
+        brand = self._choose(at.selectbox(key="search_brand"))
+        if not self.step('상세 검색', '브랜드 선택', at.selectbox(key="search_brand").select(brand).run):
+            return
+        at.selectbox(key="search_model").select(self._choose(at.selectbox(key="search_model"), allow_all=0.5))
+        at.selectbox(key="search_year").select(self._choose(at.selectbox(key="search_year"), allow_all=0.7))
+        at.selectbox(key="search_keyword").select(self._choose(at.selectbox(key="search_keyword"), allow_all=0.7))
+        submit = next(button for button in at.button if (button.key or '').startswith("FormSubmitter:search_form"))
+        if not self.step('상세 검색', '검색', submit.click().run):
+            return
+        row_count = len(at.session_state["search_results"])
+        if row_count:
+            for row in self.rng.sample(range(row_count), min(ROW_CLICKS, row_count)):
+                at.session_state["search_results_df"] = {'selection': {'rows': [row], 'columns': []}}
+                self.step('상세 검색', '행 클릭', at.run)
+            next_button = next((button for button in at.button if button.label == "다음 ▶"), None)
+            if next_button is not None and not next_button.disabled:
+                self.step('상세 검색', '다음 페이지', next_button.click().run)
+
+    def report(self):
+        at = self.at
+        at.switch_page(REPORT_PAGE) # 첫 화면에 세 탭(차량 비교 / 브랜드 리포트 / 모델 프로필)이 모두 그려집니다.
+        if not self.step('분석 리포트', '첫 화면', at.run):
+            return
+        for i in (1, 2):
+            brand = self._choose(at.selectbox(key=f"brand{i}"))
+            if not self.step('분석 리포트', '비교 차량 선택', at.selectbox(key=f"brand{i}").select(brand).run):
+                return
+            model = self._choose(at.selectbox(key=f"model{i}"))
+            if not self.step('분석 리포트', '비교 차량 선택', at.selectbox(key=f"model{i}").select(model).run):
+                return
+        self.step('분석 리포트', '비교하기', at.button(key="compare_button").click().run)
+
+        brand = self._choose(at.selectbox(key="profile_brand"))
+        if not self.step('분석 리포트', '모델 프로필', at.selectbox(key="profile_brand").select(brand).run):
+            return
+        model = self._choose(at.selectbox(key="profile_model"))
+        if not self.step('분석 리포트', '모델 프로필', at.selectbox(key="profile_model").select(model).run):
+            return
+        year_filter = next((box for box in at.selectbox if box.key == "model_year_filter"), None)
+        if year_filter is not None:
+            self.step('분석 리포트', '프로필 연도 필터', year_filter.select(self._choose(year_filter)).run)
+
+    def run(self, iterations):
+        for _ in range(iterations):
+            self.home()
+            self.search()
+            self.report()
+        return self.samples
+
+
+def warm_up_import(secrets, timeout):
+    """
+    페이지의 `from Home import display_custom_header`는 처음 한 번 Home.py 전체를 실행합니다.
+    (서버에서도 프로세스당 첫 방문에만 일어나는 일이므로) 측정 전에 한 번 임포트해 둡니다.
+    """
+    at = AppTest.from_string("import Home", default_timeout=timeout)
+    for section, values in secrets.items():
+        at.secrets[section] = values
+    at.run()
+
+
+def run_session(session_no, args, secrets, barrier, results):
+    """가상 세션 프로세스: 예열 후 다른 세션들과 동시에 측정을 시작하고, 기록을 results 큐로 보냅니다."""
+    try:
+        if args.engine:
+            embedded_engine.MODE_OVERRIDE = 'embedded' if args.engine == 'embedded' else 'mysql'
+        counter = QueryCounter()
+        instrumentation.add_sql_listener(counter)
+        warm_up_import(secrets, args.timeout)
+        if not args.cold:
+            SimulatedSession(-1, secrets, counter, args.seed, args.timeout, 0).run(1)
+        session = SimulatedSession(session_no, secrets, counter, args.seed, args.timeout, args.think_time)
+    except Exception:
+        barrier.abort() # 다른 세션들이 기다리지 않도록
+        results.put((session_no, None, traceback.format_exc()))
+        return
+    try:
+        barrier.wait()
+        results.put((session_no, session.run(args.iterations), None))
+    except Exception:
+        results.put((session_no, session.samples, traceback.format_exc()))
+
+
+def summarize(samples, key):
+    """key('page' 또는 ('page', 'action'))별 갱신 시간 분위수와 갱신당 쿼리 수"""
+    groups = defaultdict(list)
+    for sample in samples:
+        name = sample['page'] if key == 'page' else f"{sample['page']} / {sample['action']}"
+        groups[name].append(sample)
+    summary = {}
+    for name, items in groups.items():
+        times = sorted(item['ms'] for item in items)
+        queries = [item['queries'] for item in items]
+        summary[name] = {
+            'reruns': len(items),
+            'errors': sum(1 for item in items if item['error']),
+            'p50_ms': round(percentile(times, 50), 2),
+            'p95_ms': round(percentile(times, 95), 2),
+            'p99_ms': round(percentile(times, 99), 2),
+            'max_ms': round(times[-1], 2),
+            'queries_per_rerun': round(statistics.mean(queries), 2),
+            'max_queries': max(queries),
+        }
+    return summary
+
+
+def print_summary(title, summary):
+    print(f"\n[{title}]")
+    print(f"{'':<28} {'갱신':>6} {'오류':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'최대(ms)':>9} {'쿼리/갱신':>9}")
+    for name, item in summary.items():
+        print(f"{name:<28} {item['reruns']:>6} {item['errors']:>5} {item['p50_ms']:>9.1f} {item['p95_ms']:>9.1f} "
+              f"{item['p99_ms']:>9.1f} {item['max_ms']:>9.1f} {item['queries_per_rerun']:>9.2f}")
+
+
+def compare_results(previous, current):
+    """동작별 p95와 갱신당 쿼리 수를 이전 결과와 비교해 출력하고, 나빠진 동작 수를 반환합니다."""
+    print(f"\n[비교] {previous['meta']['commit']} -> {current['meta']['commit']}")
+    regressions = 0
+    for name, item in current['actions'].items():
+        before = previous['actions'].get(name)
+        if before is None:
+            continue
+        ratio = item['p95_ms'] / before['p95_ms'] if before['p95_ms'] else 0
+        flags = []
+        if ratio >= REGRESSION_THRESHOLD and item['p95_ms'] - before['p95_ms'] >= REGRESSION_MIN_MS:
+            flags.append("느려짐")
+        if item['queries_per_rerun'] > before['queries_per_rerun'] + 0.5:
+            flags.append(f"쿼리 증가 {before['queries_per_rerun']} -> {item['queries_per_rerun']}")
+        regressions += 1 if flags else 0
+        print(f"{name:<28} p95 {before['p95_ms']:>8.1f}ms -> {item['p95_ms']:>8.1f}ms {ratio:>6.2f}x  {', '.join(flags)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 페이지 동시 세션 부하 테스트 (AppTest)")
+    parser.add_argument('--sessions', type=int, default=10, help="동시에 실행할 가상 세션 수 (기본값: 10)")
+    parser.add_argument('--iterations', type=int, default=3, help="세션마다 반복할 홈 -> 상세 검색 -> 분석 리포트 흐름 수")
+    parser.add_argument('--sqlite', metavar='DB_PATH', help="secrets.toml의 저장소 대신 사용할 SQLite 파일")
+    parser.add_argument('--engine', choices=['sql', 'embedded'], help="조회 경로 지정 (기본값: secrets.toml 설정)")
+    parser.add_argument('--think-time', type=float, default=0.0, help="동작 사이 최대 대기 시간(초, 균등 분포)")
+    parser.add_argument('--timeout', type=float, default=60.0, help="화면 갱신 한 번의 최대 시간(초)")
+    parser.add_argument('--seed', type=int, default=0, help="선택 값 난수 시드 (기본값: 0)")
+    parser.add_argument('--cold', action='store_true',
+                        help="측정 전 예열(세션 하나로 흐름 한 번 실행)을 하지 않고 빈 캐시에서 시작")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본값: data/bench/load_test_<커밋>.json)")
+    parser.add_argument('--compare', metavar='JSON', help="비교할 이전 결과 파일 (나빠진 동작이 있으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    secrets = load_secrets(args.sqlite)
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(args.sessions + 1) # 세션 프로세스 전부 + 측정 시간을 재는 이 프로세스
+    results = context.Queue()
+    workers = [context.Process(target=run_session, args=(no, args, secrets, barrier, results), daemon=True)
+               for no in range(args.sessions)]
+    print(f"세션 프로세스 {args.sessions}개 준비 중..." + ("" if args.cold else " (프로세스마다 흐름 한 번으로 예열)"))
+    for worker in workers:
+        worker.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass # 준비에 실패한 세션이 있음 (아래에서 오류 출력)
+
+    print(f"세션 {args.sessions}개 x 흐름 {args.iterations}회 실행 중...")
+    start = time.perf_counter()
+    samples, failures = [], []
+    for _ in workers:
+        session_no, session_samples, failure = results.get()
+        samples.extend(session_samples or [])
+        if failure:
+            failures.append(f"세션 {session_no}: {failure}")
+    elapsed = time.perf_counter() - start
+    for worker in workers:
+        worker.join()
+    for failure in failures:
+        print(f"[오류] {failure}")
+    if not samples:
+        sys.exit(1)
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'sessions': args.sessions,
+            'iterations': args.iterations,
+            'think_time': args.think_time,
+            'cold': args.cold,
+            'seed': args.seed,
+            'storage': secrets.get('storage', {}).get('backend', 'mysql'),
+            'engine': args.engine or 'secrets',
+            'failed_sessions': len(failures),
+            'elapsed_sec': round(elapsed, 2),
+            'reruns_per_sec': round(len(samples) / elapsed, 2) if elapsed else 0,
+        },
+        'pages': summarize(samples, 'page'),
+        'actions': summarize(samples, 'action'),
+        'errors': sorted({sample['error'] for sample in samples if sample['error']})[:20],
+    }
+    print(f"\n총 {len(samples):,}회 갱신 / {elapsed:.1f}초 ({report['meta']['reruns_per_sec']}회/초)")
+    print_summary("페이지별", report['pages'])
+    print_summary("동작별", report['actions'])
+    if report['errors']:
+        print(f"\n[경고] 오류가 난 갱신이 있습니다:")
+        for error in report['errors']:
+            print(f" - {error}")
+
+    os.makedirs(DEFAULT_WORK_DIR, exist_ok=True)
+    output = args.output or os.path.join(DEFAULT_WORK_DIR, f"load_test_{commit}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n[완료] 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare_results(previous, report)
+        if regressions:
+            print(f"\n[경고] {regressions}개 동작이 나빠졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,11 @@ import pandas as pd
 import datetime       
 from backend.search_queries import (
     get_all_keywords_with_desc, 
-    get_all_brands, 
-    get_models_by_brand, 
-    search_recalls,
-    get_keywords_for_recall
+    get_catalog, # [수정] 브랜드/차종 목록은 카탈로그 한 번으로
+    search_recalls_page,
+    count_search_results,
+    get_keywords_for_recall,
+    SEARCH_PAGE_SIZE
 )
 from backend.stats_queries import get_summary_stats
 
@@ -30,6 +31,21 @@ display_custom_header()
 # --- [1A] (수정) Session State 초기화 ---
 if "search_results" not in st.session_state:
     st.session_state.search_results = pd.DataFrame() 
+if "search_filters" not in st.session_state:
+    st.session_state.search_filters = None    # 마지막으로 검색한 (브랜드, 차종, 연도, 키워드, 검색어)
+    st.session_state.search_page_info = {}    # 현재 페이지의 키셋 경계 / 이전·다음 페이지 여부
+    st.session_state.search_total = 0
+    st.session_state.search_page_no = 1
+
+
+def load_search_page(seek=None, direction='next'):
+    """저장된 검색 조건으로 한 페이지를 조회해 session_state에 저장합니다."""
+    if "search_results_df" in st.session_state:
+        del st.session_state.search_results_df  # 페이지가 바뀌면 행 선택 초기화
+    brand, model, year, keyword, text = st.session_state.search_filters
+    results, page_info = search_recalls_page(brand, model, year, keyword, seek=seek, direction=direction, text=text)
+    st.session_state.search_results = results
+    st.session_state.search_page_info = page_info
 
 # --- [1B] 키워드 설명 DB에서 로드 ---
 try:
@@ -45,20 +61,17 @@ st.markdown("---")
 # --- [3] 사이드바 (필터 영역) ---
 st.sidebar.header("🔍 상세 검색 필터")
 try:
-    brand_list = ["전체"] + get_all_brands()
+    catalog = get_catalog() # [수정] 브랜드 -> 차종 전체 목록 (브랜드를 바꿔도 DB를 조회하지 않음)
 except Exception as e:
     st.sidebar.error(f"브랜드 목록 로딩 실패: {e}")
-    brand_list = ["전체"]
+    catalog = {}
+brand_list = ["전체"] + list(catalog)
 selected_brand = st.sidebar.selectbox(
     "1. 브랜드 선택", brand_list, key="search_brand", 
     help="브랜드를 선택하면 하단 '차종' 목록이 업데이트됩니다."
 )
 if selected_brand != "전체":
-    try:
-        model_list = ["전체"] + get_models_by_brand(selected_brand)
-    except Exception as e:
-        st.sidebar.error(f"차종 목록 로딩 실패: {e}")
-        model_list = ["전체"]
+    model_list = ["전체"] + list(catalog.get(selected_brand, {}).get('models', {}))
 else:
     model_list = ["전체"] 
 current_year = datetime.date.today().year
@@ -76,17 +89,22 @@ with st.sidebar.form(key="search_form"):
     if selected_keyword and selected_keyword != "전체":
         description = KEYWORD_DICT_FROM_DB.get(selected_keyword, "상세 설명이 없습니다.")
         st.caption(f"ℹ️ **{selected_keyword}**: {description}")
+    search_text = st.text_input(
+        "5. 리콜사유 검색어 (선택)", key="search_text", placeholder="예: 인플레이터, MDPS",
+        help="리콜 사유 원문에서 검색합니다. 여러 단어는 모두 포함하는 리콜만 찾으며, 2글자 이상 입력하세요."
+    )
     
     submit_pressed = st.form_submit_button(label="상세 리콜 내역 검색")
 
 if submit_pressed:
-    if "search_results_df" in st.session_state:
-        del st.session_state.search_results_df
-    
+    st.session_state.search_filters = (
+        selected_brand, selected_model, selected_year, selected_keyword, search_text.strip()
+    )
+    st.session_state.search_page_no = 1
     with st.spinner("데이터베이스에서 리콜 정보를 검색 중입니다..."):
-        st.session_state.search_results = search_recalls(
-            selected_brand, selected_model, selected_year, selected_keyword
-        )
+        brand, model, year, keyword, text = st.session_state.search_filters
+        st.session_state.search_total = count_search_results(brand, model, year, keyword, text=text)
+        load_search_page()
 
 # --- [5] 메인 화면 (결과 표시) ---
 results_df = st.session_state.search_results
@@ -94,8 +112,32 @@ results_df = st.session_state.search_results
 if results_df.empty:
     st.info("왼쪽 사이드바에서 검색 조건을 선택한 후 검색 버튼을 눌러주세요.")
 else:
-    st.success(f"총 {len(results_df)}건의 리콜 정보를 찾았습니다. (최대 200건)")
-    
+    page_info = st.session_state.search_page_info
+    page_size = SEARCH_PAGE_SIZE
+    first_no = (st.session_state.search_page_no - 1) * page_size + 1
+    last_no = first_no + len(results_df) - 1
+    st.success(f"총 {st.session_state.search_total}건의 리콜 정보를 찾았습니다. ({first_no}~{last_no}번째)")
+    if "관련도" in results_df.columns:
+        st.caption(f"🔎 검색어 '{st.session_state.search_filters[4]}'와(과) 관련도가 높은 순으로 정렬했습니다.")
+
+    # --- [5A] 페이지 이동 (키셋 페이지네이션) ---
+    col_prev, col_page, col_next = st.columns([1, 4, 1])
+    with col_prev:
+        if st.button("◀ 이전", disabled=not page_info.get('has_prev'), use_container_width=True):
+            st.session_state.search_page_no -= 1
+            load_search_page(seek=page_info['first'], direction='prev')
+            st.rerun()
+    with col_page:
+        st.markdown(
+            f"<div style='text-align: center;'>{st.session_state.search_page_no} 페이지</div>",
+            unsafe_allow_html=True
+        )
+    with col_next:
+        if st.button("다음 ▶", disabled=not page_info.get('has_next'), use_container_width=True):
+            st.session_state.search_page_no += 1
+            load_search_page(seek=page_info['last'], direction='next')
+            st.rerun()
+
     st.dataframe(
         results_df, 
         use_container_width=True, 
@@ -105,6 +147,7 @@ else:
         selection_mode="single-row", 
         column_config={
             "리콜ID": None, 
+            "관련도": None,
             "리콜사유": st.column_config.TextColumn("리콜사유", width="large")
         }
     )
@@ -1,18 +1,20 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from wordcloud import WordCloud 
-import matplotlib.pyplot as plt 
-import os 
 import datetime 
 
 from backend.search_queries import (
-    get_all_brands, 
-    get_models_by_brand, 
+    get_catalog, # [수정] 브랜드/차종 목록은 카탈로그 한 번으로
     get_recall_comparison, 
-    get_model_profile_data
+    get_model_profile_data,
+    compare_models, # [신규] 여러 차종 비교
+    COMPARE_MAX_MODELS
 )
 from backend.stats_queries import get_summary_stats, get_brand_rankings
+from backend.wordcloud_cache import get_wordcloud_png # [신규] 차종별로 한 번만 그려서 캐시한 워드 클라우드
+from backend.concurrent_fetch import fetch_concurrently # [신규] 독립적인 조회를 동시에 실행
+from backend.warmup import record_model_view # [신규] 자주 보는 차종을 캐시 예열 대상으로 기록
+from backend.news_api import get_naver_news_many # [신규] 브랜드별 / 차종별 리콜 뉴스를 한 번에 (동시에) 조회, 검색어별 캐시
 
 # --- 헤더 함수 임포트 ---
 try:
@@ -37,6 +39,26 @@ st.info("차량 비교, 브랜드 랭킹, 개별 모델 분석 기능을 제공
 st.markdown("---")
 
 
+# --- [신규] 브랜드 -> 차종 카탈로그 (모든 탭의 선택 상자가 공유, 브랜드를 바꿔도 DB를 조회하지 않음) ---
+try:
+    catalog = get_catalog()
+except Exception as e:
+    st.error(f"브랜드 목록 로딩 실패: {e}")
+    catalog = {}
+
+def models_of(brand):
+    """선택 상자용 차종 목록 ('전체' 포함)"""
+    if brand == "전체":
+        return ["전체"]
+    return ["전체"] + list(catalog.get(brand, {}).get('models', {}))
+
+def show_news(news_list):
+    """뉴스 목록 표시 (홈 화면과 같은 형식)"""
+    for news in news_list:
+        st.markdown(f"**[{news['title']}]({news['link']})**")
+        st.caption(f"{news['description'][:100]}...")
+
+
 # --- [2] 탭(Tabs) 생성 ---
 tab_compare, tab_brand, tab_model = st.tabs([
     "📊 차량 비교", 
@@ -50,93 +72,89 @@ tab_compare, tab_brand, tab_model = st.tabs([
 # ==============================================================================
 with tab_compare:
     st.header("차량 비교")
-    st.info("비교하고 싶은 두 차량을 선택하고 '비교하기' 버튼을 눌러주세요.")
+    st.info(f"비교하고 싶은 차량(최대 {COMPARE_MAX_MODELS}대)을 선택하고 '비교하기' 버튼을 눌러주세요.")
 
-    # --- 차량 선택 UI ---
-    try:
-        brand_list_for_compare = ["전체"] + get_all_brands()
-    except Exception as e:
-        st.error(f"브랜드 목록 로딩 실패: {e}")
-        brand_list_for_compare = ["전체"]
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("차량 1 (비교 대상)")
-        brand1 = st.selectbox("브랜드 선택", brand_list_for_compare, key="brand1", index=0)
-        if brand1 != "전체":
-            model_list1 = ["전체"] + get_models_by_brand(brand1)
-        else:
-            model_list1 = ["전체"]
-        model1 = st.selectbox("차종 선택", model_list1, key="model1", index=0)
-    with col2:
-        st.subheader("차량 2 (비교 대상)")
-        brand2 = st.selectbox("브랜드 선택", brand_list_for_compare, key="brand2", index=0)
-        if brand2 != "전체":
-            model_list2 = ["전체"] + get_models_by_brand(brand2)
-        else:
-            model_list2 = ["전체"]
-        model2 = st.selectbox("차종 선택", model_list2, key="model2", index=0)
+    # --- [수정] 차량 선택 UI (2대 -> 최대 COMPARE_MAX_MODELS대) ---
+    brand_list_for_compare = ["전체"] + list(catalog)
+
+    vehicle_count = st.slider("비교할 차량 수", min_value=2, max_value=COMPARE_MAX_MODELS, value=2, key="compare_count")
+    per_row = 3 if vehicle_count in (3, 5, 6) else 2
+    vehicle_icons = ["🚗", "🚙", "🚕", "🚓", "🚐", "🛻"]
+
+    selected_vehicles = []
+    for row_start in range(0, vehicle_count, per_row):
+        cols = st.columns(per_row)
+        for i, col in zip(range(row_start, min(row_start + per_row, vehicle_count)), cols):
+            with col:
+                st.subheader(f"차량 {i + 1} (비교 대상)")
+                brand_i = st.selectbox("브랜드 선택", brand_list_for_compare, key=f"brand{i + 1}", index=0)
+                model_list_i = models_of(brand_i)
+                model_i = st.selectbox("차종 선택", model_list_i, key=f"model{i + 1}", index=0)
+                selected_vehicles.append((brand_i, model_i))
 
     st.markdown("---")
 
+    def show_vehicle_result(icon, brand, model, stats, keywords_df):
+        st.markdown(f"#### {icon} **{brand} {model}**")
+        if stats and stats['total_recalls'] > 0:
+            metric_cols = st.columns(2)
+            metric_cols[0].metric("총 리콜 건수", f"{stats['total_recalls']} 건")
+            metric_cols[1].metric("평균 시정률", f"{stats['avg_correction_rate']} %")
+            st.markdown("**주요 리콜 키워드 (Top 10)**")
+            if not keywords_df.empty:
+                chart = alt.Chart(keywords_df).mark_bar().encode(
+                    x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
+                    y=alt.Y('keyword_count', title='키워드 빈도'),
+                    tooltip=[
+                        alt.Tooltip('keyword_text', title='키워드'),
+                        alt.Tooltip('keyword_count', title='빈도수'),
+                        alt.Tooltip('keyword_desc', title='설명')
+                    ]
+                ).properties(height=350).interactive()
+                st.altair_chart(chart, use_container_width=True)
+            else:
+                st.info("분석된 키워드 데이터가 없습니다.")
+        else:
+            st.warning("해당 차종의 리콜 데이터가 없습니다.")
+
     # --- 비교 결과 표시 ---
     if st.button("비교하기", use_container_width=True, key="compare_button"):
-        if (brand1 == "전체" or model1 == "전체") or (brand2 == "전체" or model2 == "전체"):
-            st.error("오류: 2대의 차량(브랜드와 차종)을 모두 정확히 선택해야 합니다.")
+        if any(b == "전체" or m == "전체" for b, m in selected_vehicles):
+            st.error(f"오류: {vehicle_count}대의 차량(브랜드와 차종)을 모두 정확히 선택해야 합니다.")
         else:
-            st.subheader(f"📊 {brand1} {model1}  vs  {brand2} {model2}  비교 결과")
-            
-            with st.spinner("두 차량의 리콜 데이터를 분석 중입니다..."):
-                stats1, keywords_df1 = get_recall_comparison(brand1, model1)
-                stats2, keywords_df2 = get_recall_comparison(brand2, model2)
+            st.subheader("📊 " + "  vs  ".join(f"{b} {m}" for b, m in selected_vehicles) + "  비교 결과")
 
-            res_col1, res_col2 = st.columns(2)
-            
-            with res_col1:
-                st.markdown(f"#### 🚗 **{brand1} {model1}**")
-                if stats1 and stats1['total_recalls'] > 0:
-                    metric_cols1 = st.columns(2)
-                    metric_cols1[0].metric("총 리콜 건수", f"{stats1['total_recalls']} 건")
-                    metric_cols1[1].metric("평균 시정률", f"{stats1['avg_correction_rate']} %")
-                    st.markdown("**주요 리콜 키워드 (Top 10)**")
-                    if not keywords_df1.empty:
-                        chart1 = alt.Chart(keywords_df1).mark_bar().encode(
-                            x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
-                            y=alt.Y('keyword_count', title='키워드 빈도'),
-                            tooltip=[
-                                alt.Tooltip('keyword_text', title='키워드'),
-                                alt.Tooltip('keyword_count', title='빈도수'),
-                                alt.Tooltip('keyword_desc', title='설명')
-                            ]
-                        ).properties(height=350).interactive()
-                        st.altair_chart(chart1, use_container_width=True)
-                    else:
-                        st.info("분석된 키워드 데이터가 없습니다.")
-                else:
-                    st.warning("해당 차종의 리콜 데이터가 없습니다.")
-            
-            with res_col2:
-                st.markdown(f"#### 🚙 **{brand2} {model2}**")
-                if stats2 and stats2['total_recalls'] > 0:
-                    metric_cols2 = st.columns(2)
-                    metric_cols2[0].metric("총 리콜 건수", f"{stats2['total_recalls']} 건")
-                    metric_cols2[1].metric("평균 시정률", f"{stats2['avg_correction_rate']} %")
-                    st.markdown("**주요 리콜 키워드 (Top 10)**")
-                    if not keywords_df2.empty:
-                        chart2 = alt.Chart(keywords_df2).mark_bar().encode(
-                            x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
-                            y=alt.Y('keyword_count', title='키워드 빈도'),
-                            tooltip=[
-                                alt.Tooltip('keyword_text', title='키워드'),
-                                alt.Tooltip('keyword_count', title='빈도수'),
-                                alt.Tooltip('keyword_desc', title='설명')
-                            ]
-                        ).properties(height=350).interactive()
-                        st.altair_chart(chart2, use_container_width=True)
-                    else:
-                        st.info("분석된 키워드 데이터가 없습니다.")
-                else:
-                    st.warning("해당 차종의 리콜 데이터가 없습니다.")
+            with st.spinner(f"{vehicle_count}대 차량의 리콜 데이터를 분석 중입니다..."):
+                # [수정] 차량 수와 관계없이 한 번의 조회로 모든 차량의 통계/키워드를 가져옵니다.
+                comparisons = compare_models(tuple(selected_vehicles))
+
+            if vehicle_count > 2:
+                summary_df = pd.DataFrame([
+                    {'차량': f"{b} {m}",
+                     '총 리콜 건수': stats['total_recalls'] if stats else 0,
+                     '평균 시정률 (%)': stats['avg_correction_rate'] if stats else 0}
+                    for (b, m), (stats, _) in zip(selected_vehicles, comparisons)
+                ])
+                st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+            for row_start in range(0, vehicle_count, per_row):
+                res_cols = st.columns(per_row)
+                for i, res_col in zip(range(row_start, min(row_start + per_row, vehicle_count)), res_cols):
+                    with res_col:
+                        stats_i, keywords_df_i = comparisons[i]
+                        show_vehicle_result(vehicle_icons[i], *selected_vehicles[i], stats_i, keywords_df_i)
+
+            # [신규] 차량별 최신 리콜 뉴스 (차량 수만큼의 검색을 차례로 부르지 않고 동시에 조회)
+            st.markdown("---")
+            st.markdown("#### 📰 차량별 최신 리콜 뉴스")
+            news_queries = [f"{b} {m} 리콜" for b, m in selected_vehicles]
+            news_by_query = get_naver_news_many(tuple(news_queries))
+            for row_start in range(0, vehicle_count, per_row):
+                news_cols = st.columns(per_row)
+                for i, news_col in zip(range(row_start, min(row_start + per_row, vehicle_count)), news_cols):
+                    with news_col:
+                        st.markdown(f"**{vehicle_icons[i]} {selected_vehicles[i][0]} {selected_vehicles[i][1]}**")
+                        show_news(news_by_query[news_queries[i]])
 
 
 # ==============================================================================
@@ -186,6 +204,21 @@ with tab_brand:
         else:
             st.warning("시정률 데이터를 찾을 수 없습니다.")
 
+    # --- [신규] 리콜 건수 상위 브랜드의 최신 리콜 뉴스 (브랜드별 검색을 동시에 조회) ---
+    # 탭은 화면을 갱신할 때마다 모두 실행되므로, 외부 API를 부르는 뉴스는 버튼을 누른 뒤에만 불러옵니다.
+    if not df_recall_rank.empty:
+        st.markdown("---")
+        st.subheader("📰 리콜 건수 상위 브랜드 최신 뉴스")
+        if st.session_state.get('brand_news_loaded') or st.button("최신 뉴스 불러오기", key="brand_news_button"):
+            st.session_state.brand_news_loaded = True
+            top_brands = df_recall_rank['브랜드'].head(5).tolist()
+            with st.spinner("브랜드별 최신 뉴스를 불러오는 중입니다..."):
+                news_by_query = get_naver_news_many(tuple(f"{brand} 리콜" for brand in top_brands))
+            for brand, news_col in zip(top_brands, st.columns(len(top_brands))):
+                with news_col:
+                    st.markdown(f"**{brand}**")
+                    show_news(news_by_query[f"{brand} 리콜"])
+
 
 # ==============================================================================
 # --- [ 탭 3: 모델 프로필 ] ---
@@ -196,24 +229,13 @@ with tab_model:
     
     # --- [★ 수정] 'st.sidebar' 컨텍스트 제거, 탭 내부로 이동 ---
     st.subheader("🚗 차량 선택")
-    try:
-        brand_list_profile = ["전체"] + get_all_brands()
-    except Exception as e:
-        st.error(f"브랜드 목록 로딩 실패: {e}")
-        brand_list_profile = ["전체"]
+    brand_list_profile = ["전체"] + list(catalog)
     
     selected_brand_profile = st.selectbox(
         "1. 브랜드 선택", brand_list_profile, key="profile_brand", index=0
     )
     
-    if selected_brand_profile != "전체":
-        try:
-            model_list_profile = ["전체"] + get_models_by_brand(selected_brand_profile)
-        except Exception as e:
-            st.error(f"차종 목록 로딩 실패: {e}")
-            model_list_profile = ["전체"]
-    else:
-        model_list_profile = ["전체"] 
+    model_list_profile = models_of(selected_brand_profile)
     
     selected_model_profile = st.selectbox(
         "2. 차종 선택", model_list_profile, key="profile_model", index=0
@@ -224,10 +246,19 @@ with tab_model:
     # --- 리포트 생성 (메인 화면) ---
     if selected_brand_profile != "전체" and selected_model_profile != "전체":
         st.subheader(f"🚗 {selected_brand_profile} {selected_model_profile} 리포트")
+        # [신규] 같은 차종을 보는 동안의 재실행(rerun)은 한 번으로 셉니다.
+        if st.session_state.get('profile_viewed') != (selected_brand_profile, selected_model_profile):
+            st.session_state.profile_viewed = (selected_brand_profile, selected_model_profile)
+            record_model_view(selected_brand_profile, selected_model_profile)
         
         with st.spinner(f"'{selected_model_profile}' 모델의 데이터를 분석 중입니다..."):
-            stats, keywords_df = get_recall_comparison(selected_brand_profile, selected_model_profile)
-            history_df, all_reasons_string = get_model_profile_data(selected_brand_profile, selected_model_profile)
+            # [수정] 통계와 리콜 이력은 서로 독립적인 조회이므로 동시에 가져옵니다. (대기 시간 = 둘 중 느린 쪽)
+            results = fetch_concurrently({
+                'comparison': lambda: get_recall_comparison(selected_brand_profile, selected_model_profile),
+                'profile': lambda: get_model_profile_data(selected_brand_profile, selected_model_profile),
+            }, defaults={'comparison': (None, pd.DataFrame()), 'profile': (pd.DataFrame(), "")})
+            stats, keywords_df = results['comparison']
+            history_df, all_reasons_string = results['profile']
 
         if stats is None or history_df.empty:
             st.warning("해당 모델의 리콜 데이터를 찾을 수 없습니다.")
@@ -243,17 +274,11 @@ with tab_model:
                 st.markdown("#### ☁️ 리콜 사유 워드 클라우드")
                 if all_reasons_string:
                     try:
-                        font_path = None
-                        if os.path.exists("c:/Windows/Fonts/malgun.ttf"):
-                            font_path = "c:/Windows/Fonts/malgun.ttf"
-                        wordcloud = WordCloud(
-                            font_path=font_path, width=800, height=400, 
-                            background_color='white'
-                        ).generate(all_reasons_string)
-                        fig, ax = plt.subplots()
-                        ax.imshow(wordcloud, interpolation='bilinear')
-                        ax.axis("off")
-                        st.pyplot(fig)
+                        # [수정] 매번 WordCloud + matplotlib figure를 새로 만들지 않고 캐시된 PNG를 표시
+                        wordcloud_png = get_wordcloud_png(
+                            selected_brand_profile, selected_model_profile, all_reasons_string
+                        )
+                        st.image(wordcloud_png, use_container_width=True)
                     except Exception as e:
                         st.error(f"워드 클라우드 생성 오류: {e}")
                         st.info("한글 폰트(malgun.ttf)를 찾을 수 없거나, wordcloud 라이브러리 문제입니다.")
@@ -303,6 +328,20 @@ with tab_model:
                 ]
 
             st.dataframe(filtered_history_df, use_container_width=True, height=400)
+            st.markdown("---")
+
+            # [신규] 차종 / 브랜드 최신 리콜 뉴스 (두 검색을 동시에 조회)
+            st.markdown("#### 📰 최신 리콜 뉴스")
+            model_query = f"{selected_brand_profile} {selected_model_profile} 리콜"
+            brand_query = f"{selected_brand_profile} 리콜"
+            news_by_query = get_naver_news_many((model_query, brand_query))
+            news_col1, news_col2 = st.columns(2)
+            with news_col1:
+                st.markdown(f"**{selected_brand_profile} {selected_model_profile}**")
+                show_news(news_by_query[model_query])
+            with news_col2:
+                st.markdown(f"**{selected_brand_profile} 전체**")
+                show_news(news_by_query[brand_query])
     else:
         # --- [★ 수정] 안내 문구 수정 ---
         st.info("☝️ 위에서 분석할 브랜드와 차종을 선택해 주세요.")
@@ -2,7 +2,7 @@
 import streamlit as st
 import re
 import time
-from backend.db_manager import create_connection
+from backend.db_manager import get_connection
 try:
     from Home import display_custom_header
 except ImportError:
@@ -34,39 +34,37 @@ def is_valid_password(password):
 
 # --- DB 함수 ---
 def check_user_exists(email):
-    conn = create_connection()
-    if conn is None: return True 
-    cursor = None
-    try:
-        cursor = conn.cursor()
-        query = "SELECT COUNT(*) FROM User WHERE user_email = %s"
-        cursor.execute(query, (email,))
-        result = cursor.fetchone()
-        return result and result[0] > 0
-    except Exception as e:
-        st.error(f"DB 오류 (중복 확인): {e}")
-        return True 
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+    with get_connection() as conn:
+        if conn is None: return True 
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            query = "SELECT COUNT(*) FROM User WHERE user_email = %s"
+            cursor.execute(query, (email,))
+            result = cursor.fetchone()
+            return result and result[0] > 0
+        except Exception as e:
+            st.error(f"DB 오류 (중복 확인): {e}")
+            return True 
+        finally:
+            if cursor: cursor.close()
 
 def create_user(email, hashed_password, username, phone):
-    conn = create_connection()
-    if conn is None: return False
-    cursor = None
-    try:
-        cursor = conn.cursor()
-        query = "INSERT INTO User (user_email, user_password, user_name, phone_number, join_date) VALUES (%s, %s, %s, %s, CURDATE())"
-        cursor.execute(query, (email, hashed_password, username, phone))
-        conn.commit()
-        return True
-    except Exception as e:
-        st.error(f"DB 오류 (사용자 생성): {e}")
-        conn.rollback()
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+    with get_connection() as conn:
+        if conn is None: return False
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            query = "INSERT INTO User (user_email, user_password, user_name, phone_number, join_date) VALUES (%s, %s, %s, %s, CURDATE())"
+            cursor.execute(query, (email, hashed_password, username, phone))
+            conn.commit()
+            return True
+        except Exception as e:
+            st.error(f"DB 오류 (사용자 생성): {e}")
+            conn.rollback()
+            return False
+        finally:
+            if cursor: cursor.close()
 
 # --- 회원가입 폼 ---
 with st.form(key="signup_form"):
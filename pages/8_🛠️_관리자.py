@@ -0,0 +1,128 @@
+# pages/8_🛠️_관리자.py
+# [신규] 숨김 관리자 페이지: 조회 지연 시간 / 캐시 / 커넥션 풀 / 느린 쿼리 현황 (backend/instrumentation.py)
+# secrets.toml의 [admin] password를 입력해야 볼 수 있습니다. (설정이 없으면 페이지를 열 수 없음)
+# 집계는 이 Streamlit 프로세스 기준입니다. (레플리카가 여러 개면 각자 따로 집계)
+import hmac
+
+import pandas as pd
+import streamlit as st
+
+from backend import db_manager, instrumentation, shared_cache
+from backend.data_version import get_data_version
+try:
+    from Home import display_custom_header
+except ImportError:
+    # (Home.py가 없는 경우를 대비한 예외 처리)
+    def display_custom_header():
+        pass
+
+st.set_page_config(page_title="관리자", page_icon="🛠️", layout="wide")
+st.title("🛠️ 관리자: 조회 성능 현황")
+
+display_custom_header()
+
+# --- 1. 관리자 확인 ---
+try:
+    admin_password = st.secrets.get('admin', {}).get('password')
+except Exception:
+    admin_password = None
+
+if not admin_password:
+    st.warning("관리자 페이지가 설정되지 않았습니다. `.streamlit/secrets.toml`에 `[admin] password`를 추가하세요.")
+    st.stop()
+
+if not st.session_state.get('admin_authenticated'):
+    password = st.text_input("관리자 비밀번호", type="password", key="admin_password")
+    if st.button("확인", key="admin_login"):
+        if hmac.compare_digest(password.encode('utf-8'), str(admin_password).encode('utf-8')):
+            st.session_state.admin_authenticated = True
+            st.rerun()
+        else:
+            st.error("비밀번호가 올바르지 않습니다.")
+    st.stop()
+
+# --- 2. 요약 ---
+snapshot = instrumentation.metrics.snapshot()
+config = instrumentation.get_instrumentation_config()
+if not config['enabled']:
+    st.info("계측이 꺼져 있습니다. (`[instrumentation] enabled = false`)")
+
+col1, col2, col3 = st.columns([0.4, 0.4, 0.2])
+col1.write(f"**집계 시작:** {snapshot['started_at']:%Y-%m-%d %H:%M:%S}")
+col2.write(f"**데이터 버전:** `{get_data_version()}`")
+with col3:
+    if st.button("집계 초기화", use_container_width=True, key="admin_reset"):
+        instrumentation.metrics.reset()
+        shared_cache.reset_shared_cache_stats()
+        st.rerun()
+
+# 지연 시간 표 (ms 소수점 정리, 캐시 적중률은 %)
+def format_latency(df):
+    if df.empty:
+        return df
+    df = df.copy()
+    for column in ['avg_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'total_ms']:
+        df[column] = df[column].round(1)
+    df['cache_hit_rate'] = (df['cache_hit_rate'] * 100).round(1)
+    return df.rename(columns={
+        'calls': '호출', 'errors': '오류', 'rows': '행 수', 'avg_ms': '평균(ms)', 'p50_ms': 'p50(ms)',
+        'p95_ms': 'p95(ms)', 'p99_ms': 'p99(ms)', 'max_ms': '최대(ms)', 'total_ms': '누적(ms)',
+        'cache_hit_rate': '캐시 적중률(%)',
+    })
+
+tab_functions, tab_sql, tab_infra, tab_slow = st.tabs(["⏱️ 조회 함수", "🗄️ SQL", "🔌 커넥션 / 캐시", "🐢 느린 쿼리 / 오류"])
+
+with tab_functions:
+    st.caption("조회 함수 호출 단위 (캐시 적중 포함). p50/p95/p99는 히스토그램 구간 상한으로 추정한 값입니다.")
+    functions_df = format_latency(snapshot['functions'])
+    if functions_df.empty:
+        st.info("아직 기록된 호출이 없습니다.")
+    else:
+        st.dataframe(functions_df, use_container_width=True)
+
+with tab_sql:
+    st.caption("실제로 DB에서 실행된 SQL (실행 + 결과 가져오기 시간). 이름은 '호출한 함수 | SQL 앞부분'입니다.")
+    sql_df = format_latency(snapshot['sql'])
+    if sql_df.empty:
+        st.info("아직 실행된 SQL이 없습니다.")
+    else:
+        st.dataframe(sql_df.drop(columns=['캐시 적중률(%)']), use_container_width=True)
+
+with tab_infra:
+    st.markdown("#### 커넥션 대기 시간")
+    acquire = snapshot['acquire']
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("커넥션 요청", f"{acquire['calls']:,}")
+    metric_cols[1].metric("평균 대기", f"{acquire['avg_ms']:.2f} ms")
+    metric_cols[2].metric("p99 대기", f"{acquire['p99_ms']:.0f} ms")
+    metric_cols[3].metric("연결 실패", f"{acquire['errors']:,}")
+    try:
+        st.markdown("#### 커넥션 풀")
+        st.dataframe(pd.DataFrame([db_manager.get_pool_stats()]), use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"커넥션 풀 정보를 읽을 수 없습니다: {e}")
+
+    st.markdown("#### 공유 캐시")
+    cache_stats = shared_cache.get_shared_cache_stats()
+    if cache_stats['backend'] is None:
+        st.info("공유 캐시를 사용하지 않습니다. (`[shared_cache]` 설정 없음)")
+    else:
+        st.write(f"**저장소:** {cache_stats['backend']} / **적중률:** {cache_stats['hit_rate'] * 100:.1f}% "
+                 f"(적중 {cache_stats['hits']:,} / 실패 {cache_stats['misses']:,} / 오류 {cache_stats['errors']:,})")
+        if cache_stats['functions']:
+            st.dataframe(pd.DataFrame.from_dict(cache_stats['functions'], orient='index'), use_container_width=True)
+
+with tab_slow:
+    st.markdown(f"#### 느린 쿼리 (최근 {instrumentation.RECENT_SLOW_QUERIES}건, {config['slow_query_ms']} ms 이상)")
+    if config['slow_log_path']:
+        st.caption(f"전체 기록: `{config['slow_log_path']}` (JSON 한 줄에 한 건)")
+    if snapshot['slow_queries']:
+        st.dataframe(pd.DataFrame(snapshot['slow_queries']), use_container_width=True, hide_index=True)
+    else:
+        st.info("기준 시간을 넘긴 쿼리가 없습니다.")
+
+    st.markdown("#### 최근 오류")
+    if snapshot['recent_errors']:
+        st.dataframe(pd.DataFrame(snapshot['recent_errors']), use_container_width=True, hide_index=True)
+    else:
+        st.info("기록된 오류가 없습니다.")
@@ -0,0 +1,40 @@
+# 파일 이름: build_reason_index.py
+# (경로: sql/build_reason_index.py)
+# [신규] 임베디드 엔진의 리콜 사유 n-gram 색인을 미리 만들어 파일로 저장합니다.
+#        secrets.toml의 [query_engine] reason_index_path에 지정하면 앱 시작 시 색인을 새로 만들지 않고 읽습니다.
+#        (데이터를 다시 적재한 뒤에는 다시 실행해야 합니다. 행 구성이 다르면 앱이 파일을 무시하고 새로 만듭니다)
+# 실행: python sql/build_reason_index.py                                   (secrets.toml의 DB 사용)
+#       python sql/build_reason_index.py --sqlite data/lemon_scanner.db --output data/reason_index.npz
+
+import os
+import sys
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from backend import db_manager, embedded_engine
+
+
+def build_reason_index(output_path):
+    snapshot = embedded_engine.load_snapshot_from_db()
+    if snapshot is None:
+        print("[치명적 오류] 리콜 데이터를 읽을 수 없습니다. (DB 접속 설정 확인)")
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    snapshot.reason_index.save(output_path)
+    size_mb = os.path.getsize(output_path) / 2**20
+    print(f"[완료] 리콜 {snapshot.size:,}건의 사유 색인을 저장했습니다: {output_path} ({size_mb:.1f}MB)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="리콜 사유 n-gram 색인 파일을 만듭니다.")
+    parser.add_argument('--output', default=os.path.join(ROOT_DIR, 'data', 'reason_index.npz'),
+                        help="저장할 색인 파일 경로 (기본값: data/reason_index.npz)")
+    parser.add_argument('--sqlite', metavar='DB_PATH', help="MySQL 대신 SQLite 저장소 파일에서 읽습니다.")
+    args = parser.parse_args()
+    if args.sqlite:
+        db_manager.configure_storage('sqlite', path=args.sqlite, read_only=True)
+    sys.exit(0 if build_reason_index(args.output) else 1)
@@ -21,7 +21,8 @@ CREATE TABLE IF NOT EXISTS Model (
     model_name VARCHAR(100) NOT NULL COMMENT '차종명 (예: 소나타, K5)',
     
     FOREIGN KEY (brand_id) REFERENCES Brand(brand_id),
-    UNIQUE KEY uk_brand_model (brand_id, model_name)
+    UNIQUE KEY uk_brand_model (brand_id, model_name),
+    INDEX idx_model_name (model_name)
 ) ENGINE=InnoDB COMMENT='차종 마스터 테이블';
 
 
@@ -43,6 +44,7 @@ CREATE TABLE IF NOT EXISTS Keyword (
 -- ---------------------------------------------------
 CREATE TABLE IF NOT EXISTS Recall (
     recall_id INT AUTO_INCREMENT PRIMARY KEY COMMENT '리콜ID (기본키)',
+    recall_key CHAR(64) NOT NULL COMMENT '리콜 자연키 (브랜드/차종/리콜개시일/생산기간/리콜사유 SHA-256)',
     model_id INT NOT NULL COMMENT '차종ID (외래키)',
     
     reason TEXT COMMENT '리콜 사유 (원문)',
@@ -53,7 +55,11 @@ CREATE TABLE IF NOT EXISTS Recall (
     correction_count INT COMMENT '시정 대수',
     correction_rate FLOAT COMMENT '시정률',
     
-    FOREIGN KEY (model_id) REFERENCES Model(model_id)
+    FOREIGN KEY (model_id) REFERENCES Model(model_id),
+    UNIQUE KEY uk_recall_key (recall_key), -- 재적재 시 중복 방지 (sql/migrations/001 참고)
+    INDEX idx_recall_model_date (model_id, recall_date), -- 상세 검색용 (sql/migrations/002 참고)
+    INDEX idx_recall_date (recall_date),
+    FULLTEXT INDEX ft_recall_reason (reason) WITH PARSER ngram -- 리콜사유 자유 검색용 (sql/migrations/005 참고)
 ) ENGINE=InnoDB COMMENT='리콜 상세 내역 (원본 데이터)';
 
 
@@ -65,10 +71,81 @@ CREATE TABLE IF NOT EXISTS Recall_Keyword_Junction (
     keyword_id INT NOT NULL COMMENT '키워드ID (외래키)',
     
     PRIMARY KEY (recall_id, keyword_id), -- 복합 기본키
+    INDEX idx_rkj_keyword_recall (keyword_id, recall_id), -- 키워드 필터용
     FOREIGN KEY (recall_id) REFERENCES Recall(recall_id),
     FOREIGN KEY (keyword_id) REFERENCES Keyword(keyword_id)
 ) ENGINE=InnoDB COMMENT='리콜과 키워드 N:M 연결 테이블';
 
+
+-- ---------------------------------------------------
+-- 6. Summary_Stats (대시보드 요약 통계, 단일 행)
+-- ---------------------------------------------------
+-- 적재 스크립트가 적재 후 다시 계산합니다. (sql/migrations/003 참고)
+CREATE TABLE IF NOT EXISTS Summary_Stats (
+    stat_id TINYINT PRIMARY KEY COMMENT '항상 1 (단일 행)',
+    total_recalls INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    total_brands INT NOT NULL DEFAULT 0 COMMENT '총 브랜드 수',
+    total_models INT NOT NULL DEFAULT 0 COMMENT '총 차종 수',
+    top_brand_name VARCHAR(100) COMMENT '최다 리콜 브랜드',
+    top_brand_recalls INT NOT NULL DEFAULT 0 COMMENT '최다 리콜 브랜드의 리콜 건수',
+    min_recall_date DATE COMMENT '데이터 기준 기간 (시작)',
+    max_recall_date DATE COMMENT '데이터 기준 기간 (끝)',
+    refreshed_at DATETIME NOT NULL COMMENT '마지막 계산 시각'
+) ENGINE=InnoDB COMMENT='대시보드 요약 통계 (적재 시 갱신)';
+
+
+-- ---------------------------------------------------
+-- 7. 분석 리포트 집계 테이블 (브랜드별 / 차종별 / 차종-키워드별)
+-- ---------------------------------------------------
+-- 적재 스크립트가 적재 트랜잭션 안에서 다시 계산합니다. (sql/migrations/004 참고)
+CREATE TABLE IF NOT EXISTS Brand_Stats (
+    brand_id INT PRIMARY KEY COMMENT '브랜드ID',
+    brand_name VARCHAR(100) NOT NULL COMMENT '브랜드명',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    avg_correction_rate DOUBLE COMMENT '평균 시정률',
+    INDEX idx_brand_stats_count (recall_count)
+) ENGINE=InnoDB COMMENT='브랜드별 리콜 집계 (적재 시 갱신)';
+
+CREATE TABLE IF NOT EXISTS Model_Stats (
+    model_id INT PRIMARY KEY COMMENT '차종ID',
+    brand_name VARCHAR(100) NOT NULL COMMENT '브랜드명',
+    model_name VARCHAR(100) NOT NULL COMMENT '차종명',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    avg_correction_rate DOUBLE COMMENT '평균 시정률',
+    UNIQUE KEY uk_model_stats_name (brand_name, model_name)
+) ENGINE=InnoDB COMMENT='차종별 리콜 집계 (적재 시 갱신)';
+
+CREATE TABLE IF NOT EXISTS Model_Keyword_Stats (
+    model_id INT NOT NULL COMMENT '차종ID',
+    keyword_id INT NOT NULL COMMENT '키워드ID',
+    keyword_count INT NOT NULL DEFAULT 0 COMMENT '해당 차종 리콜 중 키워드가 나온 건수',
+    PRIMARY KEY (model_id, keyword_id),
+    INDEX idx_model_keyword_count (model_id, keyword_count)
+) ENGINE=InnoDB COMMENT='차종별 키워드 빈도 집계 (적재 시 갱신)';
+
+
+-- ---------------------------------------------------
+-- 8. Data_Version (데이터 버전 토큰, 단일 행)
+-- ---------------------------------------------------
+-- 적재 스크립트가 적재 트랜잭션 안에서 새 토큰을 기록합니다. 앱은 이 토큰으로 조회 캐시를 무효화합니다. (sql/migrations/006 참고)
+CREATE TABLE IF NOT EXISTS Data_Version (
+    version_id TINYINT PRIMARY KEY COMMENT '항상 1 (단일 행)',
+    version CHAR(32) NOT NULL COMMENT '데이터 버전 토큰 (적재마다 새로 생성)',
+    loaded_at DATETIME NOT NULL COMMENT '마지막 적재 시각'
+) ENGINE=InnoDB COMMENT='데이터 버전 (적재 시 갱신)';
+
+
+-- ---------------------------------------------------
+-- 9. schema_migrations (적용된 마이그레이션 버전 기록)
+-- ---------------------------------------------------
+-- 이 스크립트로 새로 만든 DB는 아래 버전까지 이미 반영된 상태입니다. (sql/migrate.py 참고)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(20) PRIMARY KEY COMMENT '마이그레이션 버전 (파일명 앞 번호)',
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '적용 시각'
+) ENGINE=InnoDB COMMENT='적용된 스키마 마이그레이션 목록';
+
+INSERT IGNORE INTO schema_migrations (version) VALUES ('001'), ('002'), ('003'), ('004'), ('005'), ('006');
+
 ALTER TABLE Keyword
 ADD COLUMN keyword_desc TEXT COMMENT '키워드 상세 설명' AFTER keyword_text;
 
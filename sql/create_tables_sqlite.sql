@@ -0,0 +1,99 @@
+-- ---------------------------------------------------
+-- Lemon Scanner 임베디드(SQLite) DB 테이블 생성 스크립트
+-- ---------------------------------------------------
+-- create_tables.sql(MySQL)과 같은 테이블/인덱스 구성입니다.
+-- `python sql/load_data_from_excel.py --sqlite data/lemon_scanner.db` 실행 시 자동으로 적용되며,
+-- 앱은 secrets.toml의 [storage] backend = "sqlite" 설정으로 이 파일을 읽습니다.
+-- (날짜 컬럼은 DATE로 선언해야 앱에서 datetime.date로 읽힙니다)
+
+-- 1. Brand (브랜드)
+CREATE TABLE IF NOT EXISTS Brand (
+    brand_id INTEGER PRIMARY KEY,
+    brand_name TEXT NOT NULL UNIQUE
+);
+
+-- 2. Model (차종)
+CREATE TABLE IF NOT EXISTS Model (
+    model_id INTEGER PRIMARY KEY,
+    brand_id INTEGER NOT NULL REFERENCES Brand(brand_id),
+    model_name TEXT NOT NULL,
+    UNIQUE (brand_id, model_name)
+);
+CREATE INDEX IF NOT EXISTS idx_model_name ON Model (model_name);
+
+-- 3. Keyword (키워드)
+CREATE TABLE IF NOT EXISTS Keyword (
+    keyword_id INTEGER PRIMARY KEY,
+    keyword_text TEXT NOT NULL UNIQUE,
+    keyword_desc TEXT
+);
+
+-- 4. Recall (리콜 내역)
+CREATE TABLE IF NOT EXISTS Recall (
+    recall_id INTEGER PRIMARY KEY,
+    recall_key TEXT NOT NULL UNIQUE,
+    model_id INTEGER NOT NULL REFERENCES Model(model_id),
+    reason TEXT,
+    prod_from DATE,
+    prod_to DATE,
+    recall_date DATE,
+    recall_count INTEGER,
+    correction_count INTEGER,
+    correction_rate REAL
+);
+CREATE INDEX IF NOT EXISTS idx_recall_model_date ON Recall (model_id, recall_date);
+CREATE INDEX IF NOT EXISTS idx_recall_date ON Recall (recall_date);
+
+-- 5. Recall_Keyword_Junction (N:M 연결)
+CREATE TABLE IF NOT EXISTS Recall_Keyword_Junction (
+    recall_id INTEGER NOT NULL REFERENCES Recall(recall_id),
+    keyword_id INTEGER NOT NULL REFERENCES Keyword(keyword_id),
+    PRIMARY KEY (recall_id, keyword_id)
+);
+CREATE INDEX IF NOT EXISTS idx_rkj_keyword_recall ON Recall_Keyword_Junction (keyword_id, recall_id);
+
+-- 6. Summary_Stats (대시보드 요약 통계, 단일 행)
+CREATE TABLE IF NOT EXISTS Summary_Stats (
+    stat_id INTEGER PRIMARY KEY,
+    total_recalls INTEGER NOT NULL DEFAULT 0,
+    total_brands INTEGER NOT NULL DEFAULT 0,
+    total_models INTEGER NOT NULL DEFAULT 0,
+    top_brand_name TEXT,
+    top_brand_recalls INTEGER NOT NULL DEFAULT 0,
+    min_recall_date DATE,
+    max_recall_date DATE,
+    refreshed_at DATETIME NOT NULL
+);
+
+-- 7. 분석 리포트 집계 테이블
+CREATE TABLE IF NOT EXISTS Brand_Stats (
+    brand_id INTEGER PRIMARY KEY,
+    brand_name TEXT NOT NULL,
+    recall_count INTEGER NOT NULL DEFAULT 0,
+    avg_correction_rate REAL
+);
+CREATE INDEX IF NOT EXISTS idx_brand_stats_count ON Brand_Stats (recall_count);
+
+CREATE TABLE IF NOT EXISTS Model_Stats (
+    model_id INTEGER PRIMARY KEY,
+    brand_name TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    recall_count INTEGER NOT NULL DEFAULT 0,
+    avg_correction_rate REAL,
+    UNIQUE (brand_name, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS Model_Keyword_Stats (
+    model_id INTEGER NOT NULL,
+    keyword_id INTEGER NOT NULL,
+    keyword_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (model_id, keyword_id)
+);
+CREATE INDEX IF NOT EXISTS idx_model_keyword_count ON Model_Keyword_Stats (model_id, keyword_count);
+
+-- 8. Data_Version (데이터 버전 토큰, 단일 행)
+CREATE TABLE IF NOT EXISTS Data_Version (
+    version_id INTEGER PRIMARY KEY,
+    version TEXT NOT NULL,
+    loaded_at DATETIME NOT NULL
+);
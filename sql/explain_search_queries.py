@@ -0,0 +1,98 @@
+# 파일 이름: explain_search_queries.py
+# (경로: sql/explain_search_queries.py)
+# [신규] 상세 검색(search_recalls)의 모든 필터 조합에 대해 EXPLAIN을 실행하여
+#        전체 테이블 스캔(type=ALL)이 발생하는 조합이 있는지 점검합니다.
+# 실행: python sql/explain_search_queries.py                (전체 스캔이 있으면 종료 코드 1)
+#       python sql/explain_search_queries.py --text 에어백   (자유 검색어를 포함한 조합도 점검)
+
+import os
+import sys
+import argparse
+import itertools
+import mysql.connector
+from mysql.connector import Error
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from load_data_from_excel import DB_CONFIG
+from backend.search_queries import build_search_query
+
+FILTER_NAMES = ['브랜드', '차종', '연도', '키워드']
+
+
+def pick_sample_filters(cursor):
+    """실제 데이터가 있는 (브랜드, 차종, 연도, 키워드) 예시 값을 DB에서 고릅니다."""
+    cursor.execute("""
+    SELECT b.brand_name, m.model_name, YEAR(r.recall_date) AS recall_year
+    FROM Recall r
+    JOIN Model m ON r.model_id = m.model_id
+    JOIN Brand b ON m.brand_id = b.brand_id
+    WHERE r.recall_date IS NOT NULL
+    ORDER BY r.recall_date DESC LIMIT 1
+    """)
+    sample = cursor.fetchone()
+    cursor.execute("""
+    SELECT k.keyword_text
+    FROM Keyword k JOIN Recall_Keyword_Junction j ON k.keyword_id = j.keyword_id
+    GROUP BY k.keyword_id, k.keyword_text ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    keyword = cursor.fetchone()
+    if not sample or not keyword:
+        return None
+    return [sample['brand_name'], sample['model_name'], sample['recall_year'], keyword['keyword_text']]
+
+
+def explain_all_combinations(text=None):
+    conn = None
+    cursor = None
+    full_scan_found = False
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor(dictionary=True)
+
+        samples = pick_sample_filters(cursor)
+        if samples is None:
+            print("[오류] 점검에 사용할 데이터가 없습니다. 먼저 load_data_from_excel.py로 데이터를 적재하세요.")
+            return False
+        print(f"예시 필터 값: {dict(zip(FILTER_NAMES, samples))}\n")
+
+        texts = [None, text] if text else [None]
+        for search_text, enabled in itertools.product(texts, itertools.product([False, True], repeat=len(FILTER_NAMES))):
+            args = [value if on else "전체" for value, on in zip(samples, enabled)]
+            label = "+".join(name for name, on in zip(FILTER_NAMES, enabled) if on) or "필터 없음"
+            if search_text:
+                label += f" (검색어: {search_text})"
+
+            query, params = build_search_query(*args, text=search_text)
+            cursor.execute("EXPLAIN " + query.rstrip().rstrip(';'), params)
+            plan = cursor.fetchall()
+
+            scans = [row for row in plan if row.get('type') == 'ALL']
+            status = "FULL SCAN" if scans else "OK"
+            full_scan_found = full_scan_found or bool(scans)
+            print(f"[{status:9}] {label}")
+            for row in plan:
+                print(f"    {row.get('table')!s:6} type={row.get('type')!s:7} key={row.get('key')!s:24} "
+                      f"rows={row.get('rows')!s:>7} extra={row.get('Extra') or ''}")
+    except Error as e:
+        print(f"\n[치명적 오류] EXPLAIN 실행 실패: {e}")
+        return False
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+    if full_scan_found:
+        print("\n[경고] 전체 테이블 스캔이 발생하는 필터 조합이 있습니다. (sql/migrations 인덱스 적용 여부 확인)")
+    else:
+        print("\n[완료] 모든 필터 조합이 인덱스를 사용합니다.")
+    return not full_scan_found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상세 검색 쿼리의 실행 계획(EXPLAIN)을 점검합니다.")
+    parser.add_argument('--text', help="자유 검색어(리콜사유 전문 검색)를 포함한 조합도 함께 점검합니다.")
+    args = parser.parse_args()
+    sys.exit(0 if explain_all_combinations(args.text) else 1)
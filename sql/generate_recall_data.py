@@ -0,0 +1,219 @@
+# 파일 이름: generate_recall_data.py
+# (경로: sql/generate_recall_data.py)
+# [신규] 부하 테스트용 합성 리콜 데이터 생성기
+#        한국교통안전공단 원본 CSV(data/한국교통안전공단_자동차 리콜대수 및 시정률_20221231.csv, 약 9.8천 건)에서
+#        항목별 분포를 학습한 뒤, 같은 컬럼의 CSV를 원하는 건수만큼 만듭니다.
+#  - 제작자/차명: (제작자, 차명) 조합의 출현 빈도
+#  - 리콜사유: 단어 수 분포와 단어 빈도, 키워드(KEYWORDS_DATA)별 포함 비율 (적재 시 키워드 태깅 결과가 원본과 비슷하도록)
+#  - 생산기간/리콜개시일: 리콜개시일, 생산 종료 후 리콜까지의 기간(일), 생산 기간(일), 날짜 누락 비율
+#    (리콜개시일을 먼저 뽑고 생산기간은 거꾸로 계산하므로 리콜개시일의 연도 분포가 원본과 같습니다)
+#  - 리콜대수 / 시정률: 원본 값의 분포와 시정률 누락 비율 (시정대수는 리콜대수 x 시정률, 누락이면 0)
+# 같은 시드로 만들면 항상 같은 파일이 나오며(건수가 달라도 앞부분은 같음), CHUNK_SIZE건씩 만들어 바로 쓰므로
+# 건수와 관계없이 사용하는 메모리가 일정합니다. 기본 인코딩(utf-8-sig)은 Excel에서 바로 열 수 있습니다.
+# 실행: python sql/generate_recall_data.py --rows 1000000 --output data/synthetic_recalls_1m.csv
+#       python sql/generate_recall_data.py --rows 100000 --seed 7 --encoding cp949
+# 적재: python sql/load_data_from_excel.py --source data/synthetic_recalls_1m.csv --sqlite data/lemon_synthetic.db
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from backend.keyword_tagger import KeywordTagger
+from load_data_from_excel import KEYWORDS_DATA
+
+SOURCE_CSV_PATH = os.path.join(ROOT_DIR, 'data', '한국교통안전공단_자동차 리콜대수 및 시정률_20221231.csv')
+OUTPUT_COLUMNS = ['제작자', '차명', '생산기간(부터)', '생산기간(까지)', '리콜개시일',
+                  '리콜대수', '리콜사유', '시정대수', '시정율(퍼센트)']
+CHUNK_SIZE = 10000 # 한 번에 만들어 쓰는 행 수 (바꾸면 같은 시드라도 다른 파일이 나옵니다)
+
+
+def read_source_csv(path):
+    """원본 CSV를 읽습니다. (공단 배포 파일은 cp949, 다시 저장한 파일은 utf-8)"""
+    try:
+        return pd.read_csv(path, encoding='utf-8-sig')
+    except UnicodeDecodeError:
+        return pd.read_csv(path, encoding='cp949')
+
+
+def _cdf(counts):
+    """출현 횟수 배열을 누적 분포로 바꿉니다. (np.searchsorted로 표본 추출)"""
+    cdf = np.cumsum(np.asarray(counts, dtype=np.float64))
+    return cdf / cdf[-1]
+
+
+def _sample(rng, cdf, size):
+    return np.minimum(np.searchsorted(cdf, rng.random(size), side='right'), len(cdf) - 1)
+
+
+def _to_days(series):
+    """날짜 컬럼을 1970-01-01 기준 일수(float, 누락은 NaN)로 변환합니다."""
+    dates = pd.to_datetime(series.astype(str).str.replace(r'[^\d]', '', regex=True), format='%Y%m%d', errors='coerce')
+    return (dates - pd.Timestamp('1970-01-01')).dt.days.astype('float64').to_numpy()
+
+
+class RecallProfile:
+    """원본 리콜 데이터에서 학습한 항목별 분포. generate()로 같은 분포의 행을 만듭니다."""
+
+    def __init__(self, df, keywords):
+        df = df.rename(columns=lambda c: c.strip())
+        if '시정률(퍼센트)' in df.columns:
+            df = df.rename(columns={'시정률(퍼센트)': '시정율(퍼센트)'})
+        df = df.dropna(subset=['제작자', '차명', '리콜사유'])
+        self.source_rows = len(df)
+
+        # 1) (제작자, 차명) 조합 빈도
+        pairs = df.groupby(['제작자', '차명'], sort=True).size()
+        self.pairs = np.array([f"{brand}\x1f{model}" for brand, model in pairs.index], dtype=object)
+        self.pair_cdf = _cdf(pairs.to_numpy())
+
+        # 2) 리콜사유: 단어 수, 키워드별 포함 비율, 키워드가 없는 단어 / 키워드별로 그 키워드 하나만 포함한 단어의 빈도
+        tagger = KeywordTagger(keywords)
+        self.keywords = tagger.keywords
+        reasons = df['리콜사유'].astype(str).tolist()
+        tokens = [reason.split() for reason in reasons]
+        self.token_counts = np.array([max(len(t), 1) for t in tokens], dtype=np.int64)
+        masks = tagger.bitmasks(reasons)
+        self.keyword_rates = np.array([sum(m >> i & 1 for m in masks) / len(masks)
+                                       for i in range(len(self.keywords))], dtype=np.float64)
+
+        filler = {}
+        keyword_tokens = [{} for _ in self.keywords]
+        for words in tokens:
+            for word in words:
+                found = tagger.tag(word)
+                if not found:
+                    filler[word] = filler.get(word, 0) + 1
+                elif len(found) == 1:
+                    bucket = keyword_tokens[tagger.keywords.index(found[0])]
+                    bucket[word] = bucket.get(word, 0) + 1
+        self.filler_tokens = np.array(list(filler), dtype=object)
+        self.filler_cdf = _cdf(list(filler.values()))
+        # 단독으로 나온 적이 없는 키워드(다른 키워드와 붙어서만 나옴)는 키워드 자체를 단어로 사용합니다.
+        self.keyword_tokens = [np.array(list(bucket) or [keyword], dtype=object) for bucket, keyword
+                               in zip(keyword_tokens, self.keywords)]
+        self.keyword_cdfs = [_cdf(list(bucket.values()) or [1]) for bucket in keyword_tokens]
+
+        # 3) 날짜: 리콜개시일, 생산 종료 -> 리콜 개시까지의 기간, 생산 기간, 항목별 누락 비율
+        prod_from, prod_to, recall_date = (_to_days(df[col]) for col in ['생산기간(부터)', '생산기간(까지)', '리콜개시일'])
+        self.recall_days = recall_date[~np.isnan(recall_date)]
+        both = ~np.isnan(prod_from) & ~np.isnan(prod_to)
+        self.prod_spans = (prod_to - prod_from)[both]
+        both = ~np.isnan(prod_to) & ~np.isnan(recall_date)
+        self.recall_lags = (recall_date - prod_to)[both]
+        self.missing_rates = np.array([np.isnan(v).mean() for v in (prod_from, prod_to, recall_date)])
+
+        # 4) 리콜대수 / 시정률
+        self.recall_counts = pd.to_numeric(df['리콜대수'], errors='coerce').fillna(0).astype(np.int64).to_numpy()
+        rates = pd.to_numeric(df['시정율(퍼센트)'], errors='coerce').to_numpy(dtype=np.float64)
+        self.correction_rates = rates[~np.isnan(rates)]
+        # 시정률이 빈 행은 아직 시정 실적이 없는 리콜입니다. (시정대수 0)
+        self.rate_missing_rate = np.isnan(rates).mean()
+
+    @classmethod
+    def from_csv(cls, path=SOURCE_CSV_PATH, keywords=None):
+        return cls(read_source_csv(path), keywords or [k[0] for k in KEYWORDS_DATA])
+
+    def _reasons(self, rng, size):
+        lengths = self.token_counts[rng.integers(len(self.token_counts), size=size)]
+        hits = rng.random((size, len(self.keywords))) < self.keyword_rates
+        hit_counts = hits.sum(axis=1)
+        filler_counts = np.maximum(lengths - hit_counts, (hit_counts == 0).astype(np.int64))
+        filler = self.filler_tokens[_sample(rng, self.filler_cdf, int(filler_counts.sum()))].tolist()
+
+        # 키워드 단어는 키워드별로 한 번에 뽑아 두고, 행마다 무작위 위치에 끼워 넣습니다.
+        chosen = {}
+        for keyword_idx in range(len(self.keywords)):
+            rows = np.flatnonzero(hits[:, keyword_idx])
+            if len(rows):
+                words = self.keyword_tokens[keyword_idx][_sample(rng, self.keyword_cdfs[keyword_idx], len(rows))]
+                for row, word in zip(rows.tolist(), words.tolist()):
+                    chosen.setdefault(row, []).append(word)
+        positions = rng.random(int(hit_counts.sum())).tolist()
+
+        reasons = []
+        start = 0
+        position_idx = 0
+        for row, count in enumerate(filler_counts.tolist()):
+            words = filler[start:start + count]
+            start += count
+            for word in chosen.get(row, ()):
+                words.insert(int(positions[position_idx] * (len(words) + 1)), word)
+                position_idx += 1
+            reasons.append(" ".join(words))
+        return reasons
+
+    def _dates(self, rng, size):
+        recall_date = self.recall_days[rng.integers(len(self.recall_days), size=size)]
+        prod_to = recall_date - self.recall_lags[rng.integers(len(self.recall_lags), size=size)]
+        prod_from = prod_to - self.prod_spans[rng.integers(len(self.prod_spans), size=size)]
+        columns = []
+        for days, missing_rate in zip((prod_from, prod_to, recall_date), self.missing_rates):
+            text = days.astype('int64').astype('datetime64[D]').astype(str).astype(object)
+            text[rng.random(size) < missing_rate] = None
+            columns.append(text)
+        return columns
+
+    def generate(self, rows, seed=0, chunk_size=CHUNK_SIZE):
+        """rows건을 chunk_size건씩 DataFrame(OUTPUT_COLUMNS)으로 만들어 차례로 반환하는 제너레이터입니다."""
+        rng = np.random.default_rng(seed)
+        remaining = rows
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            remaining -= size
+            brand_models = np.char.split(self.pairs[_sample(rng, self.pair_cdf, size)].astype(str), '\x1f')
+            prod_from, prod_to, recall_date = self._dates(rng, size)
+            counts = self.recall_counts[rng.integers(len(self.recall_counts), size=size)]
+            rates = self.correction_rates[rng.integers(len(self.correction_rates), size=size)]
+            rates[rng.random(size) < self.rate_missing_rate] = np.nan
+            yield pd.DataFrame({
+                '제작자': [pair[0] for pair in brand_models],
+                '차명': [pair[1] for pair in brand_models],
+                '생산기간(부터)': prod_from,
+                '생산기간(까지)': prod_to,
+                '리콜개시일': recall_date,
+                '리콜대수': counts,
+                '리콜사유': self._reasons(rng, size),
+                '시정대수': np.rint(np.nan_to_num(counts * rates / 100)).astype(np.int64),
+                '시정율(퍼센트)': np.round(rates, 2),
+            }, columns=OUTPUT_COLUMNS)
+
+
+def write_synthetic_csv(profile, output_path, rows, seed=0, encoding='utf-8-sig'):
+    """합성 데이터를 CSV 파일로 씁니다. (청크 단위로 바로 쓰므로 건수와 관계없이 메모리 사용량이 일정)"""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    written = 0
+    with open(output_path, 'w', encoding=encoding, newline='') as f:
+        for chunk_no, chunk in enumerate(profile.generate(rows, seed)):
+            chunk.to_csv(f, header=(chunk_no == 0), index=False)
+            written += len(chunk)
+            if written % (CHUNK_SIZE * 50) == 0:
+                print(f" - {written:,}/{rows:,}건")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 리콜 CSV의 분포를 따르는 합성 리콜 데이터(CSV)를 만듭니다.")
+    parser.add_argument('--rows', type=int, required=True, help="만들 리콜 건수")
+    parser.add_argument('--output', help="저장할 CSV 경로 (기본값: data/synthetic_recalls_<건수>.csv)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (같은 시드면 같은 파일, 기본값: 0)")
+    parser.add_argument('--source', default=SOURCE_CSV_PATH, help="분포를 학습할 원본 CSV 경로")
+    parser.add_argument('--encoding', default='utf-8-sig', choices=['utf-8-sig', 'utf-8', 'cp949'],
+                        help="출력 인코딩 (기본값: utf-8-sig, Excel 호환 / cp949: 원본과 같은 인코딩)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(ROOT_DIR, 'data', f"synthetic_recalls_{args.rows}.csv")
+    start = time.perf_counter()
+    profile = RecallProfile.from_csv(args.source)
+    print(f"원본 {profile.source_rows:,}건 학습 완료: 제작자/차명 조합 {len(profile.pairs):,}개, "
+          f"사유 단어 {len(profile.filler_tokens):,}개, 키워드 {len(profile.keywords)}개 ({time.perf_counter() - start:.1f}초)")
+    written = write_synthetic_csv(profile, output, args.rows, seed=args.seed, encoding=args.encoding)
+    elapsed = time.perf_counter() - start
+    print(f"[완료] {written:,}건 저장: {output} ({elapsed:.1f}초, {written / elapsed:,.0f} rows/sec)")
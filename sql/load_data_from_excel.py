@@ -5,8 +5,19 @@ import pandas as pd
 import numpy as np
 import re
 import os
+import time
+import hashlib
+import uuid
+import argparse
+import sys
+import sqlite3
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.constants import ClientFlag
+
+# [신규] 프로젝트 루트를 경로에 추가하여 backend 패키지(키워드 태거)를 임포트합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.keyword_tagger import KeywordTagger
 
 # --- [필수] 설정 ---
 
@@ -33,6 +44,12 @@ SHEET_NAMES = [
     '리콜현황', 
     '그외 차량 리콜 현황'
 ]
+
+# 5. [신규] 벌크 적재 시 한 번의 executemany로 보내는 행 수 (max_allowed_packet 고려)
+BULK_BATCH_SIZE = 1000
+
+# 6. [신규] 임베디드(SQLite) DB 스키마 파일 (--sqlite 사용 시)
+SQLITE_SCHEMA_PATH = os.path.join(SCRIPT_DIR, 'create_tables_sqlite.sql')
 # ----------------------------------------
 
 # --- 키워드 목록 (설명 포함) ---
@@ -74,8 +91,17 @@ def load_and_clean_data(file_path, sheets):
         print(f"  > (팁: {EXCEL_FILE_NAME} 파일이 'sql' 폴더 안에 있는지 확인하세요.)")
         return None
         
-    print(f" - {EXCEL_FILE_NAME} 파일 로드 중...")
+    print(f" - {os.path.basename(file_path)} 파일 로드 중...")
     
+    # [신규] CSV(공단 원본 형식 / sql/generate_recall_data.py로 만든 합성 데이터)는 시트 없이 한 번에 읽습니다.
+    if file_path.lower().endswith('.csv'):
+        try:
+            df_list.append(pd.read_csv(file_path, encoding='utf-8-sig'))
+        except UnicodeDecodeError:
+            df_list.append(pd.read_csv(file_path, encoding='cp949'))
+        print(f"   - CSV 로드 성공 ({len(df_list[0])}건)")
+        sheets = []
+
     for sheet in sheets:
         try:
             # [수정] pd.read_csv -> pd.read_excel
@@ -118,66 +144,130 @@ def load_and_clean_data(file_path, sheets):
     df_cleaned = df_raw.where(pd.notnull(df_raw), None)
     df_cleaned = df_cleaned.dropna(subset=['리콜사유'])
     df_cleaned['제작자'] = df_cleaned['제작자'].str.replace(r"\(.*?\)", "", regex=True).str.strip()
+    df_cleaned = add_recall_keys(df_cleaned)
     
     print(f"총 {len(df_cleaned)}건의 리콜 데이터를 전처리했습니다.")
     return df_cleaned
 
 
+# --- [신규] 리콜 자연키 (재적재 시 중복 방지용) ---
+RECALL_KEY_SEPARATOR = '\x1f'
+
+
+def make_recall_key(brand, model, recall_date, prod_from, prod_to, reason):
+    """
+    (브랜드, 차종, 리콜개시일, 생산기간, 리콜사유)로 만든 SHA-256 내용 키를 반환합니다.
+    날짜는 'YYYY-MM-DD' 문자열(없으면 빈 문자열)로 받으며, sql/migrations/001_recall_natural_key.sql의
+    SHA2(CONCAT_WS(CHAR(31), ...), 256) 계산과 반드시 같은 값이 나와야 합니다.
+    """
+    parts = [str(brand), str(model)] + [
+        v if isinstance(v, str) else '' for v in (recall_date, prod_from, prod_to, reason)
+    ]
+    return hashlib.sha256(RECALL_KEY_SEPARATOR.join(parts).encode('utf-8')).hexdigest()
+
+
+def add_recall_keys(df):
+    """
+    'recall_key' 컬럼을 추가합니다. 원본에 같은 키를 가진 행이 여러 개 있으면
+    리콜대수/시정대수를 합산하고 시정률을 다시 계산하여 한 행으로 합칩니다.
+    """
+    recall_dates, prod_froms, prod_tos = (
+        pd.to_datetime(df[col], errors='coerce').dt.strftime('%Y-%m-%d').tolist()
+        for col in ['리콜개시일', '생산기간(부터)', '생산기간(까지)']
+    )
+    df = df.copy()
+    df['recall_key'] = [
+        make_recall_key(*values)
+        for values in zip(df['제작자'].tolist(), df['차명'].tolist(),
+                          recall_dates, prod_froms, prod_tos, df['리콜사유'].tolist())
+    ]
+
+    duplicated = df.duplicated(subset=['recall_key'], keep=False)
+    if duplicated.any():
+        agg_rules = {col: 'first' for col in df.columns if col != 'recall_key'}
+        agg_rules.update({'리콜대수': 'sum', '시정대수': 'sum'})
+        merged = df[duplicated].groupby('recall_key', sort=False).agg(agg_rules).reset_index()
+        merged['시정률(퍼센트)'] = np.where(
+            merged['리콜대수'] > 0,
+            (merged['시정대수'] / merged['리콜대수'] * 100).round(2),
+            merged['시정률(퍼센트)']
+        )
+        print(f"[정보] 같은 리콜 키를 가진 {int(duplicated.sum())}건을 {len(merged)}건으로 합쳤습니다.")
+        df = pd.concat([df[~duplicated], merged[df.columns]], ignore_index=True)
+    return df
+
+
 # --- 2. DB에 데이터 저장 ---
+# --- [신규] Brand / Model / Keyword 마스터 테이블 채우기 (두 적재 방식 공통) ---
+def upsert_master_tables(cursor, df):
+    """Brand, Model, Keyword 테이블을 채우고 (brand_map, model_map, keyword_map)을 반환합니다."""
+    # [Step 1] Brand 테이블 채우기
+    all_brands = df['제작자'].unique()
+    sql_brand = "INSERT INTO Brand (brand_name) VALUES (%s) ON DUPLICATE KEY UPDATE brand_name=brand_name"
+    cursor.executemany(sql_brand, [(brand,) for brand in all_brands if brand])
+    print(f" -> 'Brand' 테이블에 {cursor.rowcount}건 처리 완료.")
+
+    cursor.execute("SELECT brand_id, brand_name FROM Brand")
+    brand_map = {name: id for (id, name) in cursor.fetchall()}
+
+    # [Step 2] Model 테이블 채우기
+    models_data = df[['제작자', '차명']].drop_duplicates()
+    model_tuples = []
+    for _, row in models_data.iterrows():
+        brand_id = brand_map.get(row['제작자'])
+        if brand_id and row['차명']:
+            model_tuples.append((brand_id, row['차명']))
+    
+    sql_model = "INSERT INTO Model (brand_id, model_name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE brand_id=brand_id"
+    cursor.executemany(sql_model, model_tuples)
+    print(f" -> 'Model' 테이블에 {cursor.rowcount}건 처리 완료.")
+    
+    cursor.execute("SELECT model_id, brand_id, model_name FROM Model")
+    model_map = {(b_id, name): m_id for (m_id, b_id, name) in cursor.fetchall()}
+
+    # [Step 3] Keyword 테이블 채우기 (설명 포함)
+    print(" -> 'Keyword' 테이블 업데이트 중...")
+    sql_keyword = """
+    INSERT INTO Keyword (keyword_text, keyword_desc) 
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE keyword_desc=VALUES(keyword_desc)
+    """
+    cursor.executemany(sql_keyword, KEYWORDS_DATA)
+    print(f" -> 'Keyword' 테이블에 {cursor.rowcount}건 처리 완료.")
+
+    cursor.execute("SELECT keyword_id, keyword_text FROM Keyword")
+    keyword_map = {text: id for (id, text) in cursor.fetchall()}
+
+    return brand_map, model_map, keyword_map
+
+
 def insert_data_to_db(df):
     conn = None
     cursor = None
     
     keywords_only = [k[0] for k in KEYWORDS_DATA]
+    tagger = KeywordTagger(keywords_only)
     
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        # FOUND_ROWS를 끄면 ON DUPLICATE KEY UPDATE의 rowcount가 1=삽입 / 2=갱신 / 0=변경 없음이 됩니다.
+        conn = mysql.connector.connect(**DB_CONFIG, client_flags=[-ClientFlag.FOUND_ROWS])
         cursor = conn.cursor()
         print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다.")
 
-        # [Step 1] Brand 테이블 채우기
-        all_brands = df['제작자'].unique()
-        sql_brand = "INSERT INTO Brand (brand_name) VALUES (%s) ON DUPLICATE KEY UPDATE brand_name=brand_name"
-        cursor.executemany(sql_brand, [(brand,) for brand in all_brands if brand])
-        print(f" -> 'Brand' 테이블에 {cursor.rowcount}건 처리 완료.")
-
-        cursor.execute("SELECT brand_id, brand_name FROM Brand")
-        brand_map = {name: id for (id, name) in cursor.fetchall()}
-
-        # [Step 2] Model 테이블 채우기
-        models_data = df[['제작자', '차명']].drop_duplicates()
-        model_tuples = []
-        for _, row in models_data.iterrows():
-            brand_id = brand_map.get(row['제작자'])
-            if brand_id and row['차명']:
-                model_tuples.append((brand_id, row['차명']))
-        
-        sql_model = "INSERT INTO Model (brand_id, model_name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE brand_id=brand_id"
-        cursor.executemany(sql_model, model_tuples)
-        print(f" -> 'Model' 테이블에 {cursor.rowcount}건 처리 완료.")
-        
-        cursor.execute("SELECT model_id, brand_id, model_name FROM Model")
-        model_map = {(b_id, name): m_id for (m_id, b_id, name) in cursor.fetchall()}
-
-        # [Step 3] Keyword 테이블 채우기 (설명 포함)
-        print(" -> 'Keyword' 테이블 업데이트 중...")
-        sql_keyword = """
-        INSERT INTO Keyword (keyword_text, keyword_desc) 
-        VALUES (%s, %s)
-        ON DUPLICATE KEY UPDATE keyword_desc=VALUES(keyword_desc)
-        """
-        cursor.executemany(sql_keyword, KEYWORDS_DATA)
-        print(f" -> 'Keyword' 테이블에 {cursor.rowcount}건 처리 완료.")
-
-        cursor.execute("SELECT keyword_id, keyword_text FROM Keyword")
-        keyword_map = {text: id for (id, text) in cursor.fetchall()}
+        brand_map, model_map, keyword_map = upsert_master_tables(cursor, df)
 
         # [Step 4] Recall 및 Junction 테이블 채우기
         print(" -> 'Recall' 및 'Junction' 테이블 데이터 삽입 중 (가장 오래 걸림)...")
-        recall_count = 0
-        junction_count = 0
+        start_time = time.perf_counter()
+        recall_count = 0 # 신규 삽입
+        updated_count = 0
+        unchanged_count = 0
+        junction_count = 0 # 새로 추가된 연결 (이미 있던 연결은 세지 않음)
+
+        # [수정] 행 x 키워드 이중 루프 대신, 리콜사유 컬럼 전체를 한 번에 태깅
+        keyword_masks = tagger.bitmasks(df['리콜사유'])
 
-        for _, row in df.iterrows():
+        for row_pos, (_, row) in enumerate(df.iterrows()):
             try:
                 brand_id = brand_map.get(row['제작자'])
                 model_id = model_map.get((brand_id, row['차명']))
@@ -185,12 +275,16 @@ def insert_data_to_db(df):
                 if not model_id:
                     continue 
 
+                # [수정] recall_key(UNIQUE) 덕분에 재실행 시 중복 삽입 대신 기존 행을 갱신합니다.
+                # (recall_id=LAST_INSERT_ID(recall_id): 갱신된 경우에도 lastrowid로 기존 ID를 돌려받기 위함)
                 sql_recall = """
-                INSERT INTO Recall (model_id, reason, prod_from, prod_to, recall_date, recall_count, correction_count, correction_rate)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE reason=VALUES(reason), recall_count=VALUES(recall_count)
+                INSERT INTO Recall (recall_key, model_id, reason, prod_from, prod_to, recall_date, recall_count, correction_count, correction_rate)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE recall_id=LAST_INSERT_ID(recall_id), recall_count=VALUES(recall_count),
+                    correction_count=VALUES(correction_count), correction_rate=VALUES(correction_rate)
                 """
                 recall_values = (
+                    row['recall_key'],
                     model_id,
                     row['리콜사유'],
                     row['생산기간(부터)'],
@@ -201,18 +295,20 @@ def insert_data_to_db(df):
                     row['시정률(퍼센트)']
                 )
                 cursor.execute(sql_recall, recall_values)
+                affected = cursor.rowcount
                 
                 new_recall_id = cursor.lastrowid
                 if new_recall_id == 0: 
                     continue 
 
-                recall_count += 1
+                if affected == 1:
+                    recall_count += 1
+                elif affected == 2:
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
                 
-                reason_text = row['리콜사유']
-                found_keywords = []
-                for keyword_text in keywords_only:
-                    if keyword_text in reason_text:
-                        found_keywords.append(keyword_text)
+                found_keywords = tagger.keywords_from_mask(keyword_masks[row_pos])
                 
                 if found_keywords:
                     for keyword_text in found_keywords:
@@ -224,17 +320,290 @@ def insert_data_to_db(df):
                             ON DUPLICATE KEY UPDATE recall_id=recall_id
                             """
                             cursor.execute(sql_junction, (new_recall_id, keyword_id))
-                            junction_count += 1
+                            junction_count += cursor.rowcount == 1
                         
             except Exception as e:
                 continue 
 
-        print(f" -> 'Recall' 테이블에 {recall_count}건 신규 삽입 완료.")
+        print(f" -> 'Recall' 테이블: 신규 {recall_count}건 / 갱신 {updated_count}건 / 변경 없음 {unchanged_count}건")
         print(f" -> 'Recall_Keyword_Junction' 테이블에 {junction_count}건 연결 완료.")
+        refresh_summary_stats(cursor)
+        refresh_aggregate_tables(cursor)
+        stamp_data_version(cursor)
         
         # [Step 5] 최종 커밋
         conn.commit()
         print("\n[완료] 모든 데이터가 성공적으로 DB에 저장되었습니다.")
+        report_throughput(len(df), time.perf_counter() - start_time)
+
+    except Error as e:
+        print(f"\n[치명적 오류] DB 작업 실패: {e}")
+        if conn:
+            print("작업을 롤백합니다.")
+            conn.rollback()
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+            print("MySQL DB 연결이 종료되었습니다.")
+
+# --- [신규] 대시보드 요약 통계 갱신 (sql/migrations/003_summary_stats.sql과 같은 집계, MySQL/SQLite 공용) ---
+SUMMARY_REFRESH_SQL = """
+REPLACE INTO Summary_Stats
+    (stat_id, total_recalls, total_brands, total_models, top_brand_name, top_brand_recalls,
+     min_recall_date, max_recall_date, refreshed_at)
+SELECT
+    1,
+    (SELECT COUNT(recall_id) FROM Recall),
+    (SELECT COUNT(brand_id) FROM Brand),
+    (SELECT COUNT(model_id) FROM Model),
+    top.brand_name,
+    COALESCE(top.count, 0),
+    (SELECT MIN(recall_date) FROM Recall),
+    (SELECT MAX(recall_date) FROM Recall),
+    CURRENT_TIMESTAMP
+FROM (SELECT 1) AS one
+LEFT JOIN (
+    SELECT b.brand_name, COUNT(r.recall_id) AS count
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_name ORDER BY count DESC LIMIT 1
+) AS top ON TRUE
+"""
+
+
+def refresh_summary_stats(cursor):
+    """적재가 끝난 뒤 Summary_Stats 한 행을 다시 계산합니다. (앱의 get_summary_stats가 읽는 행)"""
+    cursor.execute(SUMMARY_REFRESH_SQL)
+    print(" -> 'Summary_Stats' 대시보드 요약 통계 갱신 완료.")
+
+
+# --- [신규] 분석 리포트 집계 테이블 갱신 (sql/migrations/004_report_aggregates.sql과 같은 집계) ---
+# TRUNCATE는 암묵적으로 커밋하므로 DELETE를 사용해 적재와 같은 트랜잭션에서 교체합니다.
+# (커밋 전까지 앱은 이전 집계를 그대로 읽습니다)
+AGGREGATE_REFRESH_SQL = [
+    "DELETE FROM Brand_Stats",
+    """
+    INSERT INTO Brand_Stats (brand_id, brand_name, recall_count, avg_correction_rate)
+    SELECT b.brand_id, b.brand_name, COUNT(r.recall_id), AVG(r.correction_rate)
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_id, b.brand_name
+    """,
+    "DELETE FROM Model_Stats",
+    """
+    INSERT INTO Model_Stats (model_id, brand_name, model_name, recall_count, avg_correction_rate)
+    SELECT m.model_id, b.brand_name, m.model_name, COUNT(r.recall_id), AVG(r.correction_rate)
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY m.model_id, b.brand_name, m.model_name
+    """,
+    "DELETE FROM Model_Keyword_Stats",
+    """
+    INSERT INTO Model_Keyword_Stats (model_id, keyword_id, keyword_count)
+    SELECT r.model_id, rkj.keyword_id, COUNT(*)
+    FROM Recall r JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+    GROUP BY r.model_id, rkj.keyword_id
+    """,
+]
+
+
+def refresh_aggregate_tables(cursor):
+    """적재가 끝난 뒤 브랜드별/차종별/차종-키워드별 집계 테이블을 다시 계산합니다."""
+    for statement in AGGREGATE_REFRESH_SQL:
+        cursor.execute(statement)
+    print(" -> 'Brand_Stats' / 'Model_Stats' / 'Model_Keyword_Stats' 집계 테이블 갱신 완료.")
+
+
+# --- [신규] 데이터 버전 기록 (sql/migrations/006_data_version.sql) ---
+# 적재와 같은 트랜잭션에서 새 토큰을 기록하므로, 앱은 커밋된 순간부터 새 버전으로 캐시를 다시 만듭니다.
+DATA_VERSION_STAMP_SQL = "REPLACE INTO Data_Version (version_id, version, loaded_at) VALUES (1, {0}, CURRENT_TIMESTAMP)"
+
+
+def stamp_data_version(cursor, placeholder='%s'):
+    """새 데이터 버전 토큰을 기록하고 반환합니다. (SQLite 커서는 placeholder='?')"""
+    version = uuid.uuid4().hex
+    cursor.execute(DATA_VERSION_STAMP_SQL.format(placeholder), (version,))
+    print(f" -> 'Data_Version' 데이터 버전 갱신 완료. ({version})")
+    return version
+
+
+# --- [신규] 처리 속도 출력 (행 단위 / 벌크 적재 비교용) ---
+def report_throughput(row_count, elapsed):
+    rows_per_sec = row_count / elapsed if elapsed > 0 else 0
+    print(f"[성능] Recall/Junction 적재: {row_count}행 / {elapsed:.2f}초 = {rows_per_sec:,.0f} rows/sec")
+
+
+# --- [신규] 2-B. 벌크(Set-based) / 증분 적재 ---
+STAGING_TABLE_DDL = """
+CREATE TEMPORARY TABLE Recall_Staging (
+    row_no INT NOT NULL PRIMARY KEY,
+    recall_key CHAR(64) NOT NULL,
+    model_id INT NOT NULL,
+    reason TEXT,
+    prod_from DATE,
+    prod_to DATE,
+    recall_date DATE,
+    recall_count INT,
+    correction_count INT,
+    correction_rate FLOAT,
+    UNIQUE KEY uk_staging_recall_key (recall_key)
+) ENGINE=InnoDB
+"""
+
+
+def _to_date_list(series):
+    """datetime 컬럼을 DB에 넣을 수 있는 date/None 리스트로 변환합니다."""
+    return [None if pd.isna(v) else v.date() for v in pd.to_datetime(series, errors='coerce')]
+
+
+def build_staging_rows(df, brand_map, model_map):
+    """정제된 DataFrame을 Recall_Staging 행 튜플 리스트로 변환합니다. (model_id 매핑 실패 행은 제외)"""
+    brand_ids = df['제작자'].map(brand_map)
+    model_ids = [model_map.get((b_id, name)) for b_id, name in zip(brand_ids.tolist(), df['차명'].tolist())]
+
+    staged = df.assign(_model_id=model_ids)
+    staged = staged[staged['_model_id'].notna()]
+
+    columns = zip(
+        staged['recall_key'].tolist(),
+        staged['_model_id'].astype(int).tolist(),
+        staged['리콜사유'].tolist(),
+        _to_date_list(staged['생산기간(부터)']),
+        _to_date_list(staged['생산기간(까지)']),
+        _to_date_list(staged['리콜개시일']),
+        staged['리콜대수'].astype(int).tolist(),
+        staged['시정대수'].astype(int).tolist(),
+        staged['시정률(퍼센트)'].astype(float).tolist(),
+    )
+    return [(row_no, *values) for row_no, values in enumerate(columns, start=1)]
+
+
+def stage_recalls(cursor, staging_rows, batch_size):
+    """임시 테이블 Recall_Staging을 만들고 행들을 배치(executemany)로 업로드합니다."""
+    print(f" -> 'Recall_Staging'에 {len(staging_rows)}건 업로드 중 (배치 크기 {batch_size})...")
+    cursor.execute("DROP TEMPORARY TABLE IF EXISTS Recall_Staging")
+    cursor.execute(STAGING_TABLE_DDL)
+    sql_staging = """
+    INSERT INTO Recall_Staging (row_no, recall_key, model_id, reason, prod_from, prod_to, recall_date,
+                                recall_count, correction_count, correction_rate)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    for i in range(0, len(staging_rows), batch_size):
+        cursor.executemany(sql_staging, staging_rows[i:i + batch_size])
+
+
+def update_existing_recalls(cursor):
+    """
+    이미 DB에 있는 리콜(같은 recall_key)의 대수/시정률을 갱신하고 스테이징에서 제거합니다.
+    (갱신 건수, 변경 없음 건수)를 반환합니다.
+    """
+    cursor.execute("SELECT COUNT(*) FROM Recall_Staging s JOIN Recall r ON r.recall_key = s.recall_key")
+    matched_count = int(cursor.fetchone()[0])
+
+    cursor.execute("""
+    UPDATE Recall r
+    JOIN Recall_Staging s ON r.recall_key = s.recall_key
+    SET r.recall_count = s.recall_count,
+        r.correction_count = s.correction_count,
+        r.correction_rate = s.correction_rate
+    WHERE NOT (r.recall_count <=> s.recall_count
+               AND r.correction_count <=> s.correction_count
+               AND r.correction_rate <=> s.correction_rate)
+    """)
+    updated_count = cursor.rowcount
+
+    cursor.execute("DELETE s FROM Recall_Staging s JOIN Recall r ON r.recall_key = s.recall_key")
+    return updated_count, matched_count - updated_count
+
+
+def insert_staged_recalls(cursor, staging_rows, keyword_map, batch_size):
+    """
+    스테이징에 남은(= DB에 없는) 리콜을 INSERT ... SELECT로 한 번에 넣고,
+    해당 행들의 Junction 행을 키워드 태거로 계산해 배치로 넣습니다. (리콜 건수, Junction 건수)를 반환합니다.
+    """
+    cursor.execute("SELECT row_no FROM Recall_Staging")
+    new_row_nos = {row_no for (row_no,) in cursor.fetchall()}
+    if not new_row_nos:
+        return 0, 0
+
+    # recall_id 구간 예약: 현재 최대값 뒤에 row_no를 그대로 이어 붙입니다.
+    # (FOR UPDATE로 인덱스 끝을 잠가, 적재 중 다른 세션의 INSERT와 ID가 겹치지 않게 합니다.)
+    cursor.execute("SELECT COALESCE(MAX(recall_id), 0) FROM Recall FOR UPDATE")
+    base_recall_id = int(cursor.fetchone()[0])
+
+    cursor.execute("""
+    INSERT INTO Recall (recall_id, recall_key, model_id, reason, prod_from, prod_to, recall_date,
+                        recall_count, correction_count, correction_rate)
+    SELECT %s + row_no, recall_key, model_id, reason, prod_from, prod_to, recall_date,
+           recall_count, correction_count, correction_rate
+    FROM Recall_Staging
+    ORDER BY row_no
+    """, (base_recall_id,))
+    recall_count = cursor.rowcount
+
+    # 스테이징 순번(row_no) 기준으로 한 번에 태깅 후 배치 삽입
+    new_rows = [row for row in staging_rows if row[0] in new_row_nos]
+    tagger = KeywordTagger([k[0] for k in KEYWORDS_DATA])
+    junction_rows = [
+        (base_recall_id + new_rows[row_pos][0], keyword_map[tagger.keywords[keyword_idx]])
+        for row_pos, keyword_idx in tagger.tag_column(row[3] for row in new_rows)
+        if tagger.keywords[keyword_idx] in keyword_map
+    ]
+    sql_junction = "INSERT INTO Recall_Keyword_Junction (recall_id, keyword_id) VALUES (%s, %s)"
+    for i in range(0, len(junction_rows), batch_size):
+        cursor.executemany(sql_junction, junction_rows[i:i + batch_size])
+    return recall_count, len(junction_rows)
+
+
+def insert_data_to_db_bulk(df, batch_size=BULK_BATCH_SIZE, incremental=False):
+    """
+    행 단위 INSERT 대신, 정제된 데이터를 임시 스테이징 테이블에 배치(executemany)로 올린 뒤
+    Recall 행을 INSERT ... SELECT 집합 연산으로 한 번에 만들고, Junction 행은 키워드 태거로
+    한 번에 계산해 배치로 넣습니다.
+    - 이미 DB에 있는 리콜(recall_key 기준)은 다시 넣지 않으므로 여러 번 실행해도 안전합니다.
+    - incremental=True 이면 기존 리콜의 리콜대수/시정대수/시정률 변경분도 반영하고
+      신규/갱신/변경 없음 건수를 출력합니다. (월간 KOTSA 갱신용)
+      incremental=False 이면 기존 리콜은 비교하지 않고 건너뛰며, 그 수를 '기존 행 건너뜀'으로 출력합니다.
+    """
+    conn = None
+    cursor = None
+
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        mode_name = "증분 모드" if incremental else "벌크 모드"
+        print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다. ({mode_name})")
+
+        brand_map, model_map, keyword_map = upsert_master_tables(cursor, df)
+
+        # [Step 4-1] 스테이징 테이블에 배치 업로드
+        start_time = time.perf_counter()
+        staging_rows = build_staging_rows(df, brand_map, model_map)
+        stage_recalls(cursor, staging_rows, batch_size)
+
+        # [Step 4-2] 기존 리콜 처리 (증분 모드: 변경분 갱신 / 벌크 모드: 건너뜀)
+        if incremental:
+            updated_count, unchanged_count = update_existing_recalls(cursor)
+        else:
+            # 대수/시정률을 비교하지 않으므로 '변경 없음'이 아니라 '건너뜀'입니다. (변경분 반영은 --incremental)
+            cursor.execute("DELETE s FROM Recall_Staging s JOIN Recall r ON r.recall_key = s.recall_key")
+            skipped_count = cursor.rowcount
+
+        # [Step 4-3] 신규 리콜 + Junction 삽입
+        recall_count, junction_count = insert_staged_recalls(cursor, staging_rows, keyword_map, batch_size)
+        if incremental:
+            print(f" -> 'Recall' 테이블: 신규 {recall_count}건 / 갱신 {updated_count}건 / 변경 없음 {unchanged_count}건")
+        else:
+            print(f" -> 'Recall' 테이블: 신규 {recall_count}건 / 기존 행 건너뜀 {skipped_count}건 (비교하지 않음)")
+        print(f" -> 'Recall_Keyword_Junction' 테이블에 {junction_count}건 연결 완료.")
+
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS Recall_Staging")
+        refresh_summary_stats(cursor)
+        refresh_aggregate_tables(cursor)
+        stamp_data_version(cursor)
+
+        # [Step 5] 최종 커밋
+        conn.commit()
+        print("\n[완료] 모든 데이터가 성공적으로 DB에 저장되었습니다.")
+        report_throughput(len(staging_rows), time.perf_counter() - start_time)
 
     except Error as e:
         print(f"\n[치명적 오류] DB 작업 실패: {e}")
@@ -247,8 +616,112 @@ def insert_data_to_db(df):
             conn.close()
             print("MySQL DB 연결이 종료되었습니다.")
 
+# --- [신규] 2-C. 임베디드(SQLite) DB 적재 ---
+def _sqlite_date(value):
+    return value.isoformat() if value is not None else None
+
+
+def insert_data_to_db_sqlite(df, db_path):
+    """
+    MySQL 대신 SQLite 파일 DB에 적재합니다. (조회 전용 대시보드 복제본 / 로컬 벤치마크용)
+    스키마(create_tables_sqlite.sql)를 적용한 뒤, MySQL 적재와 같은 recall_key 기준 upsert로 넣으므로
+    여러 번 실행해도 안전하며, 요약 통계/집계 테이블도 같은 트랜잭션에서 다시 계산합니다.
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = sqlite3.connect(db_path)
+        with open(SQLITE_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            conn.executescript(f.read())
+        cursor = conn.cursor()
+        print(f"\n[연결 성공] SQLite DB '{db_path}'에 연결되었습니다.")
+
+        # [Step 1~3] 마스터 테이블
+        cursor.executemany("INSERT OR IGNORE INTO Brand (brand_name) VALUES (?)",
+                           [(brand,) for brand in df['제작자'].unique() if brand])
+        brand_map = {name: id for (id, name) in cursor.execute("SELECT brand_id, brand_name FROM Brand")}
+
+        model_tuples = [
+            (brand_map[brand], model)
+            for brand, model in df[['제작자', '차명']].drop_duplicates().itertuples(index=False)
+            if brand in brand_map and model
+        ]
+        cursor.executemany("INSERT OR IGNORE INTO Model (brand_id, model_name) VALUES (?, ?)", model_tuples)
+        model_map = {(b_id, name): m_id for (m_id, b_id, name) in
+                     cursor.execute("SELECT model_id, brand_id, model_name FROM Model")}
+
+        cursor.executemany("""
+        INSERT INTO Keyword (keyword_text, keyword_desc) VALUES (?, ?)
+        ON CONFLICT(keyword_text) DO UPDATE SET keyword_desc = excluded.keyword_desc
+        """, KEYWORDS_DATA)
+        keyword_map = {text: id for (id, text) in cursor.execute("SELECT keyword_id, keyword_text FROM Keyword")}
+        print(f" -> 마스터 테이블: 브랜드 {len(brand_map)}개 / 차종 {len(model_map)}개 / 키워드 {len(keyword_map)}개")
+
+        # [Step 4] Recall upsert (recall_key 기준) + Junction
+        start_time = time.perf_counter()
+        recall_rows = [
+            (key, model_id, reason, _sqlite_date(p_from), _sqlite_date(p_to), _sqlite_date(r_date), rc, cc, rate)
+            for (_, key, model_id, reason, p_from, p_to, r_date, rc, cc, rate)
+            in build_staging_rows(df, brand_map, model_map)
+        ]
+        cursor.executemany("""
+        INSERT INTO Recall (recall_key, model_id, reason, prod_from, prod_to, recall_date,
+                            recall_count, correction_count, correction_rate)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(recall_key) DO UPDATE SET recall_count = excluded.recall_count,
+            correction_count = excluded.correction_count, correction_rate = excluded.correction_rate
+        """, recall_rows)
+        recall_ids = dict(cursor.execute("SELECT recall_key, recall_id FROM Recall"))
+
+        tagger = KeywordTagger([k[0] for k in KEYWORDS_DATA])
+        junction_rows = [
+            (recall_ids[recall_rows[row][0]], keyword_map[tagger.keywords[keyword_idx]])
+            for row, keyword_idx in tagger.tag_column([r[2] for r in recall_rows])
+        ]
+        cursor.executemany("INSERT OR IGNORE INTO Recall_Keyword_Junction (recall_id, keyword_id) VALUES (?, ?)",
+                           junction_rows)
+        print(f" -> 'Recall' 테이블에 {len(recall_rows)}건 / 'Recall_Keyword_Junction' 테이블에 {len(junction_rows)}건 반영 완료.")
+
+        refresh_summary_stats(cursor)
+        refresh_aggregate_tables(cursor)
+        stamp_data_version(cursor, placeholder='?')
+
+        # [Step 5] 최종 커밋
+        conn.commit()
+        print("\n[완료] 모든 데이터가 성공적으로 SQLite DB에 저장되었습니다.")
+        report_throughput(len(recall_rows), time.perf_counter() - start_time)
+
+    except sqlite3.Error as e:
+        print(f"\n[치명적 오류] DB 작업 실패: {e}")
+        if conn:
+            print("작업을 롤백합니다.")
+            conn.rollback()
+    finally:
+        if conn:
+            if cursor: cursor.close()
+            conn.close()
+            print("SQLite DB 연결이 종료되었습니다.")
+
 # --- 3. 스크립트 실행 ---
 if __name__ == "__main__":
-    df_main = load_and_clean_data(EXCEL_FILE_PATH, SHEET_NAMES)
+    parser = argparse.ArgumentParser(description="리콜 Excel 데이터를 MySQL(또는 SQLite) DB에 적재합니다.")
+    parser.add_argument('--bulk', action='store_true',
+                        help="스테이징 테이블 + 집합 연산(INSERT ... SELECT) 방식으로 적재합니다.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="벌크 방식으로 신규 리콜만 추가하고, 기존 리콜은 변경된 대수/시정률만 갱신합니다.")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE,
+                        help=f"벌크/증분 모드에서 executemany 한 번에 보내는 행 수 (기본값: {BULK_BATCH_SIZE})")
+    parser.add_argument('--source', default=EXCEL_FILE_PATH,
+                        help="적재할 원본 파일 (기본값: sql 폴더의 Excel 파일, .csv도 가능)")
+    parser.add_argument('--sqlite', metavar='DB_PATH',
+                        help="MySQL 대신 지정한 SQLite 파일 DB에 적재합니다. (예: data/lemon_scanner.db)")
+    args = parser.parse_args()
+
+    df_main = load_and_clean_data(args.source, SHEET_NAMES)
     if df_main is not None:
-        insert_data_to_db(df_main)
\ No newline at end of file
+        if args.sqlite:
+            insert_data_to_db_sqlite(df_main, args.sqlite)
+        elif args.bulk or args.incremental:
+            insert_data_to_db_bulk(df_main, batch_size=args.batch_size, incremental=args.incremental)
+        else:
+            insert_data_to_db(df_main)
\ No newline at end of file
@@ -0,0 +1,93 @@
+# 파일 이름: migrate.py
+# (경로: sql/migrate.py)
+# [신규] sql/migrations/ 의 버전별 SQL 파일을 순서대로 적용합니다.
+# 실행: python sql/migrate.py            (미적용 마이그레이션 모두 적용)
+#       python sql/migrate.py --status   (적용 현황만 출력)
+
+import os
+import re
+import sys
+import argparse
+import mysql.connector
+from mysql.connector import Error
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(SCRIPT_DIR, 'migrations')
+
+# 적재 스크립트와 같은 DB 접속 정보를 사용합니다.
+sys.path.insert(0, SCRIPT_DIR)
+from load_data_from_excel import DB_CONFIG
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_.+\.sql$')
+
+
+def list_migrations():
+    """(버전, 파일 경로) 목록을 버전 순으로 반환합니다. (예: ('001', '.../001_recall_natural_key.sql'))"""
+    migrations = []
+    for file_name in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE_PATTERN.match(file_name)
+        if match:
+            migrations.append((match.group(1), os.path.join(MIGRATIONS_DIR, file_name)))
+    return sorted(migrations)
+
+
+def split_statements(sql_text):
+    """'--' 주석 줄을 제거하고, 줄 끝의 세미콜론 기준으로 SQL 문을 나눕니다."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*$', "\n".join(lines), flags=re.MULTILINE)
+    return [stmt.strip() for stmt in statements if stmt.strip()]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(20) PRIMARY KEY COMMENT '마이그레이션 버전 (파일명 앞 번호)',
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '적용 시각'
+    ) ENGINE=InnoDB COMMENT='적용된 스키마 마이그레이션 목록'
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {version for (version,) in cursor.fetchall()}
+
+
+def run_migrations(status_only=False):
+    conn = None
+    cursor = None
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        applied = ensure_migrations_table(cursor)
+
+        for version, path in list_migrations():
+            file_name = os.path.basename(path)
+            if version in applied:
+                print(f" [적용됨] {file_name}")
+                continue
+            if status_only:
+                print(f" [미적용] {file_name}")
+                continue
+
+            print(f" -> {file_name} 적용 중...")
+            with open(path, encoding='utf-8') as f:
+                for statement in split_statements(f.read()):
+                    cursor.execute(statement)
+            # (MySQL의 DDL은 자동 커밋되므로, 파일 단위로 버전을 기록합니다)
+            cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            conn.commit()
+            print(f"    완료: {version}")
+
+        print("\n[완료] 마이그레이션 확인이 끝났습니다.")
+    except Error as e:
+        print(f"\n[치명적 오류] 마이그레이션 실패: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sql/migrations 의 스키마 마이그레이션을 적용합니다.")
+    parser.add_argument('--status', action='store_true', help="적용 현황만 출력합니다.")
+    args = parser.parse_args()
+    run_migrations(status_only=args.status)
@@ -0,0 +1,43 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 001: Recall 자연키(recall_key) 추가
+-- ---------------------------------------------------
+-- 기존 DB(create_tables.sql 이전 버전으로 생성)에 적용합니다.
+-- recall_key = SHA-256(브랜드명 \x1f 차종명 \x1f 리콜개시일 \x1f 생산기간(부터) \x1f 생산기간(까지) \x1f 리콜사유)
+-- (날짜는 'YYYY-MM-DD', NULL은 빈 문자열. load_data_from_excel.make_recall_key()와 같은 값이어야 합니다.)
+
+-- 1. 컬럼 추가 (백필 전이므로 NULL 허용)
+ALTER TABLE Recall
+ADD COLUMN recall_key CHAR(64) NULL COMMENT '리콜 자연키 (브랜드/차종/리콜개시일/생산기간/리콜사유 SHA-256)' AFTER recall_id;
+
+-- 2. 기존 행 백필
+UPDATE Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+SET r.recall_key = SHA2(CONCAT_WS(CHAR(31 USING utf8mb4),
+    b.brand_name,
+    m.model_name,
+    COALESCE(DATE_FORMAT(r.recall_date, '%Y-%m-%d'), ''),
+    COALESCE(DATE_FORMAT(r.prod_from, '%Y-%m-%d'), ''),
+    COALESCE(DATE_FORMAT(r.prod_to, '%Y-%m-%d'), ''),
+    COALESCE(r.reason, '')
+), 256);
+
+-- 3. 적재 스크립트를 여러 번 실행해서 생긴 중복 행 정리 (키별로 가장 작은 recall_id만 남김)
+DELETE j
+FROM Recall_Keyword_Junction j
+JOIN Recall r ON j.recall_id = r.recall_id
+JOIN (SELECT recall_key, MIN(recall_id) AS keep_id FROM Recall GROUP BY recall_key) k
+    ON r.recall_key = k.recall_key
+WHERE r.recall_id <> k.keep_id;
+
+DELETE r
+FROM Recall r
+JOIN (SELECT recall_key, MIN(recall_id) AS keep_id FROM Recall GROUP BY recall_key) k
+    ON r.recall_key = k.recall_key
+WHERE r.recall_id <> k.keep_id;
+
+-- 4. NOT NULL + UNIQUE 제약 추가
+ALTER TABLE Recall
+MODIFY COLUMN recall_key CHAR(64) NOT NULL COMMENT '리콜 자연키 (브랜드/차종/리콜개시일/생산기간/리콜사유 SHA-256)',
+ADD UNIQUE KEY uk_recall_key (recall_key);
@@ -0,0 +1,19 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 002: 상세 검색(search_recalls)용 보조 인덱스
+-- ---------------------------------------------------
+-- 페이지 2의 필터 조합(브랜드/차종/연도/키워드, recall_date DESC 정렬)에 맞춘 인덱스입니다.
+-- 적용 후 `python sql/explain_search_queries.py` 로 전체 스캔이 없는지 확인하세요.
+
+-- 브랜드/차종 필터: uk_brand_model로 model_id를 찾은 뒤, 차종별 리콜을 날짜 역순으로 바로 읽음
+-- (연도 필터가 함께 오면 같은 인덱스에서 recall_date 범위만 읽음)
+CREATE INDEX idx_recall_model_date ON Recall (model_id, recall_date);
+
+-- 필터 없음 / 연도만: recall_date 인덱스를 역순으로 읽으며 LIMIT에서 멈춤
+CREATE INDEX idx_recall_date ON Recall (recall_date);
+
+-- 차종명만으로 검색하는 경우 (브랜드 미지정)
+CREATE INDEX idx_model_name ON Model (model_name);
+
+-- 키워드 필터: keyword_id -> recall_id 방향 탐색 (기존 외래키 자동 인덱스를 대체)
+CREATE INDEX idx_rkj_keyword_recall ON Recall_Keyword_Junction (keyword_id, recall_id);
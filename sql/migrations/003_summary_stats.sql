@@ -0,0 +1,38 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 003: 대시보드 요약 통계 테이블 (Summary_Stats)
+-- ---------------------------------------------------
+-- Home/각 페이지 하단의 요약 지표(get_summary_stats)를 쿼리 5개 대신 한 행 조회로 제공합니다.
+-- 적재 스크립트(load_data_from_excel.py)가 적재 후 같은 REPLACE 문으로 다시 계산합니다.
+
+CREATE TABLE IF NOT EXISTS Summary_Stats (
+    stat_id TINYINT PRIMARY KEY COMMENT '항상 1 (단일 행)',
+    total_recalls INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    total_brands INT NOT NULL DEFAULT 0 COMMENT '총 브랜드 수',
+    total_models INT NOT NULL DEFAULT 0 COMMENT '총 차종 수',
+    top_brand_name VARCHAR(100) COMMENT '최다 리콜 브랜드',
+    top_brand_recalls INT NOT NULL DEFAULT 0 COMMENT '최다 리콜 브랜드의 리콜 건수',
+    min_recall_date DATE COMMENT '데이터 기준 기간 (시작)',
+    max_recall_date DATE COMMENT '데이터 기준 기간 (끝)',
+    refreshed_at DATETIME NOT NULL COMMENT '마지막 계산 시각'
+) ENGINE=InnoDB COMMENT='대시보드 요약 통계 (적재 시 갱신)';
+
+REPLACE INTO Summary_Stats
+    (stat_id, total_recalls, total_brands, total_models, top_brand_name, top_brand_recalls,
+     min_recall_date, max_recall_date, refreshed_at)
+SELECT
+    1,
+    (SELECT COUNT(recall_id) FROM Recall),
+    (SELECT COUNT(brand_id) FROM Brand),
+    (SELECT COUNT(model_id) FROM Model),
+    top.brand_name,
+    COALESCE(top.count, 0),
+    (SELECT MIN(recall_date) FROM Recall),
+    (SELECT MAX(recall_date) FROM Recall),
+    NOW()
+FROM (SELECT 1) AS one
+LEFT JOIN (
+    SELECT b.brand_name, COUNT(r.recall_id) AS count
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_name ORDER BY count DESC LIMIT 1
+) AS top ON TRUE;
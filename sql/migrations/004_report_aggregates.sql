@@ -0,0 +1,47 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 004: 분석 리포트용 집계 테이블 (Brand_Stats / Model_Stats / Model_Keyword_Stats)
+-- ---------------------------------------------------
+-- 분석 리포트(get_brand_rankings, get_recall_comparison)가 매번 Recall⋈Model⋈Brand(⋈Junction⋈Keyword)를
+-- 전체 집계하지 않고, 미리 계산된 행을 키로 읽도록 합니다.
+-- 적재 스크립트(load_data_from_excel.py)가 적재 트랜잭션 안에서 같은 문장으로 다시 계산합니다.
+
+CREATE TABLE IF NOT EXISTS Brand_Stats (
+    brand_id INT PRIMARY KEY COMMENT '브랜드ID',
+    brand_name VARCHAR(100) NOT NULL COMMENT '브랜드명',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    avg_correction_rate DOUBLE COMMENT '평균 시정률',
+    INDEX idx_brand_stats_count (recall_count)
+) ENGINE=InnoDB COMMENT='브랜드별 리콜 집계 (적재 시 갱신)';
+
+CREATE TABLE IF NOT EXISTS Model_Stats (
+    model_id INT PRIMARY KEY COMMENT '차종ID',
+    brand_name VARCHAR(100) NOT NULL COMMENT '브랜드명',
+    model_name VARCHAR(100) NOT NULL COMMENT '차종명',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    avg_correction_rate DOUBLE COMMENT '평균 시정률',
+    UNIQUE KEY uk_model_stats_name (brand_name, model_name)
+) ENGINE=InnoDB COMMENT='차종별 리콜 집계 (적재 시 갱신)';
+
+CREATE TABLE IF NOT EXISTS Model_Keyword_Stats (
+    model_id INT NOT NULL COMMENT '차종ID',
+    keyword_id INT NOT NULL COMMENT '키워드ID',
+    keyword_count INT NOT NULL DEFAULT 0 COMMENT '해당 차종 리콜 중 키워드가 나온 건수',
+    PRIMARY KEY (model_id, keyword_id),
+    INDEX idx_model_keyword_count (model_id, keyword_count)
+) ENGINE=InnoDB COMMENT='차종별 키워드 빈도 집계 (적재 시 갱신)';
+
+INSERT INTO Brand_Stats (brand_id, brand_name, recall_count, avg_correction_rate)
+SELECT b.brand_id, b.brand_name, COUNT(r.recall_id), AVG(r.correction_rate)
+FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY b.brand_id, b.brand_name;
+
+INSERT INTO Model_Stats (model_id, brand_name, model_name, recall_count, avg_correction_rate)
+SELECT m.model_id, b.brand_name, m.model_name, COUNT(r.recall_id), AVG(r.correction_rate)
+FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY m.model_id, b.brand_name, m.model_name;
+
+INSERT INTO Model_Keyword_Stats (model_id, keyword_id, keyword_count)
+SELECT r.model_id, rkj.keyword_id, COUNT(*)
+FROM Recall r JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+GROUP BY r.model_id, rkj.keyword_id;
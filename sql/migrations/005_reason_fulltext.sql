@@ -0,0 +1,10 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 005: 리콜 사유 전문 검색(FULLTEXT) 인덱스
+-- ---------------------------------------------------
+-- 상세 검색의 자유 검색어(예: '인플레이터', 'MDPS')를 LIKE '%...%' 전체 스캔 없이 찾기 위한 인덱스입니다.
+-- 한국어는 띄어쓰기 단위로 형태소가 나뉘지 않으므로 기본 파서 대신 ngram 파서(2글자 단위)를 사용합니다.
+-- (ngram_token_size는 서버 기본값 2를 전제로 합니다. 1글자 검색어는 앱에서 제외됩니다.)
+-- 적용 후 `python sql/explain_search_queries.py --text 에어백` 으로 type=fulltext 사용 여부를 확인하세요.
+
+ALTER TABLE Recall ADD FULLTEXT INDEX ft_recall_reason (reason) WITH PARSER ngram;
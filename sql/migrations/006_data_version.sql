@@ -0,0 +1,15 @@
+-- Active: 1762504480440@@127.0.0.1@3306@lemon_scanner_db
+-- ---------------------------------------------------
+-- Migration 006: 데이터 버전 토큰 테이블 (Data_Version)
+-- ---------------------------------------------------
+-- 적재 스크립트(load_data_from_excel.py)가 적재 트랜잭션 안에서 새 토큰을 기록하고,
+-- 앱(backend/data_version.py)은 이 토큰을 캐시 키로 사용해 적재가 커밋되는 즉시 캐시를 새로 만듭니다.
+
+CREATE TABLE IF NOT EXISTS Data_Version (
+    version_id TINYINT PRIMARY KEY COMMENT '항상 1 (단일 행)',
+    version CHAR(32) NOT NULL COMMENT '데이터 버전 토큰 (적재마다 새로 생성)',
+    loaded_at DATETIME NOT NULL COMMENT '마지막 적재 시각'
+) ENGINE=InnoDB COMMENT='데이터 버전 (적재 시 갱신)';
+
+INSERT IGNORE INTO Data_Version (version_id, version, loaded_at)
+VALUES (1, REPLACE(UUID(), '-', ''), NOW());
@@ -0,0 +1,91 @@
+# 파일 이름: prerender_wordclouds.py
+# (경로: sql/prerender_wordclouds.py)
+# [신규] 데이터 적재 후 모든 차종의 리콜 사유 워드 클라우드를 여러 프로세스로 미리 그려
+#        backend/wordcloud_cache.py의 디스크 캐시(data/wordcloud_cache/)에 저장합니다.
+#        분석 리포트의 '모델 프로필' 탭은 캐시된 이미지를 바로 보여주므로 처음 여는 차종도 기다리지 않습니다.
+#        (이전 데이터 버전의 이미지는 모두 그린 뒤 지웁니다)
+# 실행: python sql/prerender_wordclouds.py                        (secrets.toml의 DB 사용)
+#       python sql/prerender_wordclouds.py --workers 4 --force
+#       python sql/prerender_wordclouds.py --sqlite data/lemon_scanner.db
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from backend import db_manager, wordcloud_cache
+
+MODEL_REASONS_QUERY = """
+SELECT b.brand_name, m.model_name, r.reason
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+WHERE r.reason IS NOT NULL
+ORDER BY b.brand_name, m.model_name, r.recall_date DESC
+"""
+
+
+def load_model_reasons():
+    """{(브랜드, 차종): 리콜 사유를 이어 붙인 문자열} (get_model_profile_data의 all_reasons_string과 같은 형식)"""
+    with db_manager.get_connection() as conn:
+        if conn is None: return None
+        cursor = conn.cursor()
+        try:
+            cursor.execute(MODEL_REASONS_QUERY)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    reasons = {}
+    for brand_name, model_name, reason in rows:
+        reasons.setdefault((brand_name, model_name), []).append(str(reason))
+    return {key: " ".join(values) for key, values in reasons.items()}
+
+
+def prerender(workers, force=False):
+    model_reasons = load_model_reasons()
+    if model_reasons is None:
+        print("[치명적 오류] DB에 연결할 수 없습니다. (DB 접속 설정 확인)")
+        return False
+
+    version = wordcloud_cache.get_data_version()
+    font_path = wordcloud_cache.find_font_path()
+    if font_path is None:
+        print("[경고] 한글 폰트를 찾을 수 없어 기본 폰트로 그립니다. (FONT_CANDIDATES 확인)")
+    cache = wordcloud_cache.image_cache
+    keys = {model: wordcloud_cache.cache_key(*model, version, font_path) for model in model_reasons}
+    todo = [model for model, key in keys.items() if force or not cache.contains(key)]
+    print(f"차종 {len(model_reasons):,}개 중 {len(todo):,}개를 그립니다. (데이터 버전: {version}, 프로세스 {workers}개)")
+
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {model: executor.submit(wordcloud_cache.render_wordcloud_png, model_reasons[model], font_path)
+                   for model in todo}
+        for done, (model, future) in enumerate(futures.items(), start=1):
+            try:
+                cache.put(keys[model], future.result(), prune=False)
+            except Exception as e:
+                failed += 1
+                print(f"   - {model[0]} {model[1]} 그리기 실패: {e}")
+            if done % 100 == 0:
+                print(f"   ... {done:,}/{len(todo):,}")
+
+    cache.prune(keep=set(keys.values()))
+    print(f"[완료] {len(todo) - failed:,}개 저장, 실패 {failed}개 / {time.perf_counter() - start:.1f}초 ({cache.directory})")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모든 차종의 워드 클라우드 이미지를 미리 그려 캐시에 저장합니다.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="동시에 그릴 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="이미 캐시된 차종도 다시 그립니다.")
+    parser.add_argument('--sqlite', metavar='DB_PATH', help="MySQL 대신 SQLite 저장소 파일에서 읽습니다.")
+    args = parser.parse_args()
+    if args.sqlite:
+        db_manager.configure_storage('sqlite', path=args.sqlite, read_only=True)
+    sys.exit(0 if prerender(args.workers, args.force) else 1)
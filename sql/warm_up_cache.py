@@ -0,0 +1,31 @@
+# 파일 이름: warm_up_cache.py
+# (경로: sql/warm_up_cache.py)
+# [신규] 앱의 조회 캐시를 미리 채웁니다. (backend/warmup.py의 warm_up과 같은 조회)
+#        앱은 시작 직후와 적재 커밋 후 스스로 예열하지만, [shared_cache]를 쓰는 경우 적재 직후 이 스크립트를 실행하면
+#        레플리카들이 첫 요청부터 공유 캐시의 결과를 사용합니다. (프로젝트 루트에서 실행: .streamlit/secrets.toml 사용)
+# 실행: python sql/warm_up_cache.py
+#       python sql/warm_up_cache.py --top-models 50
+#       python sql/warm_up_cache.py --sqlite data/lemon_scanner.db
+
+import os
+import sys
+import argparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from backend import db_manager, shared_cache, warmup
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="앱의 조회 캐시(공유 캐시)를 미리 채웁니다.")
+    parser.add_argument('--top-models', type=int, default=None, help="미리 불러올 차종 프로필 수 (기본값: [warmup] top_models)")
+    parser.add_argument('--sqlite', metavar='DB_PATH', help="MySQL 대신 SQLite 저장소 파일에서 읽습니다.")
+    args = parser.parse_args()
+    if args.sqlite:
+        db_manager.configure_storage('sqlite', path=args.sqlite, read_only=True)
+    if shared_cache.get_store() is None:
+        print("[경고] [shared_cache]가 설정되지 않아 이 프로세스 안에서만 캐시됩니다. (앱 프로세스에는 영향 없음)")
+    warmup.warm_up(args.top_models)
+    stats = shared_cache.get_shared_cache_stats()
+    print(f"공유 캐시: 적중 {stats['hits']} / 새로 저장 {stats['misses']} / 오류 {stats['errors']}")